@@ -0,0 +1,139 @@
+"""Per-env memory and throughput of the T1-Getup-v0 field modes.
+
+Every (field_mode, num_envs) pair runs in a fresh interpreter so memory deltas
+are not polluted by earlier runs:
+
+    python benchmarks/field_scene.py --num-envs 1024 4096 8192 --device cuda:0
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+FIELD_MODES = ("entity", "shared", "collision")
+
+
+def _rss_bytes() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def _used_memory(device: str) -> int:
+    """Device memory in use (CUDA) or resident set size (CPU)."""
+    import torch
+
+    if device.startswith("cuda"):
+        torch.cuda.synchronize(device)
+        free, total = torch.cuda.mem_get_info(device)
+        return total - free
+    return _rss_bytes()
+
+
+def run_child(field_mode: str, num_envs: int, device: str, steps: int) -> dict:
+    import torch
+
+    from mjlab.envs import ManagerBasedRlEnv
+
+    from mjlab_task.getup_env import getup_env_cfg
+
+    env_cfg = getup_env_cfg(field_mode=field_mode)
+    env_cfg.scene.num_envs = num_envs
+
+    mem_before = _used_memory(device)
+    env = ManagerBasedRlEnv(cfg=env_cfg, device=device)
+    env.reset()
+    mem_after = _used_memory(device)
+
+    actions = torch.zeros(
+        env.num_envs, env.action_manager.total_action_dim, device=env.device
+    )
+    # Warm up kernels / graphs before timing.
+    for _ in range(5):
+        env.step(actions)
+    if device.startswith("cuda"):
+        torch.cuda.synchronize(device)
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step(actions)
+    if device.startswith("cuda"):
+        torch.cuda.synchronize(device)
+    elapsed = time.perf_counter() - start
+
+    mj_model = env.sim.mj_model
+    result = {
+        "field_mode": field_mode,
+        "num_envs": num_envs,
+        "ngeom": mj_model.ngeom,
+        "nbody": mj_model.nbody,
+        "nmocap": mj_model.nmocap,
+        "memory_mb": (mem_after - mem_before) / 2**20,
+        "memory_per_env_kb": (mem_after - mem_before) / num_envs / 2**10,
+        "env_steps_per_s": steps * num_envs / elapsed,
+    }
+    env.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="T1-Getup field mode benchmark")
+    parser.add_argument(
+        "--modes", nargs="+", choices=FIELD_MODES, default=list(FIELD_MODES)
+    )
+    parser.add_argument("--num-envs", nargs="+", type=int, default=[1024, 4096, 8192])
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON file")
+    parser.add_argument("--child", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_child(args.child, args.num_envs[0], args.device, args.steps)
+        print(json.dumps(result))
+        return
+
+    results = []
+    for num_envs in args.num_envs:
+        for mode in args.modes:
+            cmd = [
+                sys.executable,
+                __file__,
+                "--child",
+                mode,
+                "--num-envs",
+                str(num_envs),
+                f"--device={args.device}",
+                f"--steps={args.steps}",
+            ]
+            proc = subprocess.run(cmd, capture_output=True, text=True)
+            if proc.returncode != 0:
+                error = proc.stderr.strip().splitlines()[-1:]
+                print(f"[WARN] {mode} @ {num_envs} envs failed: {''.join(error)}")
+                continue
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    header = (
+        f"{'num_envs':>8} {'mode':<10} {'ngeom':>6} {'nmocap':>6}"
+        f" {'mem (MB)':>10} {'KB/env':>8} {'env-steps/s':>12}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['num_envs']:>8} {row['field_mode']:<10} {row['ngeom']:>6}"
+            f" {row['nmocap']:>6} {row['memory_mb']:>10.1f}"
+            f" {row['memory_per_env_kb']:>8.2f} {row['env_steps_per_s']:>12.0f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
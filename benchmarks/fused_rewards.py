@@ -0,0 +1,141 @@
+"""Reward-manager time with separate vs fused reward terms.
+
+Builds the task once per mode (``separate``, fused ``eager``, fused
+``compile``), steps it with random actions, then times
+``RewardManager.compute`` on the resulting state. Per-term values of every
+fused mode are checked against the separate terms on the same state; the
+report gives the largest absolute difference, the largest difference
+relative to ``max(|value|, 1)`` and the term with the largest absolute one:
+
+    python benchmarks/fused_rewards.py --num-envs 4096 16384
+"""
+
+import argparse
+import json
+import time
+
+import torch
+
+MODES = ("separate", "eager", "compile")
+
+
+def _sync(device: str) -> None:
+    if device.startswith("cuda"):
+        torch.cuda.synchronize(device)
+
+
+def _make_env(task: str, mode: str, num_envs: int, device: str):
+    from mjlab.envs import ManagerBasedRlEnv
+
+    from mjlab_task.getup_env import getup_env_cfg
+    from mjlab_task.stand_env import stand_env_cfg
+
+    cfg_fn = {"T1-Stand-v0": stand_env_cfg, "T1-Getup-v0": getup_env_cfg}[task]
+    env_cfg = cfg_fn(fused_rewards=None if mode == "separate" else mode)
+    env_cfg.scene.num_envs = num_envs
+    env_cfg.seed = 0
+    return ManagerBasedRlEnv(cfg=env_cfg, device=device)
+
+
+def _step_reward(env) -> torch.Tensor:
+    """Unweighted per-term values (weights are 1 where the term was skipped)."""
+    manager = env.reward_manager
+    weights = []
+    for name in manager.active_terms:
+        term_cfg = manager.get_term_cfg(name)
+        weights.append(term_cfg.weight)
+        term_cfg.weight = 1.0
+    env.common_step_counter += 1
+    manager.compute(dt=env.step_dt)
+    for name, weight in zip(manager.active_terms, weights):
+        manager.get_term_cfg(name).weight = weight
+    return manager._step_reward.clone()
+
+
+def bench(task: str, mode: str, num_envs: int, device: str, iters: int, warmup: int):
+    env = _make_env(task, mode, num_envs, device)
+    torch.manual_seed(0)
+    env.reset()
+    dim = env.action_manager.total_action_dim
+    for _ in range(warmup):
+        env.step(torch.randn(num_envs, dim, device=env.device))
+    values = _step_reward(env)
+    state = env.sim.data.qpos.clone(), env.sim.data.qvel.clone()
+
+    manager = env.reward_manager
+    for _ in range(10):  # includes torch.compile on first call
+        env.common_step_counter += 1
+        manager.compute(dt=env.step_dt)
+    _sync(env.device)
+    start = time.perf_counter()
+    for _ in range(iters):
+        env.common_step_counter += 1
+        manager.compute(dt=env.step_dt)
+    _sync(env.device)
+    us = (time.perf_counter() - start) / iters * 1e6
+    names = list(manager.active_terms)
+    env.close()
+    return us, values.cpu(), tuple(t.cpu() for t in state), names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fused reward benchmark")
+    parser.add_argument("--tasks", nargs="+", default=["T1-Stand-v0", "T1-Getup-v0"])
+    parser.add_argument("--num-envs", nargs="+", type=int, default=[4096, 16384])
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--iters", type=int, default=200)
+    parser.add_argument("--warmup-steps", type=int, default=5)
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON file")
+    args = parser.parse_args()
+
+    import mjlab_task  # noqa: F401
+
+    results = []
+    for task in args.tasks:
+        for num_envs in args.num_envs:
+            reference = None
+            for mode in args.modes:
+                us, values, state, names = bench(
+                    task, mode, num_envs, args.device, args.iters, args.warmup_steps
+                )
+                row = {"task": task, "mode": mode, "num_envs": num_envs, "us": us}
+                if reference is None:
+                    reference = (values, state)
+                elif all(torch.equal(a, b) for a, b in zip(state, reference[1])):
+                    diff = (values - reference[0]).abs()
+                    rel = diff / reference[0].abs().clamp(min=1.0)
+                    row["max_abs_diff"] = diff.max().item()
+                    row["max_rel_diff"] = rel.max().item()
+                    row["worst_term"] = names[diff.max(dim=0).values.argmax()]
+                results.append(row)
+
+    header = (
+        f"{'task':<12} {'num_envs':>8} {'mode':<9} {'us/compute':>11}"
+        f" {'speedup':>8} {'max|diff|':>10} {'max rel':>8}  worst term"
+    )
+    print(f"RewardManager.compute on {args.device}")
+    print(header)
+    print("-" * len(header))
+    base = {}
+    for row in results:
+        key = (row["task"], row["num_envs"])
+        base.setdefault(key, row["us"])
+        diff = row.get("max_abs_diff")
+        diff = "-" if diff is None else f"{diff:.1e}"
+        rel = row.get("max_rel_diff")
+        rel = "-" if rel is None else f"{rel:.1e}"
+        print(
+            f"{row['task']:<12} {row['num_envs']:>8} {row['mode']:<9}"
+            f" {row['us']:>11.1f} {base[key] / row['us']:>7.2f}x {diff:>10}"
+            f" {rel:>8}  {row.get('worst_term', '-')}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Launch-to-training startup of ``train.py`` per launcher.
+
+Measures wall time from spawning a launch until mjlab prints
+``[INFO] Training with:`` (configs parsed, about to build the env):
+
+* ``inprocess`` -- ``python train.py`` running mjlab's trainer in-process.
+* ``nested``    -- ``python train.py`` shelling out to a second interpreter that
+  runs mjlab's trainer, i.e. the ``uv run train`` path minus the uv resolve.
+* ``uv``        -- ``python train.py --launcher uv`` (skipped without ``uv``).
+* ``relaunch``  -- a second in-process launch from an interpreter that already
+  ran one, which is what a sweep harness pays per trial.
+
+Runs happen in a scratch directory, so no logs are left in the repo:
+
+    python benchmarks/launcher.py --repeats 3
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+TRAIN_PY = Path(__file__).resolve().parent.parent / "train.py"
+MODES = ("inprocess", "nested", "uv", "relaunch")
+READY = "[INFO] Training with:"
+RELAUNCH = "[BENCH] relaunch"
+
+# Child of the "nested" mode: what ``uv run train`` executes, with the task
+# package imported explicitly in case it is not installed.
+_NESTED_CHILD = """
+import sys
+import mjlab_task  # noqa: F401
+from mjlab.scripts.train import main
+sys.argv = ["train", *sys.argv[1:]]
+main()
+"""
+
+_RELAUNCH_CHILD = """
+import sys
+sys.path.insert(0, {repo!r})
+import train
+args = {args!r}
+train.launch_in_process("train", {task!r}, args)
+print({marker!r}, flush=True)
+train.launch_in_process("train", {task!r}, args)
+"""
+
+
+def _mjlab_args(num_envs: int) -> list[str]:
+    return [
+        f"--env.scene.num-envs={num_envs}",
+        "--agent.max-iterations=1",
+        "--agent.num-steps-per-env=8",
+        "--agent.logger=tensorboard",
+        "--gpu-ids=None",
+    ]
+
+
+def _command(mode: str, task: str, num_envs: int) -> list[str]:
+    mjlab_args = _mjlab_args(num_envs)
+    if mode == "inprocess":
+        return [sys.executable, str(TRAIN_PY), "--task", task, *mjlab_args]
+    if mode == "uv":
+        return [sys.executable, str(TRAIN_PY), "--task", task, "--launcher", "uv"]
+    if mode == "nested":
+        # A light parent that spawns the trainer, like the uv launcher does.
+        child = [sys.executable, "-c", _NESTED_CHILD, task, *mjlab_args]
+        parent = f"import subprocess; subprocess.run({child!r}, check=True)"
+        return [sys.executable, "-c", parent]
+    code = _RELAUNCH_CHILD.format(
+        repo=str(TRAIN_PY.parent), args=mjlab_args, task=task, marker=RELAUNCH
+    )
+    return [sys.executable, "-c", code]
+
+
+def measure(mode: str, task: str, num_envs: int, cwd: str) -> float:
+    """Seconds until the launch under test reports it is about to train."""
+    env = dict(os.environ)
+    env.setdefault("MJLAB_WARP_QUIET", "1")
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(TRAIN_PY.parent), env.get("PYTHONPATH")])
+    )
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        _command(mode, task, num_envs),
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        start_new_session=True,
+    )
+    elapsed = None
+    try:
+        for line in proc.stdout:
+            if mode == "relaunch" and line.startswith(RELAUNCH):
+                start = time.perf_counter()
+                mode = "relaunched"
+            elif READY in line and mode != "relaunch":
+                elapsed = time.perf_counter() - start
+                break
+    finally:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        proc.wait()
+    if elapsed is None:
+        raise RuntimeError(f"{mode} launch exited before training started")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="train.py launcher benchmark")
+    parser.add_argument("--task", default="T1-Stand-v0")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--num-envs", type=int, default=16)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON file")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for mode in args.modes:
+            if mode == "uv" and shutil.which("uv") is None:
+                print("[WARN] uv not found, skipping the uv launcher")
+                continue
+            times = [
+                measure(mode, args.task, args.num_envs, scratch)
+                for _ in range(args.repeats)
+            ]
+            results.append(
+                {
+                    "mode": mode,
+                    "median_s": statistics.median(times),
+                    "min_s": min(times),
+                    "times_s": times,
+                }
+            )
+
+    header = f"{'launcher':<10} {'median':>9} {'min':>9} {'saved vs nested':>16}"
+    print(f"Launch-to-training time, {args.task}")
+    print(header)
+    print("-" * len(header))
+    nested = next((r["median_s"] for r in results if r["mode"] == "nested"), None)
+    for row in results:
+        saved = "-" if nested is None else f"{nested - row['median_s']:.2f}s"
+        print(
+            f"{row['mode']:<10} {row['median_s']:>8.2f}s {row['min_s']:>8.2f}s"
+            f" {saved:>16}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Reward-manager time with and without the per-step orientation features cache.
+
+The previous orientation reward and upright gate each moved ``_UP_VEC`` to the
+device and recomputed the upright error; they now share one cached value per
+env step (``mjlab_task.orientation``). This times ``RewardManager.compute`` for
+both and breaks the time down per reward term:
+
+    python benchmarks/orientation_terms.py --task T1-Stand-v0 --num-envs 4096
+"""
+
+import argparse
+import json
+import time
+from collections import defaultdict
+
+import torch
+from mjlab.managers.scene_entity_config import SceneEntityCfg
+
+_DEFAULT_ASSET_CFG = SceneEntityCfg("robot")
+_UP_VEC = torch.tensor([0.0, 0.0, -1.0])
+
+
+def _legacy_upright_error(asset) -> torch.Tensor:
+    gravity = asset.data.projected_gravity_b
+    up = _UP_VEC.to(gravity.device)
+    return torch.sum(torch.square(up - gravity), dim=-1)
+
+
+def legacy_orientation_reward(env, asset_cfg=_DEFAULT_ASSET_CFG):
+    """The pre-change orientation reward, kept for comparison."""
+    return torch.exp(-2.0 * _legacy_upright_error(env.scene[asset_cfg.name]))
+
+
+class legacy_gated_posture_reward:
+    """The pre-change posture reward: its own upright error for the gate."""
+
+    def __init__(self, term):
+        self._term = term
+
+    def __call__(self, env, std, orientation_threshold, asset_cfg=_DEFAULT_ASSET_CFG):
+        del std
+        asset = env.scene[asset_cfg.name]
+        gate = (_legacy_upright_error(asset) < orientation_threshold).float()
+        current_pos = asset.data.joint_pos[:, asset_cfg.joint_ids]
+        desired_pos = self._term.default_joint_pos[:, asset_cfg.joint_ids]
+        error_sq = torch.square(current_pos - desired_pos)
+        return gate * torch.exp(-torch.mean(error_sq / (self._term.std**2), dim=1))
+
+
+def _sync(device: str) -> None:
+    if device.startswith("cuda"):
+        torch.cuda.synchronize(device)
+
+
+def _timed(fn, name: str, totals: dict, device: str):
+    def wrapper(*args, **kwargs):
+        _sync(device)
+        start = time.perf_counter()
+        out = fn(*args, **kwargs)
+        _sync(device)
+        totals[name] += time.perf_counter() - start
+        return out
+
+    return wrapper
+
+
+def bench(env, funcs: dict, iters: int) -> tuple[float, dict[str, float]]:
+    """Mean ``RewardManager.compute`` time and per-term breakdown (us)."""
+    manager = env.reward_manager
+    for name, func in funcs.items():
+        manager.get_term_cfg(name).func = func
+
+    for _ in range(5):
+        env.common_step_counter += 1
+        manager.compute(dt=env.step_dt)
+    _sync(env.device)
+    start = time.perf_counter()
+    for _ in range(iters):
+        env.common_step_counter += 1  # a new step invalidates the cache
+        manager.compute(dt=env.step_dt)
+    _sync(env.device)
+    total_us = (time.perf_counter() - start) / iters * 1e6
+
+    totals = defaultdict(float)
+    for name, func in funcs.items():
+        manager.get_term_cfg(name).func = _timed(func, name, totals, env.device)
+    for _ in range(iters):
+        env.common_step_counter += 1
+        manager.compute(dt=env.step_dt)
+    terms = {name: totals[name] / iters * 1e6 for name in funcs}
+    return total_us, terms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Orientation features benchmark")
+    parser.add_argument("--task", default="T1-Stand-v0")
+    parser.add_argument("--num-envs", type=int, default=4096)
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--iters", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5, help="Interleaved; min kept")
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON file")
+    args = parser.parse_args()
+
+    import mjlab_task  # noqa: F401
+    from mjlab.envs import ManagerBasedRlEnv
+    from mjlab.tasks.registry import load_env_cfg
+
+    env_cfg = load_env_cfg(args.task)
+    env_cfg.scene.num_envs = args.num_envs
+    env = ManagerBasedRlEnv(cfg=env_cfg, device=args.device)
+    env.reset()
+    actions = torch.zeros(
+        args.num_envs, env.action_manager.total_action_dim, device=env.device
+    )
+    env.step(actions)
+
+    manager = env.reward_manager
+    cached = {name: manager.get_term_cfg(name).func for name in manager.active_terms}
+    legacy = dict(cached)
+    legacy["orientation"] = legacy_orientation_reward
+    legacy["posture"] = legacy_gated_posture_reward(cached["posture"])
+
+    results = [
+        {"variant": variant, "total_us": float("inf"), "terms_us": {}}
+        for variant in ("legacy", "cached")
+    ]
+    for _ in range(args.rounds):
+        for row, funcs in zip(results, (legacy, cached)):
+            total_us, terms = bench(env, funcs, args.iters)
+            row["total_us"] = min(row["total_us"], total_us)
+            for name, us in terms.items():
+                row["terms_us"][name] = min(row["terms_us"].get(name, us), us)
+    env.close()
+
+    print(f"{args.task}, {args.num_envs} envs on {args.device} (us per compute)")
+    header = f"{'term':<16}" + "".join(f" {row['variant']:>10}" for row in results)
+    print(header)
+    print("-" * len(header))
+    for name in cached:
+        times = "".join(f" {row['terms_us'][name]:>10.1f}" for row in results)
+        print(f"{name:<16}{times}")
+    print("-" * len(header))
+    print(f"{'compute':<16}" + "".join(f" {row['total_us']:>10.1f}" for row in results))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Single-request latency vs batched throughput of an exported T1 actor on CPU.
+
+Rows:
+
+* ``direct b=N`` -- the TorchScript policy called in a loop with N observations
+  per call (N=1 is the single-request baseline a 50 Hz controller pays);
+* ``server c=C`` -- ``BatchedPolicyServer`` with C client threads, each sending
+  one observation at a time and waiting for its action, so concurrent
+  requests are coalesced into batches of up to ``--max-batch``;
+* ``tcp c=C``    -- the same through ``serve_tcp`` / ``PolicyClient``.
+
+Latencies are per request (p50 / p99); throughput counts observations/s and
+``vs b=1`` compares it with the first ``--batches`` row.
+Without ``--policy`` a randomly initialised actor of the task's shape
+(``booster_t1_ppo_runner_cfg``: 512-256-128 ELU, T1-Stand observations) is
+exported to a temporary directory, which is enough for timing:
+
+    python benchmarks/policy_server.py --clients 1 4 16 64
+    python benchmarks/policy_server.py --policy logs/.../exported/policy.pt
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mjlab_task.policy_server import (  # noqa: E402
+    BatchedPolicyServer,
+    PolicyClient,
+    load_backend,
+    serve_tcp,
+)
+
+# T1-Stand-v0 policy group: ang vel 3, gravity 3, joint pos / vel / last action 23.
+STAND_NUM_OBS = 75
+STAND_NUM_ACTIONS = 23
+
+
+def random_policy(directory: Path) -> Path:
+    from mjlab_task.export import ActorPolicy, export_torchscript
+    from mjlab_task.rl_cfg import booster_t1_ppo_runner_cfg
+    from rsl_rl.networks import MLP
+
+    policy_cfg = booster_t1_ppo_runner_cfg("bench", 1).policy
+    actor = MLP(
+        STAND_NUM_OBS,
+        STAND_NUM_ACTIONS,
+        policy_cfg.actor_hidden_dims,
+        policy_cfg.activation,
+    )
+    policy = ActorPolicy(actor, torch.zeros(STAND_NUM_OBS), torch.ones(STAND_NUM_OBS))
+    path = directory / "policy.pt"
+    export_torchscript(policy.eval(), path, {})
+    return path
+
+
+def _row(mode: str, latencies_s: list[float], observations: int, elapsed: float):
+    latencies = np.array(latencies_s) * 1e3
+    return {
+        "mode": mode,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "obs_per_s": observations / elapsed,
+    }
+
+
+def bench_direct(backend, batch: int, duration: float) -> dict:
+    obs = np.random.randn(batch, backend.num_obs).astype(np.float32)
+    for _ in range(20):
+        backend(obs)
+    latencies = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        t0 = time.perf_counter()
+        backend(obs)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    return _row(f"direct b={batch}", latencies, batch * len(latencies), elapsed)
+
+
+def _run_clients(clients: int, duration: float, act) -> tuple[list[float], float]:
+    """``clients`` threads call ``act(obs)`` back to back for ``duration``."""
+    latencies: list[list[float]] = [[] for _ in range(clients)]
+    barrier = threading.Barrier(clients + 1)
+
+    def client(index: int) -> None:
+        request = act(index)
+        obs = np.random.randn(STAND_NUM_OBS).astype(np.float32)
+        barrier.wait()
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            t0 = time.perf_counter()
+            request(obs)
+            latencies[index].append(time.perf_counter() - t0)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    merged = [latency for per_client in latencies for latency in per_client]
+    return merged, time.perf_counter() - start
+
+
+def bench_server(server: BatchedPolicyServer, clients: int, duration: float) -> dict:
+    server.stats()
+    latencies, elapsed = _run_clients(clients, duration, lambda _: server.infer)
+    row = _row(f"server c={clients}", latencies, len(latencies), elapsed)
+    row["mean_batch"] = server.stats().get("mean_batch", 0.0)
+    return row
+
+
+def bench_tcp(server: BatchedPolicyServer, port: int, clients: int, duration: float):
+    connections = []
+
+    def connect(_):
+        connection = PolicyClient("127.0.0.1", port)
+        connections.append(connection)
+        return connection.act
+
+    server.stats()
+    latencies, elapsed = _run_clients(clients, duration, connect)
+    for connection in connections:
+        connection.close()
+    row = _row(f"tcp c={clients}", latencies, len(latencies), elapsed)
+    row["mean_batch"] = server.stats().get("mean_batch", 0.0)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--policy", type=str, default=None, help="policy.pt / .onnx")
+    parser.add_argument("--batches", nargs="+", type=int, default=[1, 8, 64, 256])
+    parser.add_argument("--clients", nargs="+", type=int, default=[1, 4, 16, 64])
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=0.0)
+    parser.add_argument("--duration", type=float, default=2.0, help="Seconds per row")
+    parser.add_argument("--threads", type=int, default=1, help="torch threads")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--no-tcp", action="store_true")
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON file")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    with tempfile.TemporaryDirectory() as tmp:
+        policy = args.policy or random_policy(Path(tmp))
+        backend = load_backend(policy)
+        results = [
+            bench_direct(backend, batch, args.duration) for batch in args.batches
+        ]
+
+        with BatchedPolicyServer(backend, args.max_batch, args.max_wait_ms) as server:
+            for clients in args.clients:
+                results.append(bench_server(server, clients, args.duration))
+            if not args.no_tcp:
+                tcp = serve_tcp(server, "127.0.0.1", args.port)
+                threading.Thread(target=tcp.serve_forever, daemon=True).start()
+                for clients in args.clients:
+                    results.append(bench_tcp(server, args.port, clients, args.duration))
+                tcp.shutdown()
+                tcp.server_close()
+
+    baseline = results[0]["obs_per_s"]
+    print(f"policy: {policy}  torch threads: {args.threads}")
+    print(f"server: max batch {args.max_batch}, max wait {args.max_wait_ms} ms\n")
+    header = (
+        f"{'mode':<14} {'p50 ms':>8} {'p99 ms':>8} {'obs/s':>10}"
+        f" {'vs b=1':>7} {'batch':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        batch = row.get("mean_batch")
+        print(
+            f"{row['mode']:<14} {row['p50_ms']:>8.3f} {row['p99_ms']:>8.3f}"
+            f" {row['obs_per_s']:>10.0f} {row['obs_per_s'] / baseline:>6.1f}x"
+            f" {'-' if batch is None else f'{batch:.1f}':>6}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
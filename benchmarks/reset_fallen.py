@@ -0,0 +1,141 @@
+"""Reset throughput of the T1-Stand ``reset_fallen_or_standing`` event.
+
+Times the previous implementation (split fallen/standing writes, ``.numel()``
+host syncs, per-call buffers) against the current masked single-write term
+when a large fraction of envs resets on the same step:
+
+    python benchmarks/reset_fallen.py --num-envs 8192 --fractions 0.1 0.5 1.0
+"""
+
+import argparse
+import json
+import time
+
+import torch
+
+from mjlab_task.stand_mdp import _random_unit_quat
+
+
+def legacy_reset_fallen_or_standing(
+    env, env_ids, *, fall_probability, fall_height, velocity_range, asset_cfg
+):
+    """The pre-change event body (minus the settle handshake), for comparison."""
+    del velocity_range
+    asset = env.scene[asset_cfg.name]
+    device = env.device
+
+    is_fallen = torch.rand(len(env_ids), device=device) < fall_probability
+    fallen_rel_ids = env_ids[is_fallen]
+    standing_rel_ids = env_ids[~is_fallen]
+
+    if fallen_rel_ids.numel() > 0:
+        fallen_env_ids = fallen_rel_ids.to(torch.int)
+        n_fallen = len(fallen_env_ids)
+        quat = _random_unit_quat(n_fallen, device)
+        root_pos = env.scene.env_origins[fallen_rel_ids].clone()
+        root_pos[:, 2] += fall_height
+        joint_limits = asset.data.joint_pos_limits[fallen_rel_ids]
+        lo = joint_limits[:, :, 0]
+        hi = joint_limits[:, :, 1]
+        joint_pos = lo + (hi - lo) * torch.rand_like(lo)
+        vel = torch.zeros(n_fallen, asset.num_joints, device=device)
+        asset.write_root_link_pose_to_sim(
+            torch.cat([root_pos, quat], dim=-1), env_ids=fallen_env_ids
+        )
+        asset.write_root_link_velocity_to_sim(
+            torch.zeros(n_fallen, 6, device=device), env_ids=fallen_env_ids
+        )
+        asset.write_joint_state_to_sim(joint_pos, vel, env_ids=fallen_env_ids)
+
+    if standing_rel_ids.numel() > 0:
+        standing_env_ids = standing_rel_ids.to(torch.int)
+        default_root = asset.data.default_root_state[standing_rel_ids].clone()
+        default_root[:, 0:3] += env.scene.env_origins[standing_rel_ids]
+        default_root[:, 2] += 0.02
+        vel = torch.zeros(len(standing_env_ids), asset.num_joints, device=device)
+        default_jpos = asset.data.default_joint_pos[standing_rel_ids]
+        asset.write_root_link_pose_to_sim(
+            default_root[:, 0:7], env_ids=standing_env_ids
+        )
+        asset.write_root_link_velocity_to_sim(
+            torch.zeros(len(standing_env_ids), 6, device=device),
+            env_ids=standing_env_ids,
+        )
+        asset.write_joint_state_to_sim(
+            default_jpos[:, : asset.num_joints], vel, env_ids=standing_env_ids
+        )
+
+
+def _sync(device: str) -> None:
+    if device.startswith("cuda"):
+        torch.cuda.synchronize(device)
+
+
+def bench(fn, env, params: dict, fraction: float, iters: int) -> float:
+    """Mean time per reset call (ms) with ``fraction`` of envs resetting."""
+    num_reset = max(1, int(env.num_envs * fraction))
+    env_ids = torch.randperm(env.num_envs, device=env.device)[:num_reset]
+    for _ in range(3):
+        fn(env, env_ids, **params)
+    _sync(env.device)
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn(env, env_ids, **params)
+    _sync(env.device)
+    return (time.perf_counter() - start) / iters * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description="T1-Stand reset benchmark")
+    parser.add_argument("--num-envs", type=int, default=8192)
+    parser.add_argument("--fractions", nargs="+", type=float, default=[0.1, 0.5, 1.0])
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--iters", type=int, default=20)
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON file")
+    args = parser.parse_args()
+
+    import mjlab_task  # noqa: F401
+    from mjlab.envs import ManagerBasedRlEnv
+    from mjlab.tasks.registry import load_env_cfg
+
+    env_cfg = load_env_cfg("T1-Stand-v0")
+    env_cfg.scene.num_envs = args.num_envs
+    env = ManagerBasedRlEnv(cfg=env_cfg, device=args.device)
+    env.reset()
+
+    term_cfg = env.event_manager.get_term_cfg("reset_fallen_or_standing")
+    variants = {"legacy": legacy_reset_fallen_or_standing, "masked": term_cfg.func}
+
+    results = []
+    for fraction in args.fractions:
+        for name, fn in variants.items():
+            ms = bench(fn, env, term_cfg.params, fraction, args.iters)
+            results.append(
+                {
+                    "variant": name,
+                    "num_envs": args.num_envs,
+                    "fraction": fraction,
+                    "ms": ms,
+                    "resets_per_s": args.num_envs * fraction / ms * 1e3,
+                }
+            )
+    env.close()
+
+    header = f"{'fraction':>8} {'variant':<8} {'ms/reset':>9} {'envs/s':>12}"
+    print(f"T1-Stand-v0, {args.num_envs} envs on {args.device}")
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['fraction']:>8.2f} {row['variant']:<8} {row['ms']:>9.2f}"
+            f" {row['resets_per_s']:>12.0f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
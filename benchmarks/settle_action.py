@@ -0,0 +1,112 @@
+"""Micro-benchmark of the SettleJointPositionAction per-substep settle update.
+
+Compares the previous implementation (two ``.any()`` host syncs, float masks,
+boolean-index decrement) with ``stand_mdp.hold_default_pose``, eager and
+``torch.compile``d (plus CUDA graphs via ``mode="reduce-overhead"`` on GPU):
+
+    python benchmarks/settle_action.py --num-envs 4096 16384
+"""
+
+import argparse
+import json
+import time
+
+import torch
+
+from mjlab_task.stand_mdp import hold_default_pose
+
+NUM_JOINTS = 23
+
+
+def legacy_settle(settle_counter, processed_actions, offset):
+    """The pre-change ``apply_actions`` body, kept for comparison."""
+    settling = settle_counter > 0
+    if settling.any():
+        settling_f = settling.float().unsqueeze(1)
+        processed_actions = (
+            processed_actions * (1.0 - settling_f) + offset * settling_f
+        )
+    if settling.any():
+        settle_counter[settling] -= 1
+    return processed_actions, settle_counter
+
+
+def _variants(device: str) -> dict:
+    variants = {
+        "legacy": legacy_settle,
+        "where": hold_default_pose,
+        "where+compile": torch.compile(
+            hold_default_pose, fullgraph=True, dynamic=False
+        ),
+    }
+    if device.startswith("cuda"):
+        variants["where+cudagraph"] = torch.compile(
+            hold_default_pose, mode="reduce-overhead", fullgraph=True, dynamic=False
+        )
+    return variants
+
+
+def _sync(device: str) -> None:
+    if device.startswith("cuda"):
+        torch.cuda.synchronize(device)
+
+
+def bench(fn, num_envs: int, device: str, iters: int, settle_steps: int) -> float:
+    """Mean time per substep call (us), with ~60% of envs starting to settle."""
+    generator = torch.Generator(device="cpu").manual_seed(0)
+    counter = torch.randint(0, settle_steps, (num_envs,), generator=generator)
+    counter = torch.where(torch.rand(num_envs, generator=generator) < 0.6, counter, 0)
+    counter = counter.to(device=device, dtype=torch.int)
+    actions = torch.randn(num_envs, NUM_JOINTS, device=device)
+    offset = torch.zeros(num_envs, NUM_JOINTS, device=device)
+
+    for _ in range(10):
+        actions, counter = fn(counter.clone(), actions, offset)
+    _sync(device)
+
+    start = time.perf_counter()
+    for i in range(iters):
+        # Refill periodically, as resets would, so settling never runs dry.
+        if i % settle_steps == 0:
+            counter = counter + settle_steps // 2
+        actions, counter = fn(counter, actions, offset)
+    _sync(device)
+    return (time.perf_counter() - start) / iters * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Settle action micro-benchmark")
+    parser.add_argument("--num-envs", nargs="+", type=int, default=[4096, 16384])
+    parser.add_argument("--devices", nargs="+", default=None)
+    parser.add_argument("--iters", type=int, default=2000)
+    parser.add_argument("--settle-steps", type=int, default=50)
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON file")
+    args = parser.parse_args()
+
+    devices = args.devices or ["cpu"] + (["cuda"] if torch.cuda.is_available() else [])
+    results = []
+    for device in devices:
+        for name, fn in _variants(device).items():
+            for num_envs in args.num_envs:
+                us = bench(fn, num_envs, device, args.iters, args.settle_steps)
+                results.append(
+                    {"device": device, "variant": name, "num_envs": num_envs, "us": us}
+                )
+
+    header = f"{'device':<8} {'variant':<16} {'num_envs':>8} {'us/substep':>11}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['device']:<8} {row['variant']:<16} {row['num_envs']:>8}"
+            f" {row['us']:>11.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Import-to-first-step startup benchmark for the Booster T1 tasks.
+
+Each (task, registration mode) pair runs in a fresh interpreter so import and
+config-generation costs are measured cold:
+
+    python benchmarks/startup.py --tasks T1-Stand-v0 T1-Getup-v0 --num-envs 64
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+_T_START = time.perf_counter()
+
+TASKS = ("T1-Stand-v0", "T1-Reach-v0", "T1-Getup-v0")
+PHASES = ("import", "load_cfg", "build_env", "reset", "first_step")
+
+
+def run_child(task: str, num_envs: int, device: str) -> dict[str, float]:
+    """Measure each startup phase inside this (fresh) process."""
+    marks = {}
+
+    import torch
+
+    import mjlab.tasks  # noqa: F401
+    import mjlab_task  # noqa: F401
+    from mjlab.envs import ManagerBasedRlEnv
+    from mjlab.tasks.registry import load_env_cfg
+
+    marks["import"] = time.perf_counter()
+
+    env_cfg = load_env_cfg(task)
+    env_cfg.scene.num_envs = num_envs
+    marks["load_cfg"] = time.perf_counter()
+
+    env = ManagerBasedRlEnv(cfg=env_cfg, device=device)
+    marks["build_env"] = time.perf_counter()
+
+    env.reset()
+    marks["reset"] = time.perf_counter()
+
+    actions = torch.zeros(
+        env.num_envs, env.action_manager.total_action_dim, device=env.device
+    )
+    env.step(actions)
+    marks["first_step"] = time.perf_counter()
+    env.close()
+
+    timings = {}
+    previous = _T_START
+    for phase in PHASES:
+        timings[phase] = marks[phase] - previous
+        previous = marks[phase]
+    timings["total"] = marks["first_step"] - _T_START
+    return timings
+
+
+def run_parent(args: argparse.Namespace) -> None:
+    results = []
+    for task in args.tasks:
+        for mode in args.modes:
+            env = dict(os.environ)
+            env["BOOSTER_T1_EAGER_REGISTRATION"] = "1" if mode == "eager" else "0"
+            env.setdefault("MJLAB_WARP_QUIET", "1")
+            cmd = [
+                sys.executable,
+                __file__,
+                "--child",
+                task,
+                f"--num-envs={args.num_envs}",
+                f"--device={args.device}",
+            ]
+            proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+            if proc.returncode != 0:
+                error = proc.stderr.strip().splitlines()[-1:]
+                print(f"[WARN] {task} ({mode}) failed: {''.join(error)}")
+                continue
+            # The child prints its JSON result as the last stdout line.
+            timings = json.loads(proc.stdout.strip().splitlines()[-1])
+            results.append({"task": task, "mode": mode, **timings})
+
+    header = f"{'task':<14} {'mode':<6}" + "".join(
+        f" {name:>11}" for name in (*PHASES, "total")
+    )
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['task']:<14} {row['mode']:<6}"
+            + "".join(f" {row[name]:>10.3f}s" for name in (*PHASES, "total"))
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Booster T1 startup benchmark")
+    parser.add_argument("--tasks", nargs="+", default=list(TASKS))
+    parser.add_argument(
+        "--modes", nargs="+", choices=("lazy", "eager"), default=["lazy", "eager"]
+    )
+    parser.add_argument("--num-envs", type=int, default=64)
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON file")
+    parser.add_argument("--child", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        timings = run_child(args.child, args.num_envs, args.device)
+        print(json.dumps(timings))
+    else:
+        run_parent(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Rollout throughput with training videos off, decoupled and synchronous.
+
+Steps one environment with a randomly initialised actor of the agent's shape
+(policy inference + ``env.step``, i.e. PPO rollout collection) and reports
+env-steps/s per mode:
+
+* ``off``       -- no video;
+* ``decoupled`` -- ``VideoRenderer`` (what ``train.py --video`` uses): qpos of
+  ``--video-envs`` envs copied into shared clip slots, rendered and encoded
+  by a worker process;
+* ``sync``      -- with ``--sync``, mjlab's ``VideoRecorder`` (``train.py
+  --video-sync``), which renders every clip frame inside ``env.step``.
+
+Clips start every ``--interval`` steps and last ``--length`` steps, so most
+measured steps fall inside a clip. ``off`` runs before and after
+``decoupled`` and the two are averaged to cancel drift. After the decoupled
+window the benchmark waits (up to ``--drain-timeout`` s) for every submitted
+clip to be written. The decoupled row reports the clips submitted, written
+during the window, written in total and dropped, the time that drain took,
+the worker's mean time per clip and the per-step copy cost. The worker runs
+with ``SCHED_IDLE``: without a spare core it renders nothing while the
+rollout runs, so its steps/s only measures the qpos copy; read it together
+with ``in window`` and ``drain s``. Rendering needs ``MUJOCO_GL=egl`` (or
+``osmesa``):
+
+    MUJOCO_GL=egl python benchmarks/video_overhead.py --num-envs 256 --sync
+
+So far this has only run on a 1-core box (16 envs, 400 steps, clips of 25
+steps every 100): off 96 vs decoupled 94 env-steps/s, but 0 clips were written
+in the window, 2 were dropped and the 2 submitted took 146 s to drain. That
+measures the qpos copy, not rendering alongside training; the claim that
+video stays within a few percent of off still needs a run with a spare core.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def build_env(task: str, num_envs: int, render: bool):
+    from mjlab.envs import ManagerBasedRlEnv
+    from mjlab.tasks.registry import load_env_cfg
+
+    import mjlab_task  # noqa: F401
+
+    env_cfg = load_env_cfg(task)
+    env_cfg.scene.num_envs = num_envs
+    return ManagerBasedRlEnv(
+        cfg=env_cfg, device="cpu", render_mode="rgb_array" if render else None
+    )
+
+
+def random_actor(task: str, num_obs: int, num_actions: int) -> torch.nn.Module:
+    from mjlab.tasks.registry import load_rl_cfg
+    from rsl_rl.networks import MLP
+
+    policy_cfg = load_rl_cfg(task).policy
+    return MLP(
+        num_obs, num_actions, policy_cfg.actor_hidden_dims, policy_cfg.activation
+    ).eval()
+
+
+def measure(env, actor, steps: int, seed: int) -> float:
+    """Env-steps/s of ``steps`` policy steps from a seeded reset."""
+    obs, _ = env.reset(seed=seed)
+    with torch.no_grad():
+        start = time.perf_counter()
+        for _ in range(steps):
+            obs, *_ = env.step(actor(obs["policy"]))
+        elapsed = time.perf_counter() - start
+    return env.num_envs * steps / elapsed
+
+
+def _cell(row: dict, key: str, spec: str) -> str:
+    return f"{row[key]:{spec}}" if key in row else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--task", type=str, default="T1-Stand-v0")
+    parser.add_argument("--num-envs", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=600, help="Steps per mode")
+    parser.add_argument("--video-envs", type=int, default=4)
+    parser.add_argument("--interval", type=int, default=200)
+    parser.add_argument("--length", type=int, default=150)
+    parser.add_argument("--size", type=int, nargs=2, default=[320, 240])
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=600.0,
+        help="Seconds to wait for submitted clips after the decoupled window",
+    )
+    parser.add_argument("--sync", action="store_true", help="Also time mjlab's")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON file")
+    args = parser.parse_args()
+
+    from mjlab_task.video_renderer import VideoRenderer
+
+    backend = os.environ.get("MUJOCO_GL", "egl")
+    env = build_env(args.task, args.num_envs, render=False)
+    num_obs = env.observation_manager.group_obs_dim["policy"][0]
+    actor = random_actor(args.task, num_obs, env.action_manager.total_action_dim)
+    measure(env, actor, 20, args.seed)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        off = [measure(env, actor, args.steps, args.seed)]
+        renderer = VideoRenderer(
+            env,
+            Path(tmp) / "decoupled",
+            num_envs=args.video_envs,
+            interval=args.interval,
+            length=args.length,
+            size=tuple(args.size),
+            backend=backend,
+        ).attach()
+        decoupled = measure(env, actor, args.steps, args.seed)
+        in_window = renderer.metrics()
+        start = time.perf_counter()
+        renderer.close(timeout=args.drain_timeout)
+        drain_s = time.perf_counter() - start
+        renderer_metrics = {**in_window, **renderer.metrics()}
+        if renderer_metrics["clips_written"] < renderer_metrics["clips_submitted"]:
+            print(
+                f"[WARN] Only {renderer_metrics['clips_written']:.0f} of"
+                f" {renderer_metrics['clips_submitted']:.0f} clips were written"
+                f" within --drain-timeout {args.drain_timeout:g} s"
+            )
+        off.append(measure(env, actor, args.steps, args.seed))
+        env.close()
+        baseline = sum(off) / len(off)
+        results.append({"mode": "off", "env_steps_per_s": baseline, "runs": off})
+        results.append(
+            {
+                "mode": "decoupled",
+                "env_steps_per_s": decoupled,
+                **renderer_metrics,
+                "clips_written_in_window": in_window["clips_written"],
+                "drain_s": drain_s,
+            }
+        )
+
+        if args.sync:
+            from mjlab.utils.wrappers import VideoRecorder
+
+            env = VideoRecorder(
+                build_env(args.task, args.num_envs, render=True),
+                video_folder=Path(tmp) / "sync",
+                step_trigger=lambda step: step % args.interval == 0,
+                video_length=args.length,
+                disable_logger=True,
+            )
+            measure(env, actor, 20, args.seed)
+            sync = measure(env, actor, args.steps, args.seed)
+            env.close()
+            results.append({"mode": "sync", "env_steps_per_s": sync})
+
+    print(
+        f"{args.task}: {args.num_envs} envs x {args.steps} steps, clips of"
+        f" {args.length} steps every {args.interval} ({args.video_envs} envs,"
+        f" MUJOCO_GL={backend})\n"
+    )
+    header = (
+        f"{'mode':<10} {'steps/s':>9} {'vs off':>7} {'submitted':>9}"
+        f" {'in window':>9} {'written':>8} {'dropped':>8} {'drain s':>8}"
+        f" {'clip s':>7} {'copy us':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['mode']:<10} {row['env_steps_per_s']:>9.0f}"
+            f" {row['env_steps_per_s'] / baseline - 1:>+7.1%}"
+            f" {_cell(row, 'clips_submitted', '.0f'):>9}"
+            f" {_cell(row, 'clips_written_in_window', '.0f'):>9}"
+            f" {_cell(row, 'clips_written', '.0f'):>8}"
+            f" {_cell(row, 'clips_dropped', '.0f'):>8}"
+            f" {_cell(row, 'drain_s', '.1f'):>8}"
+            f" {_cell(row, 'render_s', '.1f'):>7} {_cell(row, 'copy_us', '.1f'):>8}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
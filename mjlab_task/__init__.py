@@ -1,31 +1,35 @@
-from mjlab.tasks.registry import register_mjlab_task
+from functools import partial
 
 from mjlab_task.getup_env import getup_env_cfg
 from mjlab_task.reach_env import reach_env_cfg
+from mjlab_task.registry import register_lazy_task
 from mjlab_task.rl_cfg import booster_t1_ppo_runner_cfg
 from mjlab_task.runner_with_video import VideoOnPolicyRunner
 from mjlab_task.stand_env import stand_env_cfg
 
-register_mjlab_task(
+register_lazy_task(
     task_id="T1-Stand-v0",
-    env_cfg=stand_env_cfg(),
-    play_env_cfg=stand_env_cfg(play=True),
-    rl_cfg=booster_t1_ppo_runner_cfg(exp_name="T1-Stand-PPO", num_iterations=3000),
+    env_cfg_fn=stand_env_cfg,
+    rl_cfg_fn=partial(
+        booster_t1_ppo_runner_cfg, exp_name="T1-Stand-PPO", num_iterations=3000
+    ),
     runner_cls=VideoOnPolicyRunner,
 )
 
-register_mjlab_task(
+register_lazy_task(
     task_id="T1-Reach-v0",
-    env_cfg=reach_env_cfg(),
-    play_env_cfg=reach_env_cfg(play=True),
-    rl_cfg=booster_t1_ppo_runner_cfg(exp_name="T1-Reach-PPO", num_iterations=10000),
+    env_cfg_fn=reach_env_cfg,
+    rl_cfg_fn=partial(
+        booster_t1_ppo_runner_cfg, exp_name="T1-Reach-PPO", num_iterations=10000
+    ),
     runner_cls=VideoOnPolicyRunner,
 )
 
-register_mjlab_task(
+register_lazy_task(
     task_id="T1-Getup-v0",
-    env_cfg=getup_env_cfg(),
-    play_env_cfg=getup_env_cfg(play=True),
-    rl_cfg=booster_t1_ppo_runner_cfg(exp_name="T1-Getup-PPO", num_iterations=10000),
+    env_cfg_fn=getup_env_cfg,
+    rl_cfg_fn=partial(
+        booster_t1_ppo_runner_cfg, exp_name="T1-Getup-PPO", num_iterations=10000
+    ),
     runner_cls=VideoOnPolicyRunner,
 )
@@ -0,0 +1,286 @@
+"""Simulation throughput benchmark for the registered Booster T1 tasks.
+
+Builds each task at every ``--num-envs`` in a fresh interpreter (so peak memory
+is per configuration), steps it with random actions and reports:
+
+* env-steps/s and physics substeps/s (env-steps x decimation);
+* mean time per env step spent in each manager -- actions, physics, events,
+  commands, observations, rewards, terminations, curriculum -- and in the
+  in-step resets (``_reset_idx``, which includes the reset events and
+  curriculum, so those columns overlap it);
+* the cost of a full ``env.reset()``;
+* peak resident memory (and peak CUDA memory on GPU).
+
+Results go to ``--output`` as JSON. ``--baseline`` compares env-steps/s with a
+previous output and exits non-zero if any configuration is more than
+``--tolerance`` slower:
+
+    python train.py bench --num-envs 256 1024 --output bench.json
+    python -m mjlab_task.bench --baseline bench.json --tolerance 0.1
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+# T1-Reach-v0 does not build yet; it is benchmarked only when named in --tasks.
+TASKS = ("T1-Stand-v0", "T1-Getup-v0")
+SECTIONS = (
+    "actions",
+    "physics",
+    "events",
+    "commands",
+    "observations",
+    "rewards",
+    "terminations",
+    "curriculum",
+    "resets",
+)
+
+
+class _SectionTimer:
+    """Accumulates wall time of instrumented manager methods per section."""
+
+    def __init__(self, device: str):
+        self._cuda = device.startswith("cuda")
+        self.totals: dict[str, float] = defaultdict(float)
+
+    def _sync(self) -> None:
+        if self._cuda:
+            import torch
+
+            torch.cuda.synchronize()
+
+    def wrap(self, owner, method: str, section: str) -> None:
+        original = getattr(owner, method)
+
+        def timed(*args, **kwargs):
+            self._sync()
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self._sync()
+                self.totals[section] += time.perf_counter() - start
+
+        setattr(owner, method, timed)
+
+    def reset(self) -> None:
+        self.totals.clear()
+
+
+def _instrument(env, timer: _SectionTimer) -> None:
+    timer.wrap(env.action_manager, "process_action", "actions")
+    timer.wrap(env.action_manager, "apply_action", "actions")
+    timer.wrap(env.sim, "step", "physics")
+    timer.wrap(env.event_manager, "apply", "events")
+    timer.wrap(env.command_manager, "compute", "commands")
+    timer.wrap(env.observation_manager, "compute", "observations")
+    timer.wrap(env.reward_manager, "compute", "rewards")
+    timer.wrap(env.termination_manager, "compute", "terminations")
+    timer.wrap(env.curriculum_manager, "compute", "curriculum")
+    timer.wrap(env, "_reset_idx", "resets")
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_child(
+    task: str, num_envs: int, device: str, steps: int, warmup: int, seed: int
+) -> dict:
+    """Benchmark one (task, num_envs) configuration in this process."""
+    import torch
+
+    import mjlab.tasks  # noqa: F401
+    from mjlab.envs import ManagerBasedRlEnv
+    from mjlab.tasks.registry import load_env_cfg
+
+    import mjlab_task  # noqa: F401
+
+    env_cfg = load_env_cfg(task)
+    env_cfg.scene.num_envs = num_envs
+    env_cfg.seed = seed
+    start = time.perf_counter()
+    env = ManagerBasedRlEnv(cfg=env_cfg, device=device)
+    build_s = time.perf_counter() - start
+    generator = torch.Generator(device=env.device).manual_seed(seed)
+    dim = env.action_manager.total_action_dim
+
+    def actions() -> torch.Tensor:
+        return torch.randn(num_envs, dim, device=env.device, generator=generator)
+
+    env.reset()
+    for _ in range(warmup):
+        env.step(actions())
+
+    timer = _SectionTimer(env.device)
+    if env.device.startswith("cuda"):
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    env.reset()
+    if env.device.startswith("cuda"):
+        torch.cuda.synchronize()
+    reset_all_ms = (time.perf_counter() - start) * 1e3
+
+    _instrument(env, timer)
+    action_batches = [actions() for _ in range(steps)]
+    timer.reset()
+    start = time.perf_counter()
+    for batch in action_batches:
+        env.step(batch)
+    if env.device.startswith("cuda"):
+        torch.cuda.synchronize()
+    elapsed = time.perf_counter() - start
+
+    env_steps_per_s = num_envs * steps / elapsed
+    result = {
+        "task": task,
+        "num_envs": num_envs,
+        "device": device,
+        "decimation": env_cfg.decimation,
+        "build_s": build_s,
+        "step_ms": elapsed / steps * 1e3,
+        "env_steps_per_s": env_steps_per_s,
+        "substeps_per_s": env_steps_per_s * env_cfg.decimation,
+        "reset_all_ms": reset_all_ms,
+        "sections_ms": {
+            name: timer.totals.get(name, 0.0) / steps * 1e3 for name in SECTIONS
+        },
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    if env.device.startswith("cuda"):
+        result["peak_cuda_mb"] = torch.cuda.max_memory_allocated() / 2**20
+    env.close()
+    return result
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Configurations whose env-steps/s dropped by more than ``tolerance``."""
+    reference = {(r["task"], r["num_envs"], r["device"]): r for r in baseline}
+    regressions = []
+    for row in results:
+        base = reference.get((row["task"], row["num_envs"], row["device"]))
+        if base is None:
+            continue
+        ratio = row["env_steps_per_s"] / base["env_steps_per_s"]
+        row["vs_baseline"] = ratio
+        if ratio < 1.0 - tolerance:
+            regressions.append(
+                f"{row['task']} num_envs={row['num_envs']}: {ratio:.2f}x baseline"
+                f" ({row['env_steps_per_s']:.0f} vs {base['env_steps_per_s']:.0f}"
+                " env-steps/s)"
+            )
+    return regressions
+
+
+def print_results(results: list[dict]) -> None:
+    header = (
+        f"{'task':<12} {'envs':>6} {'env-steps/s':>12} {'substeps/s':>12}"
+        f" {'step ms':>8} {'reset ms':>9} {'peak MB':>8} {'vs base':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        ratio = row.get("vs_baseline")
+        print(
+            f"{row['task']:<12} {row['num_envs']:>6} {row['env_steps_per_s']:>12.0f}"
+            f" {row['substeps_per_s']:>12.0f} {row['step_ms']:>8.2f}"
+            f" {row['reset_all_ms']:>9.2f} {row['peak_rss_mb']:>8.0f}"
+            f" {'-' if ratio is None else f'{ratio:.2f}x':>8}"
+        )
+
+    print("\nPer-step time by manager (ms)")
+    header = f"{'task':<12} {'envs':>6}" + "".join(f" {name:>12}" for name in SECTIONS)
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['task']:<12} {row['num_envs']:>6}"
+            + "".join(f" {row['sections_ms'][name]:>12.3f}" for name in SECTIONS)
+        )
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="train.py bench", description="Booster T1 simulation throughput"
+    )
+    parser.add_argument("--tasks", nargs="+", default=list(TASKS))
+    parser.add_argument("--num-envs", nargs="+", type=int, default=[64, 256, 1024])
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--warmup-steps", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None, help="Optional JSON file")
+    parser.add_argument("--baseline", type=str, default=None, help="JSON to compare")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument("--child", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        result = run_child(
+            args.child,
+            args.num_envs[0],
+            args.device,
+            args.steps,
+            args.warmup_steps,
+            args.seed,
+        )
+        print(json.dumps(result))
+        return
+
+    env = dict(os.environ)
+    env.setdefault("MJLAB_WARP_QUIET", "1")
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [package_root, env.get("PYTHONPATH")])
+    )
+    results = []
+    for task in args.tasks:
+        for num_envs in args.num_envs:
+            cmd = [
+                sys.executable,
+                "-m",
+                "mjlab_task.bench",
+                "--child",
+                task,
+                f"--num-envs={num_envs}",
+                f"--device={args.device}",
+                f"--steps={args.steps}",
+                f"--warmup-steps={args.warmup_steps}",
+                f"--seed={args.seed}",
+            ]
+            proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+            if proc.returncode != 0:
+                error = proc.stderr.strip().splitlines()[-1:]
+                print(f"[WARN] {task} num_envs={num_envs} failed: {''.join(error)}")
+                continue
+            # The child prints its JSON result as the last stdout line.
+            results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.output}")
+    if regressions:
+        print(f"\nRegressions beyond {args.tolerance:.0%} vs {args.baseline}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
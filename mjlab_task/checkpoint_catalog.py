@@ -0,0 +1,307 @@
+"""Per-experiment index of saved checkpoints.
+
+``logs/rsl_rl/<experiment>/checkpoints.json`` records every checkpoint written
+by ``VideoOnPolicyRunner`` across all runs of the experiment:
+
+    {
+      "version": 1,
+      "checkpoints": {
+        "<run>/model_<it>.pt": {
+          "run": ..., "iteration": ..., "time": ...,
+          "mean_reward": ..., "mean_episode_length": ..., "sha256": ...
+        }
+      },
+      "latest": "<run>/model_<it>.pt",
+      "best": "<run>/model_<it>.pt",
+      "by_iteration": {"<it>": "<run>/model_<it>.pt"}
+    }
+
+``latest``, ``best`` (highest mean episode reward) and ``by_iteration`` (most
+recent run that saved that iteration) are maintained on every update, so
+lookups never scan directories. Updates take an exclusive ``flock`` on
+``checkpoints.json.lock`` and replace the file atomically, so concurrent runs
+(sweeps, PBT workers) can share an experiment. ``rebuild`` indexes runs saved
+before the catalog existed (without reward statistics) and fills in the
+``sha256`` of entries recorded during training, which skips hashing to keep
+saves cheap. ``find_checkpoint`` rebuilds a missing catalog, and a stale one
+whose entry points at a deleted file, before giving up; ``best`` falls back to
+``latest`` when no entry has a reward.
+
+Usage:
+    python -m mjlab_task.checkpoint_catalog show logs/rsl_rl/T1-Stand
+    python -m mjlab_task.checkpoint_catalog latest logs/rsl_rl/T1-Stand
+    python -m mjlab_task.checkpoint_catalog rebuild logs/rsl_rl/T1-Stand
+"""
+
+import argparse
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Iterator
+
+CATALOG_NAME = "checkpoints.json"
+_VERSION = 1
+
+
+def file_sha256(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def checkpoint_iteration(path: str | Path) -> int | None:
+    """Iteration of a ``model_<it>.pt`` file, ``None`` for other names."""
+    stem = Path(path).stem
+    if not stem.startswith("model_"):
+        return None
+    try:
+        return int(stem.split("_")[1])
+    except (IndexError, ValueError):
+        return None
+
+
+class CheckpointCatalog:
+    """Reads and updates the checkpoint index of one experiment directory."""
+
+    def __init__(self, experiment_dir: str | Path):
+        self.experiment_dir = Path(experiment_dir)
+        self.path = self.experiment_dir / CATALOG_NAME
+
+    def exists(self) -> bool:
+        return self.path.is_file()
+
+    # ---- queries ----
+    def latest(self) -> Path | None:
+        return self._resolve("latest")
+
+    def best(self) -> Path | None:
+        """Highest mean reward; the latest checkpoint when none has a reward."""
+        catalog = self._read()
+        return self._existing(catalog["best"] or catalog["latest"])
+
+    def at_iteration(self, iteration: int) -> Path | None:
+        key = self._read()["by_iteration"].get(str(iteration))
+        return self._existing(key)
+
+    def entries(self) -> dict[str, dict]:
+        return self._read()["checkpoints"]
+
+    # ---- updates ----
+    def record(
+        self,
+        checkpoint: str | Path,
+        mean_reward: float | None = None,
+        mean_episode_length: float | None = None,
+        sha256: str | None = None,
+    ) -> None:
+        """Add (or refresh) ``checkpoint``, a ``<run>/model_<it>.pt`` file.
+
+        The file is not hashed here (``rebuild`` does that) unless ``sha256``
+        is given, so recording on the training thread stays cheap.
+        """
+        checkpoint = Path(checkpoint)
+        key = self._key(checkpoint)
+        entry = {
+            "run": checkpoint.parent.name,
+            "iteration": checkpoint_iteration(checkpoint),
+            "time": time.time(),
+            "mean_reward": mean_reward,
+            "mean_episode_length": mean_episode_length,
+            "sha256": sha256,
+        }
+        with self._update() as catalog:
+            catalog["checkpoints"][key] = entry
+            _point_to(catalog, key, entry)
+
+    def remove(self, checkpoint: str | Path) -> None:
+        """Drop ``checkpoint`` (e.g. deleted by retention) from the index."""
+        key = self._key(Path(checkpoint))
+        with self._update() as catalog:
+            if catalog["checkpoints"].pop(key, None) is not None:
+                _reindex(catalog)
+
+    def rebuild(self) -> int:
+        """Index every ``<run>/model_<it>.pt`` on disk and drop entries whose
+        file is gone; returns the number of files found."""
+        found = {}
+        for checkpoint in sorted(self.experiment_dir.glob("*/model_*.pt")):
+            iteration = checkpoint_iteration(checkpoint)
+            if iteration is None:
+                continue
+            found[self._key(checkpoint)] = {
+                "run": checkpoint.parent.name,
+                "iteration": iteration,
+                "time": checkpoint.stat().st_mtime,
+                "mean_reward": None,
+                "mean_episode_length": None,
+                "sha256": file_sha256(checkpoint),
+            }
+        with self._update() as catalog:
+            for key, entry in found.items():
+                known = catalog["checkpoints"].get(key)
+                # Recorded without a hash: the same file unless written since.
+                if known is not None and known["sha256"] is None:
+                    if entry["time"] <= known["time"]:
+                        known["sha256"] = entry["sha256"]
+                        continue
+                if known is None or known["sha256"] != entry["sha256"]:
+                    catalog["checkpoints"][key] = entry
+            catalog["checkpoints"] = {
+                key: entry
+                for key, entry in catalog["checkpoints"].items()
+                if (self.experiment_dir / key).is_file()
+            }
+            _reindex(catalog)
+        return len(found)
+
+    # ---- internals ----
+    def _key(self, checkpoint: Path) -> str:
+        return f"{checkpoint.parent.name}/{checkpoint.name}"
+
+    def _resolve(self, pointer: str) -> Path | None:
+        return self._existing(self._read()[pointer])
+
+    def _existing(self, key: str | None) -> Path | None:
+        if key is None:
+            return None
+        path = self.experiment_dir / key
+        return path if path.is_file() else None
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return _empty()
+
+    @contextlib.contextmanager
+    def _update(self) -> Iterator[dict]:
+        self.experiment_dir.mkdir(parents=True, exist_ok=True)
+        with open(f"{self.path}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            catalog = self._read()
+            yield catalog
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(catalog, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def _empty() -> dict:
+    return {
+        "version": _VERSION,
+        "checkpoints": {},
+        "latest": None,
+        "best": None,
+        "by_iteration": {},
+    }
+
+
+def _newer(entry: dict, other: dict) -> bool:
+    return (entry["time"], entry["iteration"] or -1) >= (
+        other["time"],
+        other["iteration"] or -1,
+    )
+
+
+def _point_to(catalog: dict, key: str, entry: dict) -> None:
+    checkpoints = catalog["checkpoints"]
+    latest = checkpoints.get(catalog["latest"])
+    if latest is None or _newer(entry, latest):
+        catalog["latest"] = key
+    best = checkpoints.get(catalog["best"])
+    reward = entry["mean_reward"]
+    if reward is not None and (best is None or reward >= best["mean_reward"]):
+        catalog["best"] = key
+    if entry["iteration"] is not None:
+        iteration = str(entry["iteration"])
+        current = checkpoints.get(catalog["by_iteration"].get(iteration))
+        if current is None or _newer(entry, current):
+            catalog["by_iteration"][iteration] = key
+
+
+def _reindex(catalog: dict) -> None:
+    checkpoints = catalog["checkpoints"]
+    catalog.update(latest=None, best=None, by_iteration={})
+    for key, entry in checkpoints.items():
+        _point_to(catalog, key, entry)
+
+
+def find_checkpoint(
+    experiment_dir: str | Path, select: str = "latest", iteration: int | None = None
+) -> Path | None:
+    """``latest`` / ``best`` checkpoint of an experiment, or the one saved at
+    ``iteration`` when given. Experiments without a catalog are indexed first,
+    and a catalog pointing at a deleted file is reindexed from disk."""
+    catalog = CheckpointCatalog(experiment_dir)
+    if not catalog.experiment_dir.exists():
+        return None
+    fresh = not catalog.exists()
+    if fresh:
+        catalog.rebuild()
+    found = _lookup(catalog, select, iteration)
+    if found is None and not fresh:
+        catalog.rebuild()
+        found = _lookup(catalog, select, iteration)
+    return found
+
+
+def _lookup(
+    catalog: CheckpointCatalog, select: str, iteration: int | None
+) -> Path | None:
+    if iteration is not None:
+        return catalog.at_iteration(iteration)
+    if select == "best":
+        return catalog.best()
+    return catalog.latest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checkpoint catalog of an experiment")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (
+        ("show", "Print every indexed checkpoint"),
+        ("latest", "Print the most recent checkpoint"),
+        ("best", "Print the checkpoint with the highest mean reward"),
+        ("rebuild", "Index checkpoints already on disk"),
+    ):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("experiment_dir")
+    at = sub.add_parser("at", help="Print the checkpoint saved at an iteration")
+    at.add_argument("experiment_dir")
+    at.add_argument("iteration", type=int)
+    args = parser.parse_args()
+
+    catalog = CheckpointCatalog(args.experiment_dir)
+    if args.command == "show":
+        header = f"{'checkpoint':<48} {'iter':>6} {'mean reward':>12} {'ep len':>8}"
+        print(header)
+        print("-" * len(header))
+        for key, entry in sorted(
+            catalog.entries().items(), key=lambda item: item[1]["time"]
+        ):
+            reward = entry["mean_reward"]
+            length = entry["mean_episode_length"]
+            print(
+                f"{key:<48} {entry['iteration']:>6}"
+                f" {'-' if reward is None else f'{reward:.3f}':>12}"
+                f" {'-' if length is None else f'{length:.1f}':>8}"
+            )
+    elif args.command == "rebuild":
+        print(f"Indexed {catalog.rebuild()} checkpoints in {catalog.path}")
+    else:
+        iteration = args.iteration if args.command == "at" else None
+        path = find_checkpoint(args.experiment_dir, args.command, iteration)
+        if path is None:
+            raise SystemExit(f"No matching checkpoint in {catalog.path}")
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
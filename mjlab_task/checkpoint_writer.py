@@ -0,0 +1,209 @@
+"""Asynchronous checkpoint writing with retention.
+
+``AsyncCheckpointWriter.submit`` copies a checkpoint dict (model, optimizer and
+normalizer state) into a CPU snapshot and returns; a background thread then
+``torch.save``s the snapshot to ``<path>.tmp`` and renames it into place, so a
+crash mid-write never leaves a truncated ``model_<it>.pt`` behind.
+
+Snapshots live in ``max_pending`` reusable slots. Each slot keeps one CPU
+buffer per tensor (pinned when the source is on CUDA, filled with
+``non_blocking`` copies and fenced with a CUDA event), so steady-state saves
+allocate nothing and memory is bounded by ``max_pending`` copies of the state.
+When every slot is still being written, ``submit`` blocks until one frees up.
+
+Retention (``CheckpointRetention``, also usable on its own for synchronous
+saves) keeps the ``keep_last`` most recent checkpoints plus, with
+``keep_best``, the one with the highest score seen so far; older files are
+deleted after each write. ``keep_last=0`` (the default) keeps everything.
+
+``on_written(path, iteration, info)`` runs on the writer thread once a file is
+in place (``info`` is the dict passed to ``submit``), and ``on_removed(path)``
+once retention has deleted one.
+"""
+
+import copy
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import torch
+
+
+@dataclass
+class _Slot:
+    buffers: dict[str, torch.Tensor] = field(default_factory=dict)
+    event: "torch.cuda.Event | None" = None
+
+
+@dataclass
+class _Job:
+    path: str
+    state: Any
+    iteration: int
+    score: float | None
+    info: dict
+    slot: _Slot
+
+
+class CheckpointRetention:
+    """Deletes written checkpoints beyond the ``keep_last`` most recent (and
+    the best one by score, with ``keep_best``); ``keep_last=0`` keeps all."""
+
+    def __init__(
+        self,
+        keep_last: int = 0,
+        keep_best: bool = True,
+        on_removed: Callable[[str], None] | None = None,
+    ):
+        self._keep_last = keep_last
+        self._keep_best = keep_best
+        self._on_removed = on_removed
+        self._written: list[tuple[int, str, float | None]] = []
+        self._best: tuple[float, str] | None = None
+
+    def record(self, path: str, iteration: int, score: float | None = None) -> None:
+        """Note that ``path`` was written and prune the files no longer kept."""
+        written = [w for w in self._written if w[1] != path]
+        written.append((iteration, path, score))
+        if score is not None and (self._best is None or score > self._best[0]):
+            self._best = (score, path)
+        if self._keep_last > 0:
+            written.sort(key=lambda w: w[0])
+            keep = {path for _, path, _ in written[-self._keep_last :]}
+            if self._keep_best and self._best is not None:
+                keep.add(self._best[1])
+            for _, old_path, _ in written:
+                if old_path not in keep:
+                    try:
+                        os.remove(old_path)
+                    except FileNotFoundError:
+                        pass
+                    if self._on_removed is not None:
+                        self._on_removed(old_path)
+            written = [w for w in written if w[1] in keep]
+        self._written = written
+
+
+class AsyncCheckpointWriter:
+    """Writes checkpoints on a background thread and prunes old ones."""
+
+    def __init__(
+        self,
+        keep_last: int = 0,
+        keep_best: bool = True,
+        max_pending: int = 2,
+        on_written: Callable[[str, int, dict], None] | None = None,
+        on_removed: Callable[[str], None] | None = None,
+    ):
+        self._retention = CheckpointRetention(keep_last, keep_best, on_removed)
+        self._on_written = on_written
+        self._free: queue.Queue[_Slot] = queue.Queue()
+        for _ in range(max_pending):
+            self._free.put(_Slot())
+        self._jobs: queue.Queue[_Job | None] = queue.Queue()
+
+        self._lock = threading.Lock()
+        self._snapshot_s: list[float] = []
+        self._write_s: list[float] = []
+        self._failures = 0
+        self._thread = threading.Thread(
+            target=self._run, name="checkpoint-writer", daemon=True
+        )
+        self._thread.start()
+
+    # ---- public ----
+    def submit(
+        self,
+        path: str,
+        state: dict,
+        iteration: int,
+        score: float | None = None,
+        info: dict | None = None,
+    ) -> None:
+        """Snapshot ``state`` and queue it to be written to ``path``."""
+        start = time.perf_counter()
+        slot = self._free.get()
+        snapshot = _snapshot(state, slot, "")
+        if slot.event is not None:
+            slot.event.record()
+        with self._lock:
+            self._snapshot_s.append(time.perf_counter() - start)
+        self._jobs.put(_Job(path, snapshot, iteration, score, info or {}, slot))
+
+    def metrics(self) -> dict[str, float]:
+        """Queue depth and snapshot / write latency since the last call."""
+        with self._lock:
+            snapshot_s, self._snapshot_s = self._snapshot_s, []
+            write_s, self._write_s = self._write_s, []
+            return {
+                "queue_depth": float(self._jobs.qsize()),
+                "snapshot_s": _mean(snapshot_s),
+                "write_latency_s": _mean(write_s),
+                "max_write_latency_s": max(write_s, default=0.0),
+                "failures": float(self._failures),
+            }
+
+    def flush(self) -> None:
+        """Block until every submitted checkpoint is on disk."""
+        self._jobs.join()
+
+    def close(self) -> None:
+        self.flush()
+        self._jobs.put(None)
+        self._thread.join()
+
+    # ---- worker ----
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                self._jobs.task_done()
+                return
+            try:
+                self._write(job)
+            except Exception as e:
+                print(f"[WARN] Failed to write checkpoint {job.path}: {e}")
+                with self._lock:
+                    self._failures += 1
+            finally:
+                self._free.put(job.slot)
+                self._jobs.task_done()
+
+    def _write(self, job: _Job) -> None:
+        start = time.perf_counter()
+        if job.slot.event is not None:
+            job.slot.event.synchronize()
+        tmp_path = f"{job.path}.tmp"
+        torch.save(job.state, tmp_path)
+        os.replace(tmp_path, job.path)
+        with self._lock:
+            self._write_s.append(time.perf_counter() - start)
+        self._retention.record(job.path, job.iteration, job.score)
+        if self._on_written is not None:
+            self._on_written(job.path, job.iteration, job.info)
+
+
+def _snapshot(obj: Any, slot: _Slot, key: str) -> Any:
+    """Copy ``obj`` into ``slot``'s CPU buffers, reusing them when shapes match."""
+    if isinstance(obj, torch.Tensor):
+        buffer = slot.buffers.get(key)
+        if buffer is None or buffer.shape != obj.shape or buffer.dtype != obj.dtype:
+            pin = obj.is_cuda
+            buffer = torch.empty(obj.shape, dtype=obj.dtype, pin_memory=pin)
+            slot.buffers[key] = buffer
+            if pin and slot.event is None:
+                slot.event = torch.cuda.Event()
+        buffer.copy_(obj.detach(), non_blocking=obj.is_cuda)
+        return buffer
+    if isinstance(obj, dict):
+        return type(obj)((k, _snapshot(v, slot, f"{key}/{k}")) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_snapshot(v, slot, f"{key}/{i}") for i, v in enumerate(obj))
+    return copy.deepcopy(obj)
+
+
+def _mean(values: list[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
@@ -0,0 +1,124 @@
+"""Table-driven curriculum terms shared by the stand and getup tasks.
+
+Stages are written as in the env configs::
+
+    {"step": 900 * 24, "weight": -0.005}                   # reward_weight_curriculum
+    {"step": 900 * 24, "params": {"threshold": 3000.0}}    # termination_param_curriculum
+
+and compiled once into a ``Schedule``: sorted step / value arrays looked up with
+a binary search. A stage applies once ``env.common_step_counter`` has passed its
+step; before the first stage the configured value is kept. With
+``interpolate=True`` values ramp linearly between consecutive stages instead of
+jumping.
+
+Reward weights stay Python floats because mjlab's ``RewardManager`` multiplies
+by (and skips terms with) ``weight == 0.0`` on the host. Termination params are
+replaced by 0-d tensors on the env device, updated in place with ``fill_`` only
+when the scheduled value changes, so terms read them without host round-trips.
+"""
+
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+
+import torch
+from mjlab.managers.curriculum_manager import CurriculumTermCfg
+
+if TYPE_CHECKING:
+    from mjlab.envs import ManagerBasedRlEnv
+
+
+class Schedule:
+    """Piecewise-constant or piecewise-linear schedule over training steps."""
+
+    def __init__(self, steps: list[int], values: list[float], interpolate: bool = False):
+        order = sorted(range(len(steps)), key=lambda i: steps[i])
+        self.steps = [int(steps[i]) for i in order]
+        self.values = [float(values[i]) for i in order]
+        self.interpolate = interpolate
+
+    def __call__(self, step: int, default: float) -> float:
+        # Index of the last stage whose step is strictly below ``step``.
+        i = bisect_left(self.steps, step) - 1
+        if i < 0:
+            return default
+        if not self.interpolate or i + 1 == len(self.steps):
+            return self.values[i]
+        start, end = self.steps[i], self.steps[i + 1]
+        alpha = (step - start) / (end - start)
+        return self.values[i] + alpha * (self.values[i + 1] - self.values[i])
+
+
+class reward_weight_curriculum:
+    """Schedule a reward term's weight from ``{"step", "weight"}`` stages."""
+
+    def __init__(self, cfg: CurriculumTermCfg, env: "ManagerBasedRlEnv"):
+        stages = cfg.params["stages"]
+        self._schedule = Schedule(
+            [stage["step"] for stage in stages],
+            [stage["weight"] for stage in stages],
+            interpolate=cfg.params.get("interpolate", False),
+        )
+        self._term_cfg = env.reward_manager.get_term_cfg(cfg.params["reward_name"])
+        self._initial = self._term_cfg.weight
+
+    def __call__(
+        self,
+        env: "ManagerBasedRlEnv",
+        env_ids: torch.Tensor,
+        reward_name: str,
+        stages: list[dict],
+        interpolate: bool = False,
+    ) -> float:
+        del env_ids, reward_name, stages, interpolate  # compiled in __init__
+        weight = self._schedule(env.common_step_counter, self._initial)
+        self._term_cfg.weight = weight
+        return weight
+
+
+class termination_param_curriculum:
+    """Schedule termination params from ``{"step", "params": {...}}`` stages.
+
+    Scheduled params are swapped for device tensors in the termination term's
+    ``params``, so the term function must accept a 0-d tensor for them.
+    """
+
+    def __init__(self, cfg: CurriculumTermCfg, env: "ManagerBasedRlEnv"):
+        stages = cfg.params["stages"]
+        interpolate = cfg.params.get("interpolate", False)
+        term_cfg = env.termination_manager.get_term_cfg(cfg.params["termination_name"])
+        keys = sorted({key for stage in stages for key in stage["params"]})
+
+        self._schedules: dict[str, Schedule] = {}
+        self._initial: dict[str, float] = {}
+        self._current: dict[str, float] = {}
+        self._tensors: dict[str, torch.Tensor] = {}
+        for key in keys:
+            keyed = [stage for stage in stages if key in stage["params"]]
+            self._schedules[key] = Schedule(
+                [stage["step"] for stage in keyed],
+                [stage["params"][key] for stage in keyed],
+                interpolate=interpolate,
+            )
+            initial = float(term_cfg.params[key])
+            self._initial[key] = initial
+            self._current[key] = initial
+            self._tensors[key] = torch.tensor(initial, device=env.device)
+            term_cfg.params[key] = self._tensors[key]
+        self._logged = keys[0] if keys else None
+
+    def __call__(
+        self,
+        env: "ManagerBasedRlEnv",
+        env_ids: torch.Tensor,
+        termination_name: str,
+        stages: list[dict],
+        interpolate: bool = False,
+    ) -> float:
+        del env_ids, termination_name, stages, interpolate  # compiled in __init__
+        for key, schedule in self._schedules.items():
+            value = schedule(env.common_step_counter, self._initial[key])
+            if value != self._current[key]:
+                self._tensors[key].fill_(value)
+                self._current[key] = value
+        # Logged as Curriculum/<term>; the first scheduled param (e.g. threshold).
+        return self._current[self._logged] if self._logged else 0.0
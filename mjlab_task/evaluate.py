@@ -0,0 +1,379 @@
+"""Batched evaluation of trained T1 policies.
+
+``python train.py eval`` runs ``--episodes`` complete episodes of a Stand /
+Getup policy in the task's play configuration (every episode starts fallen,
+``episode_length_s=20``) on ``--num-envs`` parallel envs. Each env runs a
+fixed share of the episodes back to back (auto-reset between them), so the
+result depends only on the seed, the env count and the policy, and short
+episodes are not over-represented.
+
+Per episode, measured on the post-physics state of every step -- the state
+the termination terms see, including the terminal step, before the reset:
+
+* success and time to stand -- ``stand_mdp.stand_success`` (trunk upright and
+  at standing height) latched over the episode, and the first step it held;
+* peak power -- ``stand_mdp.mechanical_power``, the formula of
+  ``energy_termination``, ignoring the same ``settle_steps`` as the task's
+  ``energy`` termination;
+* self-collision -- steps in which the ``self_collision`` contact sensor
+  (Trunk subtree against itself) found a contact;
+* length and the termination terms that ended it.
+
+The report (``eval.json``) has the success rate with a 95 % Wilson interval,
+time-to-stand and peak-power distributions, self-collision rates and the
+termination breakdown; ``--per-episode`` adds the raw values.
+``--record-envs`` also records those envs with ``RolloutRecorder`` for
+``train.py replay``:
+
+    python train.py eval --task T1-Getup-v0 --episodes 4096 --num-envs 1024
+    python train.py replay logs/eval/<run>/rollout --failures
+
+Cost is episodes x episode length: the defaults (2048 episodes of 20 s) are
+about 2M env steps, which took ~3 h on a single CPU core (180 env-steps/s at
+512 envs). ``--episodes 512 --episode-length-s 5`` is a ~12 minute pass there.
+"""
+
+import argparse
+import json
+import math
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import torch
+
+_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+class EpisodeMetrics:
+    """Per-env accumulators of the running episodes, updated every time the
+    env computes its terminations (wraps ``termination_manager.compute`` of
+    that instance)."""
+
+    def __init__(self, env):
+        from mjlab.managers.scene_entity_config import SceneEntityCfg
+
+        from .stand_mdp import stand_success
+
+        self._env = env
+        self._trunk = SceneEntityCfg("robot", body_names=("Trunk",))
+        self._trunk.resolve(env.scene)
+        self._robot = SceneEntityCfg("robot")
+        self._robot.resolve(env.scene)
+        self._success = stand_success(None, env)
+        terminations = env.termination_manager
+        self.settle_steps = 0
+        self.energy_threshold = None
+        if "energy" in terminations.active_terms:
+            params = terminations.get_term_cfg("energy").params
+            self.settle_steps = params.get("settle_steps", 0)
+            self.energy_threshold = float(params.get("threshold", math.inf))
+        self._sensor = env.scene.sensors.get("self_collision")
+        zeros = torch.zeros(env.num_envs, device=env.device)
+        self.stand_step = torch.full_like(zeros, -1)
+        self.peak_power = zeros.clone()
+        self.collision_steps = zeros.clone()
+        self.length = zeros.clone()
+        self._original_compute = None
+
+    def attach(self) -> "EpisodeMetrics":
+        if self._original_compute is not None:
+            return self
+        manager = self._env.termination_manager
+        original = manager.compute
+        self._original_compute = original
+
+        def compute():
+            self._measure()
+            return original()
+
+        manager.compute = compute
+        return self
+
+    def close(self) -> None:
+        if self._original_compute is not None:
+            self._env.termination_manager.compute = self._original_compute
+            self._original_compute = None
+
+    def _measure(self) -> None:
+        from .stand_mdp import mechanical_power
+
+        env = self._env
+        episode_step = env.episode_length_buf.float()
+        stood_up = self._success(env, asset_cfg=self._trunk) > 0
+        first = stood_up & (self.stand_step < 0)
+        self.stand_step = torch.where(first, episode_step, self.stand_step)
+        power = mechanical_power(env, self._robot)
+        power = torch.where(env.episode_length_buf > self.settle_steps, power, 0.0)
+        self.peak_power = torch.maximum(self.peak_power, power)
+        if self._sensor is not None:
+            found = self._sensor.data.found.reshape(env.num_envs, -1)
+            self.collision_steps += (found > 0).any(dim=-1)
+        self.length = episode_step
+
+    def pop(self, env_ids: torch.Tensor) -> dict[str, np.ndarray]:
+        """Results of the episodes that just ended in ``env_ids``; clears them."""
+        terminations = self._env.termination_manager
+        names = terminations.active_terms
+        episode = {
+            "stand_step": self.stand_step[env_ids].long(),
+            "peak_power": self.peak_power[env_ids],
+            "collision_steps": self.collision_steps[env_ids],
+            "length": self.length[env_ids].long(),
+            "terminations": torch.stack(
+                [terminations.get_term(name)[env_ids] for name in names], dim=-1
+            ),
+        }
+        episode = {name: value.cpu().numpy() for name, value in episode.items()}
+        self.stand_step[env_ids] = -1
+        self.peak_power[env_ids] = 0.0
+        self.collision_steps[env_ids] = 0.0
+        self._success.reset(env_ids)
+        return episode
+
+
+def run_episodes(env, policy, episodes: int, seed: int, metrics: EpisodeMetrics):
+    """Run ``episodes`` episodes (split evenly over the envs) from a seeded
+    reset; returns the per-episode arrays, in env order per round, and the
+    number of env steps simulated."""
+    quota = torch.full((env.num_envs,), episodes // env.num_envs, device=env.device)
+    quota[: episodes % env.num_envs] += 1
+    finished = torch.zeros_like(quota)
+    results: list[dict[str, np.ndarray]] = []
+    steps = 0
+    obs, _ = env.reset(seed=seed)
+    # no_grad, not inference_mode: the env's buffers are updated in place later.
+    with torch.no_grad():
+        while (finished < quota).any():
+            actions = policy(obs["policy"])
+            obs, _, terminated, time_out, _ = env.step(actions.to(env.device))
+            steps += 1
+            ended = (terminated | time_out) & (finished < quota)
+            env_ids = ended.nonzero(as_tuple=False).squeeze(-1)
+            if len(env_ids):
+                results.append(metrics.pop(env_ids))
+                finished[env_ids] += 1
+    merged = {name: np.concatenate([r[name] for r in results]) for name in results[0]}
+    return merged, steps * env.num_envs
+
+
+def wilson_interval(successes: int, total: int, z: float = 1.96) -> list[float]:
+    """95 % Wilson score interval of a success rate."""
+    if total == 0:
+        return [0.0, 1.0]
+    rate = successes / total
+    center = (rate + z * z / (2 * total)) / (1 + z * z / total)
+    half = (
+        z
+        * math.sqrt(rate * (1 - rate) / total + z * z / (4 * total * total))
+        / (1 + z * z / total)
+    )
+    return [max(center - half, 0.0), min(center + half, 1.0)]
+
+
+def distribution(values: np.ndarray) -> dict | None:
+    """Mean, percentiles and max of ``values`` (``None`` when empty)."""
+    if len(values) == 0:
+        return None
+    summary = {"count": int(len(values)), "mean": float(values.mean())}
+    for q, value in zip(_PERCENTILES, np.percentile(values, _PERCENTILES)):
+        summary[f"p{q}"] = float(value)
+    summary["max"] = float(values.max())
+    return summary
+
+
+def summarize(episodes: dict[str, np.ndarray], metrics: EpisodeMetrics, env) -> dict:
+    step_dt = env.step_dt
+    total = len(episodes["length"])
+    success = episodes["stand_step"] >= 0
+    time_to_stand = episodes["stand_step"][success] * step_dt
+    edges = np.arange(0.0, env.max_episode_length_s + 1.0, 1.0)
+    counts, _ = np.histogram(time_to_stand, bins=edges)
+    collided = episodes["collision_steps"] > 0
+    names = env.termination_manager.active_terms
+    report = {
+        "episodes": total,
+        "success_rate": float(success.mean()),
+        "success_ci95": wilson_interval(int(success.sum()), total),
+        "time_to_stand_s": distribution(time_to_stand),
+        "time_to_stand_histogram": {
+            "edges_s": edges.tolist(),
+            "counts": counts.tolist(),
+        },
+        "peak_power_w": distribution(episodes["peak_power"]),
+        "self_collision": {
+            "episode_rate": float(collided.mean()),
+            "step_fraction": float(
+                episodes["collision_steps"].sum() / episodes["length"].sum()
+            ),
+        },
+        "episode_length_s": distribution(episodes["length"] * step_dt),
+        "terminations": {
+            name: float(episodes["terminations"][:, index].mean())
+            for index, name in enumerate(names)
+        },
+        "settle_steps": metrics.settle_steps,
+    }
+    if metrics.energy_threshold is not None and math.isfinite(metrics.energy_threshold):
+        report["energy_threshold_w"] = metrics.energy_threshold
+    return report
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="train.py eval",
+        description="Evaluate a T1 policy on thousands of play-mode episodes",
+    )
+    parser.add_argument("--task", type=str, default="T1-Stand-v0")
+    parser.add_argument(
+        "--policy",
+        type=str,
+        default=None,
+        help="Exported policy.pt; default: the task's checkpoint (see --checkpoint)",
+    )
+    parser.add_argument("--checkpoint", type=str, default=None)
+    parser.add_argument(
+        "--checkpoint-select", choices=["latest", "best"], default="best"
+    )
+    parser.add_argument("--episodes", type=int, default=2048)
+    parser.add_argument("--num-envs", type=int, default=512)
+    parser.add_argument(
+        "--episode-length-s",
+        type=float,
+        default=None,
+        help="Override the play-mode episode length (20 s)",
+    )
+    parser.add_argument(
+        "--record-envs",
+        type=int,
+        default=0,
+        help="Record the first N envs for train.py replay",
+    )
+    parser.add_argument(
+        "--per-episode", action="store_true", help="Add per-episode values"
+    )
+    parser.add_argument("--threads", type=int, default=None, help="torch threads")
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None, help="Report directory")
+    args = parser.parse_args(argv)
+    if args.episodes < 1 or args.num_envs < 1:
+        parser.error("--episodes and --num-envs must be at least 1")
+
+    from mjlab.envs import ManagerBasedRlEnv
+    from mjlab.tasks.registry import load_env_cfg
+
+    import mjlab_task  # noqa: F401
+    from mjlab_task.export import load_actor, resolve_checkpoint
+    from mjlab_task.rollout_recorder import RolloutRecorder
+
+    if args.threads is not None:
+        torch.set_num_threads(args.threads)
+    if args.policy is not None:
+        policy = torch.jit.load(args.policy, map_location=args.device)
+        source = args.policy
+    else:
+        source = resolve_checkpoint(args.task, args.checkpoint, args.checkpoint_select)
+        policy = load_actor(source, args.task).to(args.device)
+
+    env_cfg = load_env_cfg(args.task, play=True)
+    env_cfg.scene.num_envs = min(args.num_envs, args.episodes)
+    # Seeded before construction too: startup events draw from the RNGs.
+    env_cfg.seed = args.seed
+    if args.episode_length_s is not None:
+        env_cfg.episode_length_s = args.episode_length_s
+    env = ManagerBasedRlEnv(cfg=env_cfg, device=args.device)
+    name = f"{args.task}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
+    output = Path(args.output or Path("logs") / "eval" / name)
+    output.mkdir(parents=True, exist_ok=True)
+    recorder = None
+    if args.record_envs:
+        recorder = RolloutRecorder(
+            env,
+            output / "rollout",
+            ("policy",),
+            list(range(min(args.record_envs, env.num_envs))),
+            metadata={"task": args.task, "policy": str(source), "play": True},
+        ).attach()
+
+    print(
+        f"[INFO] Evaluating {source} on {args.episodes} episodes of {args.task}"
+        f" ({env.num_envs} envs, {env.max_episode_length_s:g} s)"
+    )
+    metrics = EpisodeMetrics(env).attach()
+    start = time.perf_counter()
+    try:
+        episodes, env_steps = run_episodes(
+            env, policy, args.episodes, args.seed, metrics
+        )
+    finally:
+        metrics.close()
+        if recorder is not None:
+            recorder.close()
+    seconds = time.perf_counter() - start
+
+    report = {
+        "task": args.task,
+        "policy": str(source),
+        "seed": args.seed,
+        "num_envs": env.num_envs,
+        "step_dt": env.step_dt,
+        "max_episode_length_s": env.max_episode_length_s,
+        **summarize(episodes, metrics, env),
+        "runtime": {
+            "seconds": seconds,
+            "env_steps": env_steps,
+            "env_steps_per_s": env_steps / seconds,
+        },
+    }
+    env.close()
+    if args.per_episode:
+        report["per_episode"] = {
+            "time_to_stand_s": [
+                None if step < 0 else float(step * env.step_dt)
+                for step in episodes["stand_step"]
+            ],
+            "peak_power_w": episodes["peak_power"].tolist(),
+            "self_collision_steps": episodes["collision_steps"].astype(int).tolist(),
+            "length_steps": episodes["length"].astype(int).tolist(),
+        }
+    path = output / "eval.json"
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    low, high = report["success_ci95"]
+    tts = report["time_to_stand_s"]
+    power = report["peak_power_w"]
+    collision = report["self_collision"]
+    print(f"\n{args.task}: {report['episodes']} episodes, seed {args.seed}")
+    print(
+        f"  success          {report['success_rate']:.1%}"
+        f" (95% CI {low:.1%} - {high:.1%})"
+    )
+    if tts is not None:
+        print(
+            f"  time to stand    p5 {tts['p5']:.2f}  p50 {tts['p50']:.2f}"
+            f"  p95 {tts['p95']:.2f} s"
+        )
+    print(
+        f"  peak power       p50 {power['p50']:.0f}  p95 {power['p95']:.0f}"
+        f"  max {power['max']:.0f} W"
+    )
+    print(
+        f"  self-collision   {collision['episode_rate']:.1%} of episodes,"
+        f" {collision['step_fraction']:.2%} of steps"
+    )
+    for term, share in report["terminations"].items():
+        print(f"  ended by {term:<8} {share:.1%}")
+    print(
+        f"[INFO] {env_steps} env steps in {seconds:.0f} s"
+        f" ({env_steps / seconds:.0f} env-steps/s)"
+    )
+    if recorder is not None:
+        print(f"Wrote {output / 'rollout'}")
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""Export a trained T1 actor for deployment inference.
+
+``python train.py export`` loads the actor of an rsl_rl checkpoint and writes,
+next to it in ``<run>/exported/`` (or ``--output``):
+
+* ``policy.pt``   -- TorchScript module, ``actions = policy(obs)``;
+* ``policy.onnx`` -- the same graph (input ``obs``, output ``actions``) with a
+  dynamic batch axis, so one file serves batch 1 and batched requests;
+* ``policy.json`` -- the deployment metadata, also embedded in both models
+  (``metadata.json`` extra file / ONNX ``metadata_props``).
+
+The metadata records the actor observation layout -- the ``policy`` group
+built from ``T1StandCfgGen._actor_obs``: term names, sizes and offsets into
+the observation vector -- plus joint names, default joint positions, PD gains,
+action scale and control period, read from the task's play environment:
+
+    python train.py export --task T1-Stand-v0 --checkpoint-select best
+    python -m mjlab_task.export --task T1-Stand-v0 --checkpoint path/model_300.pt
+
+Observation normalization, if the agent uses it, is folded into the graph.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import torch
+from torch import nn
+
+METADATA_FILE = "metadata.json"
+
+
+class ActorPolicy(nn.Module):
+    """Deterministic actor: ``actor((obs - obs_mean) / obs_std)``."""
+
+    def __init__(self, actor: nn.Module, obs_mean: torch.Tensor, obs_std: torch.Tensor):
+        super().__init__()
+        self.actor = actor
+        self.register_buffer("obs_mean", obs_mean.reshape(1, -1).clone())
+        self.register_buffer("obs_std", obs_std.reshape(1, -1).clone())
+
+    @property
+    def num_obs(self) -> int:
+        return self.obs_mean.shape[1]
+
+    @property
+    def num_actions(self) -> int:
+        return self.actor[-1].out_features
+
+    def forward(self, obs: torch.Tensor) -> torch.Tensor:
+        return self.actor((obs - self.obs_mean) / self.obs_std)
+
+
+def load_actor(checkpoint: str | Path, task_id: str) -> ActorPolicy:
+    """Rebuild the actor MLP of ``task_id``'s agent from an rsl_rl checkpoint."""
+    from mjlab.tasks.registry import load_rl_cfg
+    from rsl_rl.networks import MLP
+
+    import mjlab_task  # noqa: F401
+
+    policy_cfg = load_rl_cfg(task_id).policy
+    state = torch.load(checkpoint, map_location="cpu", weights_only=False)
+    state = state["model_state_dict"]
+    actor_state = {
+        key.removeprefix("actor."): value
+        for key, value in state.items()
+        if key.startswith("actor.")
+    }
+    layers = sorted(int(key.split(".")[0]) for key in actor_state)
+    num_obs = actor_state[f"{layers[0]}.weight"].shape[1]
+    num_actions = actor_state[f"{layers[-1]}.weight"].shape[0]
+
+    actor = MLP(
+        num_obs, num_actions, policy_cfg.actor_hidden_dims, policy_cfg.activation
+    )
+    actor.load_state_dict(actor_state)
+    if "actor_obs_normalizer._mean" in state:
+        # EmpiricalNormalization: (obs - mean) / (std + eps), eps = 1e-2.
+        obs_mean = state["actor_obs_normalizer._mean"]
+        obs_std = state["actor_obs_normalizer._std"] + 1e-2
+    else:
+        obs_mean = torch.zeros(num_obs)
+        obs_std = torch.ones(num_obs)
+    return ActorPolicy(actor, obs_mean, obs_std).eval()
+
+
+def resolve_checkpoint(
+    task_id: str,
+    checkpoint: str | None = None,
+    select: str = "best",
+    iteration: int | None = None,
+) -> str:
+    """``checkpoint`` if given, else the task's catalog entry (see train.py)."""
+    if checkpoint is not None:
+        return checkpoint
+    from mjlab.tasks.registry import load_rl_cfg
+
+    import mjlab_task  # noqa: F401
+    from mjlab_task.checkpoint_catalog import find_checkpoint
+
+    experiment_name = load_rl_cfg(task_id).experiment_name
+    experiment_dir = Path("logs") / "rsl_rl" / experiment_name
+    found = find_checkpoint(experiment_dir, select, iteration)
+    if found is None:
+        raise SystemExit(f"No matching checkpoint in {experiment_dir}")
+    return str(found)
+
+
+def observation_layout(env, group: str = "policy") -> list[dict]:
+    """``[{name, offset, size}]`` of the terms of an observation group."""
+    manager = env.observation_manager
+    layout = []
+    offset = 0
+    for name, shape in zip(
+        manager.active_terms[group], manager.group_obs_term_dim[group]
+    ):
+        size = int(torch.tensor(shape).prod())
+        layout.append({"name": name, "offset": offset, "size": size})
+        offset += size
+    return layout
+
+
+def env_metadata(env, task_id: str, checkpoint: str | Path | None = None) -> dict:
+    """Observation layout and joint metadata of a built ``task_id`` env."""
+    from mjlab.rl.exporter_utils import get_base_metadata
+
+    layout = observation_layout(env)
+    metadata = get_base_metadata(env, str(checkpoint or ""))
+    metadata.update(
+        task=task_id,
+        num_obs=sum(term["size"] for term in layout),
+        num_actions=env.action_manager.total_action_dim,
+        observation_layout=layout,
+        step_dt=env.step_dt,
+    )
+    return metadata
+
+
+def policy_metadata(task_id: str, checkpoint: str | Path | None = None) -> dict:
+    """``env_metadata`` of a one-env CPU instance of ``task_id``'s play env."""
+    from mjlab.envs import ManagerBasedRlEnv
+    from mjlab.tasks.registry import load_env_cfg
+
+    import mjlab_task  # noqa: F401
+
+    env_cfg = load_env_cfg(task_id, play=True)
+    env_cfg.scene.num_envs = 1
+    env = ManagerBasedRlEnv(cfg=env_cfg, device="cpu")
+    try:
+        return env_metadata(env, task_id, checkpoint)
+    finally:
+        env.close()
+
+
+def export_torchscript(policy: ActorPolicy, path: str | Path, metadata: dict) -> None:
+    scripted = torch.jit.script(policy)
+    scripted.save(str(path), _extra_files={METADATA_FILE: json.dumps(metadata)})
+
+
+def export_onnx(policy: ActorPolicy, path: str | Path, metadata: dict) -> None:
+    import onnx
+
+    torch.onnx.export(
+        policy,
+        (torch.zeros(1, policy.num_obs),),
+        str(path),
+        input_names=["obs"],
+        output_names=["actions"],
+        dynamic_axes={"obs": {0: "batch"}, "actions": {0: "batch"}},
+        opset_version=17,
+        dynamo=False,
+    )
+    model = onnx.load(str(path))
+    entry = model.metadata_props.add()
+    entry.key = METADATA_FILE
+    entry.value = json.dumps(metadata)
+    onnx.checker.check_model(model)
+    onnx.save(model, str(path))
+
+
+def load_metadata(path: str | Path) -> dict:
+    """Metadata embedded in an exported ``.pt`` / ``.onnx`` policy."""
+    path = Path(path)
+    if path.suffix == ".onnx":
+        import onnx
+
+        model = onnx.load(str(path), load_external_data=False)
+        props = {entry.key: entry.value for entry in model.metadata_props}
+        return json.loads(props[METADATA_FILE])
+    extra_files = {METADATA_FILE: ""}
+    torch.jit.load(str(path), map_location="cpu", _extra_files=extra_files)
+    return json.loads(extra_files[METADATA_FILE])
+
+
+def export_policy(
+    checkpoint: str | Path, task_id: str, output_dir: str | Path
+) -> dict[str, Path]:
+    """Write ``policy.pt``, ``policy.onnx`` and ``policy.json`` to ``output_dir``."""
+    policy = load_actor(checkpoint, task_id)
+    metadata = policy_metadata(task_id, checkpoint)
+    if metadata["num_obs"] != policy.num_obs:
+        raise ValueError(
+            f"Checkpoint actor takes {policy.num_obs} observations but "
+            f"{task_id} provides {metadata['num_obs']}"
+        )
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "torchscript": output_dir / "policy.pt",
+        "onnx": output_dir / "policy.onnx",
+        "metadata": output_dir / "policy.json",
+    }
+    export_torchscript(policy, paths["torchscript"], metadata)
+    export_onnx(policy, paths["onnx"], metadata)
+    with open(paths["metadata"], "w") as f:
+        json.dump(metadata, f, indent=2)
+
+    # The scripted graph must reproduce the eager actor.
+    obs = torch.randn(16, policy.num_obs)
+    scripted = torch.jit.load(str(paths["torchscript"]))
+    with torch.inference_mode():
+        error = (scripted(obs) - policy(obs)).abs().max().item()
+    if error > 1e-5:
+        raise RuntimeError(f"TorchScript export differs from the actor by {error}")
+    return paths
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="train.py export", description="Export a Booster T1 actor"
+    )
+    parser.add_argument("--task", type=str, default="T1-Stand-v0")
+    parser.add_argument("--checkpoint", type=str, default=None)
+    parser.add_argument(
+        "--checkpoint-select", choices=["latest", "best"], default="best"
+    )
+    parser.add_argument("--checkpoint-iteration", type=int, default=None)
+    parser.add_argument(
+        "--output", type=str, default=None, help="Default: <run>/exported"
+    )
+    args = parser.parse_args(argv)
+
+    checkpoint = resolve_checkpoint(
+        args.task, args.checkpoint, args.checkpoint_select, args.checkpoint_iteration
+    )
+    output_dir = args.output or Path(checkpoint).parent / "exported"
+
+    paths = export_policy(checkpoint, args.task, output_dir)
+    metadata = load_metadata(paths["onnx"])
+    layout = ", ".join(
+        f"{term['name']}[{term['size']}]" for term in metadata["observation_layout"]
+    )
+    print(f"[INFO] Exported {checkpoint}")
+    print(f"[INFO] obs ({metadata['num_obs']}): {layout}")
+    print(f"[INFO] actions: {metadata['num_actions']}")
+    for path in paths.values():
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
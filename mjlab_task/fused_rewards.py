@@ -0,0 +1,289 @@
+"""Fused evaluation of the T1 stand/getup reward set.
+
+Each reward term normally gathers its own view of the robot state: the height
+terms go through ``body_link_pos_w`` (a concat of every body pose), the
+orientation reward and posture gate rebuild projected gravity, and the joint
+terms each index ``qpos``/``qvel``. ``fuse_rewards`` rewrites a reward dict so
+the supported terms read one column of a shared ``(num_envs, num_terms)``
+buffer instead. ``FusedRewardKernel`` fills that buffer once per env step:
+
+1. gather the state every term needs once (gravity, the z of each body used by
+   a height term, joint pos/vel, actions, contact sensor outputs), then
+2. evaluate all terms in a single function and write them with one ``stack``.
+
+Step 2 is optionally ``torch.compile``d, which fuses the element-wise work into
+a few kernels. Reward weights, curriculum schedules and per-term logging are
+untouched: the reward manager still sees one term per name and applies the
+weights itself. Terms whose function is not in ``_BUILDERS`` are left as is.
+"""
+
+import inspect
+import math
+import os
+from typing import TYPE_CHECKING, Callable, Literal
+
+import torch
+from mjlab.entity import Entity
+from mjlab.envs import mdp
+from mjlab.managers.reward_manager import RewardTermCfg
+
+from . import getup_mdp, stand_env, stand_mdp
+
+if TYPE_CHECKING:
+    from mjlab.envs import ManagerBasedRlEnv
+
+FusedMode = Literal["eager", "compile"]
+FUSED_REWARDS_ENV = "BOOSTER_T1_FUSED_REWARDS"
+
+_State = dict[str, torch.Tensor]
+_TermFn = Callable[[_State], torch.Tensor]
+
+
+def default_fused_rewards() -> FusedMode | None:
+    """Fused mode selected through ``BOOSTER_T1_FUSED_REWARDS``, if any."""
+    mode = os.environ.get(FUSED_REWARDS_ENV) or None
+    if mode not in (None, "eager", "compile"):
+        raise ValueError(
+            f"{FUSED_REWARDS_ENV} must be 'eager' or 'compile', got {mode!r}"
+        )
+    return mode
+
+
+def _resolved_params(source, params: dict) -> dict:
+    """``params`` completed with the defaults of ``source``'s signature."""
+    fn = source.__call__ if inspect.isclass(source) else source
+    defaults = {
+        name: p.default
+        for name, p in inspect.signature(fn).parameters.items()
+        if p.default is not inspect.Parameter.empty
+    }
+    return {**defaults, **params}
+
+
+def _joint_index(ids, device: str):
+    if isinstance(ids, slice):
+        return ids
+    return torch.as_tensor(ids, dtype=torch.long, device=device)
+
+
+class FusedRewardKernel:
+    """Evaluates every fused reward term of an env once per env step."""
+
+    def __init__(self, env: "ManagerBasedRlEnv", compile: bool = False):
+        self._env = env
+        self._asset: Entity = env.scene["robot"]
+        self._body_ids: list[int] = []
+        self._sensors: dict[str, tuple[str, ...]] = {}
+        self._up = torch.tensor([0.0, 0.0, -1.0], device=env.device)
+
+        names: list[str] = []
+        fns: list[_TermFn] = []
+        manager = env.reward_manager
+        for name in manager.active_terms:
+            term_cfg = manager.get_term_cfg(name)
+            if isinstance(term_cfg.func, fused_reward):
+                params = _resolved_params(term_cfg.func.source, term_cfg.params)
+                params.pop("source")
+                params.pop("compile")
+                names.append(name)
+                fns.append(_BUILDERS[term_cfg.func.source](self, term_cfg, params))
+        self.columns = {name: i for i, name in enumerate(names)}
+        self._fns = fns
+        self._body_index = torch.tensor(
+            [self._asset.indexing.body_ids[i] for i in self._body_ids],
+            dtype=torch.long,
+            device=env.device,
+        )
+        self._evaluate = self._evaluate_eager
+        if compile:
+            self._evaluate = torch.compile(self._evaluate_eager, dynamic=False)
+        self._values = torch.zeros(env.num_envs, len(fns), device=env.device)
+        self._step = -1
+
+    # ---- build-time registration (used by the term builders) ----
+    def body_column(self, local_body_id: int) -> int:
+        if local_body_id not in self._body_ids:
+            self._body_ids.append(local_body_id)
+        return self._body_ids.index(local_body_id)
+
+    def sensor(self, sensor_name: str, *fields: str) -> None:
+        known = self._sensors.get(sensor_name, ())
+        self._sensors[sensor_name] = known + tuple(f for f in fields if f not in known)
+
+    # ---- per step ----
+    def _gather(self) -> _State:
+        data = self._asset.data
+        action_manager = self._env.action_manager
+        state = {
+            "gravity": data.projected_gravity_b,
+            "body_z": data.data.xpos[:, self._body_index, 2],
+            "joint_pos": data.joint_pos,
+            "joint_vel": data.joint_vel,
+            "soft_joint_pos_limits": data.soft_joint_pos_limits,
+            "action": action_manager.action,
+            "prev_action": action_manager.prev_action,
+        }
+        for sensor_name, fields in self._sensors.items():
+            sensor_data = self._env.scene[sensor_name].data
+            for field in fields:
+                state[f"{sensor_name}/{field}"] = getattr(sensor_data, field)
+        return state
+
+    def _evaluate_eager(self, state: _State) -> torch.Tensor:
+        diff = self._up - state["gravity"]
+        state = {**state, "upright_error": torch.sum(diff * diff, dim=-1)}
+        return torch.stack([fn(state) for fn in self._fns], dim=1)
+
+    @property
+    def values(self) -> torch.Tensor:
+        """``(num_envs, num_terms)`` unweighted term values for this step."""
+        step = self._env.common_step_counter
+        if step != self._step:
+            self._values.copy_(self._evaluate(self._gather()))
+            self._step = step
+        return self._values
+
+
+class fused_reward:
+    """Reward term reading its column of the env's ``FusedRewardKernel``.
+
+    ``params`` are the original term's params plus ``source`` (the original
+    term function) and ``compile``.
+    """
+
+    def __init__(self, cfg: RewardTermCfg, env: "ManagerBasedRlEnv"):
+        self.source = cfg.params["source"]
+        self._compile = cfg.params.get("compile", False)
+        self._column: int | None = None
+
+    def __call__(self, env: "ManagerBasedRlEnv", **params) -> torch.Tensor:
+        del params  # consumed by the kernel builders
+        kernel = env.__dict__.get("_fused_reward_kernel")
+        if kernel is None:
+            kernel = env.__dict__["_fused_reward_kernel"] = FusedRewardKernel(
+                env, compile=self._compile
+            )
+        if self._column is None:
+            self._column = kernel.columns[self._term_name(env)]
+        return kernel.values[:, self._column]
+
+    def _term_name(self, env: "ManagerBasedRlEnv") -> str:
+        manager = env.reward_manager
+        for name in manager.active_terms:
+            if manager.get_term_cfg(name).func is self:
+                return name
+        raise RuntimeError("fused_reward is not a term of this reward manager")
+
+
+def fuse_rewards(
+    rewards: dict[str, RewardTermCfg], mode: FusedMode = "eager"
+) -> dict[str, RewardTermCfg]:
+    """Route every supported term of ``rewards`` through the fused kernel."""
+    fused = {}
+    for name, term_cfg in rewards.items():
+        if term_cfg.func not in _BUILDERS:
+            fused[name] = term_cfg
+            continue
+        fused[name] = RewardTermCfg(
+            func=fused_reward,
+            weight=term_cfg.weight,
+            params={
+                **term_cfg.params,
+                "source": term_cfg.func,
+                "compile": mode == "compile",
+            },
+        )
+    return fused
+
+
+# ---------------------------------------------------------------------------
+# Term builders: (kernel, term_cfg, params) -> fn(state) -> (num_envs,)
+# ---------------------------------------------------------------------------
+
+def _orientation(kernel, term_cfg, params) -> _TermFn:
+    return lambda s: torch.exp(-2.0 * s["upright_error"])
+
+
+def _gated_posture(kernel, term_cfg, params) -> _TermFn:
+    # Reuse the original term's std / default pose resolution.
+    source = term_cfg.func.source(cfg=term_cfg, env=kernel._env)
+    joint_ids = _joint_index(params["asset_cfg"].joint_ids, kernel._env.device)
+    inv_var = 1.0 / source.std**2
+    threshold = params["orientation_threshold"]
+
+    def fn(s: _State) -> torch.Tensor:
+        gate = (s["upright_error"] < threshold).float()
+        # Indexed every step, like the original term: the default pose may change.
+        default = source.default_joint_pos[:, joint_ids]
+        error_sq = torch.square(s["joint_pos"][:, joint_ids] - default)
+        return gate * torch.exp(-torch.mean(error_sq * inv_var, dim=1))
+
+    return fn
+
+
+def _body_height(kernel, term_cfg, params) -> _TermFn:
+    column = kernel.body_column(params["asset_cfg"].body_ids[0])
+    return lambda s: s["body_z"][:, column]
+
+
+def _height_reward(kernel, term_cfg, params) -> _TermFn:
+    column = kernel.body_column(params["asset_cfg"].body_ids[0])
+    desired = params["desired_height"]
+    norm = 1.0 / (math.exp(desired) - 1.0)
+
+    def fn(s: _State) -> torch.Tensor:
+        clamped = torch.clamp(s["body_z"][:, column], max=desired)
+        return (torch.exp(clamped) - 1.0) * norm
+
+    return fn
+
+
+def _feet_on_ground(kernel, term_cfg, params) -> _TermFn:
+    key = f"{params['sensor_name']}/found"
+    kernel.sensor(params["sensor_name"], "found")
+    return lambda s: (s[key] > 0).float().sum(dim=1)
+
+
+def _self_collision(kernel, term_cfg, params) -> _TermFn:
+    key = f"{params['sensor_name']}/force"
+    kernel.sensor(params["sensor_name"], "force")
+    return lambda s: -s[key].abs().sum(dim=-1).mean(dim=-1)
+
+
+def _joint_vel_l2(kernel, term_cfg, params) -> _TermFn:
+    joint_ids = _joint_index(params["asset_cfg"].joint_ids, kernel._env.device)
+    return lambda s: torch.sum(torch.square(s["joint_vel"][:, joint_ids]), dim=1)
+
+
+def _action_rate_l2(kernel, term_cfg, params) -> _TermFn:
+    return lambda s: torch.sum(torch.square(s["action"] - s["prev_action"]), dim=1)
+
+
+def _joint_pos_limits(kernel, term_cfg, params) -> _TermFn:
+    joint_ids = _joint_index(params["asset_cfg"].joint_ids, kernel._env.device)
+
+    def fn(s: _State) -> torch.Tensor:
+        joint_pos = s["joint_pos"][:, joint_ids]
+        limits = s["soft_joint_pos_limits"][:, joint_ids]
+        below = -(joint_pos - limits[..., 0]).clip(max=0.0)
+        above = (joint_pos - limits[..., 1]).clip(min=0.0)
+        return torch.sum(below + above, dim=1)
+
+    return fn
+
+
+_BUILDERS = {
+    stand_mdp.orientation_reward: _orientation,
+    getup_mdp.orientation_reward: _orientation,
+    stand_mdp.gated_posture_reward: _gated_posture,
+    getup_mdp.gated_posture_reward: _gated_posture,
+    stand_env.torso_height: _body_height,
+    stand_env.waist_height_reward: _height_reward,
+    getup_mdp.height_reward: _height_reward,
+    stand_env.feet_on_ground: _feet_on_ground,
+    stand_mdp.self_collision_cost: _self_collision,
+    getup_mdp.self_collision_cost: _self_collision,
+    mdp.joint_vel_l2: _joint_vel_l2,
+    mdp.action_rate_l2: _action_rate_l2,
+    mdp.joint_pos_limits: _joint_pos_limits,
+}
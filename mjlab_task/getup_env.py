@@ -2,9 +2,19 @@
 
 1 robot + 1 field per env. Adapted from mjlab_playground getup task.
 Scene uses assets/booster_t1/field.xml instead of flat plane.
+
+The field can be added in three ways (``field_mode``):
+  * ``"entity"``: a separate field entity. mjlab wraps fixed-base entities in a
+    mocap body, so every world carries and updates its own copy of all field geoms.
+  * ``"shared"``: the field is attached to the scene worldbody as static geometry,
+    shared by all worlds.
+  * ``"collision"``: like ``"shared"`` but only the geoms that can collide
+    (playing surface and goal frames); lines and fences are dropped.
 """
 
 import os
+from functools import partial
+from typing import Literal
 
 from mujoco import MjSpec
 
@@ -25,7 +35,10 @@ from mjlab.viewer import ViewerConfig
 from dataclasses import dataclass
 from mjlab.entity.entity import EntityCfg
 from . import getup_mdp
+from .curriculum import reward_weight_curriculum, termination_param_curriculum
+from .fused_rewards import FusedMode, default_fused_rewards, fuse_rewards
 from .getup_mdp import SettleRelativeJointPositionActionCfg
+from .pose_bank import default_pose_bank
 from .robot_cfg import BoosterT1Cfg
 
 _TORSO_HEIGHT = 0.67
@@ -44,6 +57,8 @@ _POSTURE_STD = {
 
 _FIELD_XML = os.path.join(os.path.dirname(__file__), "../assets/booster_t1/field.xml")
 
+FieldMode = Literal["entity", "shared", "collision"]
+
 
 @dataclass
 class FieldCfg(EntityCfg):
@@ -53,7 +68,37 @@ class FieldCfg(EntityCfg):
         self.spec_fn = lambda: MjSpec.from_file(_FIELD_XML)
 
 
-def getup_env_cfg(play: bool = False) -> ManagerBasedRlEnvCfg:
+def field_spec(decorative: bool = True) -> MjSpec:
+    """Load the field, optionally stripping geoms that never collide."""
+    spec = MjSpec.from_file(_FIELD_XML)
+    if not decorative:
+        spec.delete(spec.body("fence"))
+        for geom in list(spec.geoms):
+            if geom.contype == 0 and geom.conaffinity == 0:
+                spec.delete(geom)
+    return spec
+
+
+def attach_static_field(scene_spec: MjSpec, decorative: bool = True) -> None:
+    """Attach the field to the scene worldbody so all worlds share it."""
+    frame = scene_spec.worldbody.add_frame()
+    scene_spec.attach(field_spec(decorative), prefix="field/", frame=frame)
+
+
+def getup_env_cfg(
+    play: bool = False,
+    field_mode: FieldMode | None = None,
+    pose_bank: str | None = None,
+    fused_rewards: FusedMode | None = None,
+) -> ManagerBasedRlEnvCfg:
+    # Decorative field geoms are only worth their per-world cost when rendered.
+    if field_mode is None:
+        field_mode = "shared" if play else "collision"
+    if pose_bank is None:
+        pose_bank = default_pose_bank()
+    if fused_rewards is None:
+        fused_rewards = default_fused_rewards()
+
     actor_terms = {
         "base_ang_vel": ObservationTermCfg(
             func=mdp.builtin_sensor,
@@ -115,6 +160,8 @@ def getup_env_cfg(play: bool = False) -> ManagerBasedRlEnvCfg:
                 "fall_probability": 1.0 if play else 0.6,
                 "fall_height": 0.8,
                 "velocity_range": 0.5,
+                # Settled fallen states to reset into (see pose_bank.py)
+                "pose_bank": pose_bank,
             },
         ),
         "encoder_bias": EventTermCfg(
@@ -232,6 +279,9 @@ def getup_env_cfg(play: bool = False) -> ManagerBasedRlEnvCfg:
         ),
     }
 
+    if fused_rewards is not None:
+        rewards = fuse_rewards(rewards, fused_rewards)
+
     terminations = {
         "time_out": TerminationTermCfg(func=mdp.time_out, time_out=True),
         "energy": TerminationTermCfg(
@@ -242,7 +292,7 @@ def getup_env_cfg(play: bool = False) -> ManagerBasedRlEnvCfg:
 
     curriculum = {
         "action_rate_weight": CurriculumTermCfg(
-            func=getup_mdp.reward_curriculum,
+            func=reward_weight_curriculum,
             params={
                 "reward_name": "action_rate_l2",
                 "stages": [
@@ -254,7 +304,7 @@ def getup_env_cfg(play: bool = False) -> ManagerBasedRlEnvCfg:
             },
         ),
         "joint_vel_weight": CurriculumTermCfg(
-            func=getup_mdp.reward_curriculum,
+            func=reward_weight_curriculum,
             params={
                 "reward_name": "joint_vel_l2",
                 "stages": [
@@ -266,7 +316,7 @@ def getup_env_cfg(play: bool = False) -> ManagerBasedRlEnvCfg:
             },
         ),
         "energy_threshold": CurriculumTermCfg(
-            func=getup_mdp.termination_curriculum,
+            func=termination_param_curriculum,
             params={
                 "termination_name": "energy",
                 "stages": [
@@ -280,16 +330,22 @@ def getup_env_cfg(play: bool = False) -> ManagerBasedRlEnvCfg:
         ),
     }
 
+    entities = {"robot": BoosterT1Cfg(fidelity="full" if play else "train")}
+    scene_spec_fn = None
+    if field_mode == "entity":
+        entities["field"] = FieldCfg()
+    else:
+        scene_spec_fn = partial(
+            attach_static_field, decorative=field_mode == "shared"
+        )
+
     cfg = ManagerBasedRlEnvCfg(
         scene=SceneCfg(
-            entities={
-                "robot": BoosterT1Cfg(),
-                "field": FieldCfg(),
-            },
+            entities=entities,
             sensors=(self_collision_cfg,),
             num_envs=1,
             extent=2.0,
-            spec_fn=None,
+            spec_fn=scene_spec_fn,
             terrain=None,
         ),
         observations=observations,
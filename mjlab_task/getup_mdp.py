@@ -15,11 +15,13 @@ from mjlab.managers.scene_entity_config import SceneEntityCfg
 from mjlab.utils.lab_api.math import sample_uniform
 from mjlab.utils.lab_api.string import resolve_matching_names_values
 
+from .orientation import is_upright, upright_error
+from .pose_bank import load_pose_bank, sample_pose_bank
+
 if TYPE_CHECKING:
     from mjlab.envs import ManagerBasedRlEnv
 
 _DEFAULT_ASSET_CFG = SceneEntityCfg("robot")
-_UP_VEC = torch.tensor([0.0, 0.0, -1.0])
 
 
 @dataclass(kw_only=True)
@@ -43,16 +45,6 @@ class RelativeJointPositionAction(BaseAction):
         self._entity.set_joint_position_target(target, joint_ids=self._target_ids)
 
 
-def _is_upright(
-    asset: Entity,
-    orientation_threshold: float,
-) -> torch.Tensor:
-    gravity = asset.data.projected_gravity_b
-    up = _UP_VEC.to(gravity.device)
-    error = torch.sum(torch.square(up - gravity), dim=-1)
-    return (error < orientation_threshold).float()
-
-
 class SettleRelativeJointPositionActionCfg(RelativeJointPositionActionCfg):
     settle_steps: int = 0
 
@@ -87,8 +79,10 @@ def reset_fallen_or_standing(
     fall_probability: float = 0.6,
     fall_height: float = 0.5,
     velocity_range: float = 0.5,
+    pose_bank: str | None = None,
     asset_cfg: SceneEntityCfg = _DEFAULT_ASSET_CFG,
 ) -> None:
+    """Reset as fallen (random drop, or a settled ``pose_bank`` state) or standing."""
     if env_ids is None:
         env_ids = torch.arange(env.num_envs, device=env.device, dtype=torch.int)
 
@@ -109,19 +103,28 @@ def reset_fallen_or_standing(
         env.extras["settle_mask"] = torch.zeros(
             env.num_envs, device=env.device, dtype=torch.bool
         )
-    env.extras["settle_mask"][env_ids] = fall_mask
+    # Bank states are already settled
+    env.extras["settle_mask"][env_ids] = fall_mask & (pose_bank is None)
 
     root_states = default_root_state[env_ids].clone()
 
-    random_quat = torch.randn(n, 4, device=env.device)
-    random_quat = F.normalize(random_quat, dim=-1)
-
-    fallen_positions = env.scene.env_origins[env_ids].clone()
-    fallen_positions[:, 2] += fall_height
-
-    fallen_velocities = sample_uniform(
-        -velocity_range, velocity_range, (n, 6), env.device
-    )
+    if pose_bank is not None:
+        pose = sample_pose_bank(
+            load_pose_bank(pose_bank, env.device), n, default_joint_pos.shape[1]
+        )
+        fallen_positions = pose["root_pose"][:, 0:3] + env.scene.env_origins[env_ids]
+        random_quat = pose["root_pose"][:, 3:7]
+        fallen_velocities = pose["root_vel"]
+    else:
+        random_quat = torch.randn(n, 4, device=env.device)
+        random_quat = F.normalize(random_quat, dim=-1)
+
+        fallen_positions = env.scene.env_origins[env_ids].clone()
+        fallen_positions[:, 2] += fall_height
+
+        fallen_velocities = sample_uniform(
+            -velocity_range, velocity_range, (n, 6), env.device
+        )
 
     standing_positions = root_states[:, 0:3] + env.scene.env_origins[env_ids]
     standing_positions[:, 2] += 0.02
@@ -136,20 +139,23 @@ def reset_fallen_or_standing(
     )
     asset.write_root_link_velocity_to_sim(velocities, env_ids=env_ids)
 
-    joint_limits = soft_joint_pos_limits[env_ids]
-    random_joint_pos = sample_uniform(
-        joint_limits[..., 0],
-        joint_limits[..., 1],
-        joint_limits[..., 0].shape,
-        env.device,
-    )
+    if pose_bank is not None:
+        random_joint_pos = pose["joint_pos"]
+        fallen_joint_vel = pose["joint_vel"]
+    else:
+        joint_limits = soft_joint_pos_limits[env_ids]
+        random_joint_pos = sample_uniform(
+            joint_limits[..., 0],
+            joint_limits[..., 1],
+            joint_limits[..., 0].shape,
+            env.device,
+        )
+        fallen_joint_vel = sample_uniform(
+            -velocity_range, velocity_range, random_joint_pos.shape, env.device
+        )
 
     joint_pos = torch.where(mask, random_joint_pos, default_joint_pos[env_ids].clone())
-    joint_vel = torch.where(
-        mask,
-        sample_uniform(-velocity_range, velocity_range, joint_pos.shape, env.device),
-        default_joint_vel[env_ids].clone(),
-    )
+    joint_vel = torch.where(mask, fallen_joint_vel, default_joint_vel[env_ids].clone())
 
     asset.write_joint_state_to_sim(joint_pos, joint_vel, env_ids=env_ids)
 
@@ -158,11 +164,7 @@ def orientation_reward(
     env: ManagerBasedRlEnv,
     asset_cfg: SceneEntityCfg = _DEFAULT_ASSET_CFG,
 ) -> torch.Tensor:
-    asset: Entity = env.scene[asset_cfg.name]
-    gravity = asset.data.projected_gravity_b
-    up = _UP_VEC.to(gravity.device)
-    error = torch.sum(torch.square(up - gravity), dim=-1)
-    return torch.exp(-2.0 * error)
+    return torch.exp(-2.0 * upright_error(env, asset_cfg.name))
 
 
 def height_reward(
@@ -204,7 +206,7 @@ class gated_posture_reward:
     ) -> torch.Tensor:
         del std
         asset: Entity = env.scene[asset_cfg.name]
-        gate = _is_upright(asset, orientation_threshold)
+        gate = is_upright(env, orientation_threshold, asset_cfg.name)
         current_joint_pos = asset.data.joint_pos[:, asset_cfg.joint_ids]
         desired_joint_pos = self.default_joint_pos[:, asset_cfg.joint_ids]
         error_squared = torch.square(current_joint_pos - desired_joint_pos)
@@ -213,7 +215,7 @@ class gated_posture_reward:
 
 def energy_termination(
     env: ManagerBasedRlEnv,
-    threshold: float = float("inf"),
+    threshold: float | torch.Tensor = float("inf"),
     settle_steps: int = 0,
     asset_cfg: SceneEntityCfg = _DEFAULT_ASSET_CFG,
 ) -> torch.Tensor:
@@ -238,32 +240,3 @@ def self_collision_cost(
     contact_forces = sensor.data.force
     collision_force_magnitude = contact_forces.abs().sum(dim=-1)
     return -collision_force_magnitude.mean(dim=-1)
-
-
-def reward_curriculum(
-    env: ManagerBasedRlEnv,
-    env_ids: torch.Tensor,
-    reward_name: str,
-    stages: list[dict],
-) -> torch.Tensor:
-    del env_ids
-    reward_term_cfg = env.reward_manager.get_term_cfg(reward_name)
-    for stage in stages:
-        if env.common_step_counter > stage["step"]:
-            reward_term_cfg.weight = stage["weight"]
-    return torch.tensor([reward_term_cfg.weight])
-
-
-def termination_curriculum(
-    env: ManagerBasedRlEnv,
-    env_ids: torch.Tensor,
-    termination_name: str,
-    stages: list[dict],
-) -> torch.Tensor:
-    del env_ids
-    termination_term_cfg = env.termination_manager.get_term_cfg(termination_name)
-    for stage in stages:
-        if env.common_step_counter > stage["step"]:
-            for key, value in stage["params"].items():
-                setattr(termination_term_cfg, key, value)
-    return torch.tensor([0.0])
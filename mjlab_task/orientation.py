@@ -0,0 +1,68 @@
+"""Per-step cached orientation features shared by rewards, gates and terminations.
+
+Several terms need the upright error ``sum((up - g_b)^2)`` of the same robot in
+the same step (orientation reward, posture gate, success metric). The first term
+to ask computes it into a preallocated device buffer; later terms in the same
+env step reuse it. The cache is keyed on ``env.common_step_counter``, which
+``ManagerBasedRlEnv.step`` advances after physics and before terminations and
+rewards, so every term in a step sees the post-physics state.
+"""
+
+from typing import TYPE_CHECKING
+
+import torch
+from mjlab.entity import Entity
+
+if TYPE_CHECKING:
+    from mjlab.envs import ManagerBasedRlEnv
+
+
+class OrientationFeatures:
+    """Upright error of one entity, recomputed at most once per env step."""
+
+    def __init__(self, env: "ManagerBasedRlEnv", asset_name: str = "robot"):
+        self._env = env
+        self._asset: Entity = env.scene[asset_name]
+        # Target gravity in body frame when upright (gravity points -z in world).
+        self._up = torch.tensor([0.0, 0.0, -1.0], device=env.device)
+        self._diff = torch.empty(env.num_envs, 3, device=env.device)
+        self._error = torch.empty(env.num_envs, device=env.device)
+        self._step = -1
+
+    @property
+    def upright_error(self) -> torch.Tensor:
+        """``(num_envs,)`` squared distance between projected gravity and upright.
+
+        The returned buffer is overwritten on the next step; copy it to keep it.
+        """
+        step = self._env.common_step_counter
+        if step != self._step:
+            torch.sub(self._up, self._asset.data.projected_gravity_b, out=self._diff)
+            torch.sum(self._diff.square_(), dim=-1, out=self._error)
+            self._step = step
+        return self._error
+
+
+def orientation_features(
+    env: "ManagerBasedRlEnv", asset_name: str = "robot"
+) -> OrientationFeatures:
+    """The env's ``OrientationFeatures`` for ``asset_name``, created on first use."""
+    providers = env.__dict__.setdefault("_orientation_features", {})
+    features = providers.get(asset_name)
+    if features is None:
+        features = providers[asset_name] = OrientationFeatures(env, asset_name)
+    return features
+
+
+def upright_error(env: "ManagerBasedRlEnv", asset_name: str = "robot") -> torch.Tensor:
+    """Cached upright error for this step (see ``OrientationFeatures``)."""
+    return orientation_features(env, asset_name).upright_error
+
+
+def is_upright(
+    env: "ManagerBasedRlEnv",
+    orientation_threshold: float,
+    asset_name: str = "robot",
+) -> torch.Tensor:
+    """1.0 where the upright error is below ``orientation_threshold``, else 0.0."""
+    return (upright_error(env, asset_name) < orientation_threshold).float()
@@ -0,0 +1,283 @@
+"""Population-based training (PBT) for the Booster T1 tasks.
+
+``python train.py pbt`` trains ``--population`` members of one task at once,
+each in its own CPU-pinned worker (the ``mjlab_task.sweep`` pool). Members
+start from ``booster_t1_ppo_runner_cfg`` with their PPO hyperparameters
+(``T1RunnerCfg.pbt_hyperparams``: learning rate, entropy coefficient and
+desired KL by default) scaled by a random factor, except member 0 which keeps
+the registered config.
+
+Every ``pbt_interval`` iterations a member, inside ``VideoOnPolicyRunner.log``:
+
+1. publishes its weights, optimizer state, hyperparameters and mean episode
+   reward to the shared ``pbt_dir`` (``member_<k>.pt`` / ``member_<k>.json``);
+2. if its reward is in the bottom ``pbt_quantile`` of the published
+   population, copies the weights and optimizer state of a random member from
+   the top quantile (exploit), then multiplies each of the donor's
+   hyperparameters by a random ``pbt_perturb_factors`` entry (explore).
+
+Members never wait for each other (asynchronous PBT), so the shared directory
+is the only coordination; every exploit is appended to ``events.jsonl``:
+
+    python train.py pbt --task T1-Getup-v0 --population 4 --interval 100
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import torch
+
+DEFAULT_HYPERPARAMS = ("learning_rate", "entropy_coef", "desired_kl")
+
+
+class PopulationMember:
+    """One member's view of the shared PBT directory."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        member: int,
+        quantile: float = 0.25,
+        hyperparams: tuple[str, ...] = DEFAULT_HYPERPARAMS,
+        perturb_factors: tuple[float, ...] = (0.8, 1.2),
+        seed: int = 0,
+    ):
+        self.directory = Path(directory)
+        self.member = member
+        self.quantile = quantile
+        self.hyperparams = tuple(hyperparams)
+        self.perturb_factors = tuple(perturb_factors)
+        self._rng = random.Random(seed * 1000 + member)
+        self.exploits = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_cfg(cls, cfg: dict) -> "PopulationMember":
+        """Build from a ``T1RunnerCfg`` dict (the runner's ``cfg``)."""
+        return cls(
+            cfg["pbt_dir"],
+            cfg.get("pbt_member", 0),
+            cfg.get("pbt_quantile", 0.25),
+            cfg.get("pbt_hyperparams", DEFAULT_HYPERPARAMS),
+            cfg.get("pbt_perturb_factors", (0.8, 1.2)),
+            cfg.get("seed", 0),
+        )
+
+    def step(self, runner, iteration: int, score: float) -> dict | None:
+        """Publish this member, then exploit and explore if it is lagging.
+
+        Returns the exploit event, or ``None`` when the member kept training
+        its own weights.
+        """
+        self._publish(runner, iteration, score)
+        population = read_population(self.directory)
+        if len(population) < 2:
+            return None
+        ranked = sorted(population, key=lambda p: p["score"], reverse=True)
+        cutoff = max(1, int(len(ranked) * self.quantile))
+        bottom = {p["member"] for p in ranked[-cutoff:]}
+        top = [p for p in ranked[:cutoff] if p["member"] != self.member]
+        if self.member not in bottom or not top:
+            return None
+
+        donor = self._rng.choice(top)
+        state = torch.load(
+            self._checkpoint_path(donor["member"]),
+            map_location=runner.device,
+            weights_only=False,
+        )
+        # The rollout normalizers hold inference tensors; copy into them there.
+        with torch.inference_mode():
+            runner.alg.policy.load_state_dict(state["model_state_dict"])
+        runner.alg.optimizer.load_state_dict(state["optimizer_state_dict"])
+        hyperparams = {
+            name: value * self._rng.choice(self.perturb_factors)
+            for name, value in state["hyperparams"].items()
+        }
+        set_hyperparams(runner.alg, hyperparams)
+        self.exploits += 1
+        # Until its next evaluation the member is scored as the weights it copied.
+        self._publish(runner, iteration, donor["score"])
+
+        event = {
+            "time": time.time(),
+            "member": self.member,
+            "iteration": iteration,
+            "score": score,
+            "donor": donor["member"],
+            "donor_iteration": donor["iteration"],
+            "donor_score": donor["score"],
+            "hyperparams": hyperparams,
+        }
+        with open(self.directory / "events.jsonl", "a") as f:
+            f.write(json.dumps(event) + "\n")
+        return event
+
+    # ---- shared directory ----
+    def _checkpoint_path(self, member: int) -> Path:
+        return self.directory / f"member_{member}.pt"
+
+    def _publish(self, runner, iteration: int, score: float) -> None:
+        hyperparams = get_hyperparams(runner.alg, self.hyperparams)
+        checkpoint = self._checkpoint_path(self.member)
+        tmp_path = f"{checkpoint}.tmp"
+        torch.save(
+            {
+                "model_state_dict": runner.alg.policy.state_dict(),
+                "optimizer_state_dict": runner.alg.optimizer.state_dict(),
+                "hyperparams": hyperparams,
+                "iter": iteration,
+            },
+            tmp_path,
+        )
+        os.replace(tmp_path, checkpoint)
+        _write_json(
+            self.directory / f"member_{self.member}.json",
+            {
+                "member": self.member,
+                "iteration": iteration,
+                "score": score,
+                "hyperparams": hyperparams,
+                "exploits": self.exploits,
+                "time": time.time(),
+            },
+        )
+
+
+def read_population(directory: str | Path) -> list[dict]:
+    """Latest published state of every member in ``directory``."""
+    population = []
+    for path in sorted(Path(directory).glob("member_*.json")):
+        try:
+            with open(path) as f:
+                population.append(json.load(f))
+        except (FileNotFoundError, json.JSONDecodeError):
+            continue
+    return population
+
+
+def get_hyperparams(alg, names: tuple[str, ...]) -> dict[str, float]:
+    return {name: float(getattr(alg, name)) for name in names}
+
+
+def set_hyperparams(alg, hyperparams: dict[str, float]) -> None:
+    for name, value in hyperparams.items():
+        setattr(alg, name, value)
+    if "learning_rate" in hyperparams:
+        for param_group in alg.optimizer.param_groups:
+            param_group["lr"] = hyperparams["learning_rate"]
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def initial_hyperparams(
+    base: dict[str, float], population: int, spread: float, seed: int
+) -> list[dict[str, float]]:
+    """Member 0 keeps ``base``; the others scale each value log-uniformly
+    within ``[1 / spread, spread]``."""
+    rng = random.Random(seed)
+    members = [dict(base)]
+    for _ in range(population - 1):
+        members.append(
+            {
+                name: value
+                * math.exp(rng.uniform(-math.log(spread), math.log(spread)))
+                for name, value in base.items()
+            }
+        )
+    return members
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="train.py pbt", description="Population-based training for Booster T1"
+    )
+    parser.add_argument("--task", type=str, default="T1-Getup-v0")
+    parser.add_argument("--population", type=int, default=4)
+    parser.add_argument("--interval", type=int, default=50)
+    parser.add_argument("--quantile", type=float, default=0.25)
+    parser.add_argument("--hyperparams", nargs="+", default=list(DEFAULT_HYPERPARAMS))
+    parser.add_argument("--perturb-factors", nargs="+", type=float, default=[0.8, 1.2])
+    parser.add_argument(
+        "--init-spread",
+        type=float,
+        default=2.0,
+        help="Initial hyperparameters are scaled within [1/spread, spread]",
+    )
+    parser.add_argument("--num-envs", type=int, default=None)
+    parser.add_argument("--max-iterations", type=int, default=None)
+    parser.add_argument("--logger", type=str, default="tensorboard")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--name", type=str, default=None, help="Population name")
+    args = parser.parse_args(argv)
+
+    import mjlab.tasks  # noqa: F401
+    from mjlab.tasks.registry import load_rl_cfg
+
+    import mjlab_task  # noqa: F401
+    from mjlab_task.sweep import Trial, print_results, run_sweep, write_results
+
+    rl_cfg = load_rl_cfg(args.task)
+    base = {name: getattr(rl_cfg.algorithm, name) for name in args.hyperparams}
+    members = initial_hyperparams(base, args.population, args.init_spread, args.seed)
+
+    name = args.name or f"{args.task}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
+    pbt_dir = Path("logs") / "pbt" / name
+    pbt_dir.mkdir(parents=True, exist_ok=True)
+    overrides: dict[str, Any] = {
+        "agent.logger": args.logger,
+        "agent.pbt_dir": str(pbt_dir.resolve()),
+        "agent.pbt_interval": args.interval,
+        "agent.pbt_quantile": args.quantile,
+        "agent.pbt_hyperparams": tuple(args.hyperparams),
+        "agent.pbt_perturb_factors": tuple(args.perturb_factors),
+    }
+    if args.num_envs is not None:
+        overrides["env.scene.num_envs"] = args.num_envs
+    if args.max_iterations is not None:
+        overrides["agent.max_iterations"] = args.max_iterations
+
+    trials = [
+        Trial(
+            i,
+            f"{name}_m{i}",
+            {
+                "agent.pbt_member": i,
+                "agent.seed": rl_cfg.seed + i,
+                **{f"agent.algorithm.{k}": v for k, v in hyperparams.items()},
+            },
+            pbt_dir / f"m{i}",
+        )
+        for i, hyperparams in enumerate(members)
+    ]
+    print(f"[INFO] PBT {name}: {args.population} members ({pbt_dir})")
+    run_sweep(args.task, trials, overrides, args.population, stopping=None)
+
+    # Report each member's final (exploited and perturbed) hyperparameters.
+    final = {p["member"]: p for p in read_population(pbt_dir)}
+    for trial in trials:
+        published = final.get(trial.index, {})
+        trial.params = {
+            "member": trial.index,
+            "exploits": published.get("exploits", 0),
+            **published.get("hyperparams", {}),
+        }
+    rows = write_results(pbt_dir, trials)
+    print_results(rows, ["member", "exploits", *args.hyperparams])
+    print(f"Wrote {pbt_dir / 'results.csv'}")
+
+
+if __name__ == "__main__":
+    main()
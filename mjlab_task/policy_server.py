@@ -0,0 +1,344 @@
+"""Local batched inference server for exported T1 policies.
+
+``BatchedPolicyServer`` owns one inference thread. Callers (threads in the same
+process, or TCP clients via ``serve_tcp``) submit observations; the thread
+takes the first queued request, keeps collecting until ``max_batch`` rows are
+queued or ``max_wait_ms`` has passed since that request arrived, runs the
+policy once on the stacked batch and hands every caller its rows.
+
+The default ``max_wait_ms=0`` batches greedily: a lone request runs at once,
+and requests that arrive while a batch is running form the next batch, so the
+batch size follows the load without delaying light traffic. A positive wait
+buys larger batches for bursty clients at up to that much extra latency.
+
+Per-request latency (submit to result) is kept for the last ``window``
+requests; ``stats`` reports p50 / p99 / mean latency, throughput and mean batch
+size since the previous call.
+
+Backends: ``policy.pt`` (TorchScript) or ``policy.onnx`` (needs
+``onnxruntime``) from ``train.py export``. Serve on TCP with:
+
+    python train.py serve logs/rsl_rl/T1-Stand-PPO/<run>/exported/policy.pt
+
+Wire format (little endian): on connect the server sends ``num_obs`` and
+``num_actions`` as two uint32; each request is a uint32 row count followed by
+``rows * num_obs`` float32, answered with ``rows * num_actions`` float32.
+"""
+
+import argparse
+import collections
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import numpy as np
+
+_HEADER = struct.Struct("<I")
+_DIMS = struct.Struct("<II")
+
+
+class _TorchScriptBackend:
+    def __init__(self, path: str | Path):
+        import torch
+
+        self._torch = torch
+        self._module = torch.jit.load(str(path), map_location="cpu").eval()
+        self.num_obs = int(self._module.obs_mean.shape[1])
+        self.num_actions = self(np.zeros((1, self.num_obs), np.float32)).shape[1]
+
+    def __call__(self, obs: np.ndarray) -> np.ndarray:
+        with self._torch.inference_mode():
+            return self._module(self._torch.from_numpy(obs)).numpy()
+
+
+class _OnnxBackend:
+    def __init__(self, path: str | Path):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError(
+                "Serving ONNX policies needs onnxruntime: pip install onnxruntime"
+            ) from e
+
+        self._session = onnxruntime.InferenceSession(
+            str(path), providers=["CPUExecutionProvider"]
+        )
+        self.num_obs = self._session.get_inputs()[0].shape[1]
+        self.num_actions = self._session.get_outputs()[0].shape[1]
+
+    def __call__(self, obs: np.ndarray) -> np.ndarray:
+        return self._session.run(["actions"], {"obs": obs})[0]
+
+
+def load_backend(path: str | Path):
+    """TorchScript or ONNX runtime callable ``actions = backend(obs)``."""
+    if Path(path).suffix == ".onnx":
+        return _OnnxBackend(path)
+    return _TorchScriptBackend(path)
+
+
+class _Request:
+    __slots__ = ("obs", "future", "submitted")
+
+    def __init__(self, obs: np.ndarray):
+        self.obs = obs
+        self.future: Future = Future()
+        self.submitted = time.perf_counter()
+
+
+class BatchedPolicyServer:
+    """Coalesces concurrent observation requests into batched forward passes."""
+
+    def __init__(
+        self,
+        policy,
+        max_batch: int = 64,
+        max_wait_ms: float = 0.0,
+        window: int = 100_000,
+    ):
+        """``policy`` is an exported policy file or a backend callable."""
+        self._backend = (
+            load_backend(policy) if isinstance(policy, (str, Path)) else policy
+        )
+        self.num_obs = self._backend.num_obs
+        self.num_actions = self._backend.num_actions
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1e3
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._latencies: collections.deque = collections.deque(maxlen=window)
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._batch_rows = 0
+        self._window_start = time.perf_counter()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "BatchedPolicyServer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._serve, name="policy-server", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "BatchedPolicyServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- requests ----
+    def submit(self, obs: np.ndarray) -> Future:
+        """Queue ``(num_obs,)`` or ``(rows, num_obs)`` observations; the future
+        resolves to the matching ``(num_actions,)`` / ``(rows, num_actions)``."""
+        obs = np.asarray(obs, dtype=np.float32)
+        if obs.shape[-1] != self.num_obs or obs.ndim > 2:
+            raise ValueError(f"Expected (rows, {self.num_obs}) observations")
+        request = _Request(obs)
+        self._queue.put(request)
+        return request.future
+
+    def infer(self, obs: np.ndarray) -> np.ndarray:
+        return self.submit(obs).result()
+
+    # ---- inference thread ----
+    def _serve(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            rows = _rows(first.obs)
+            deadline = first.submitted + self.max_wait_s
+            closing = False
+            while rows < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                try:
+                    request = (
+                        self._queue.get(timeout=timeout)
+                        if timeout > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if request is None:
+                    closing = True
+                    break
+                batch.append(request)
+                rows += _rows(request.obs)
+            self._run(batch, rows)
+            if closing:
+                return
+
+    def _run(self, batch: list[_Request], rows: int) -> None:
+        obs = np.concatenate(
+            [request.obs.reshape(-1, self.num_obs) for request in batch]
+        )
+        try:
+            actions = self._backend(obs)
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        done = time.perf_counter()
+        start = 0
+        for request in batch:
+            count = _rows(request.obs)
+            result = actions[start : start + count]
+            request.future.set_result(result[0] if request.obs.ndim == 1 else result)
+            start += count
+        with self._stats_lock:
+            self._latencies.extend(done - request.submitted for request in batch)
+            self._batches += 1
+            self._batch_rows += rows
+
+    # ---- statistics ----
+    def stats(self) -> dict[str, float]:
+        """Latency (ms) and throughput since the previous call."""
+        now = time.perf_counter()
+        with self._stats_lock:
+            latencies = np.array(self._latencies) * 1e3
+            batches, batch_rows = self._batches, self._batch_rows
+            self._latencies.clear()
+            self._batches = self._batch_rows = 0
+            elapsed, self._window_start = now - self._window_start, now
+        if not len(latencies):
+            return {"requests": 0.0}
+        return {
+            "requests": float(len(latencies)),
+            "requests_per_s": len(latencies) / elapsed,
+            "rows_per_s": batch_rows / elapsed,
+            "mean_batch": batch_rows / batches,
+            "mean_ms": float(latencies.mean()),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+        }
+
+
+def _rows(obs: np.ndarray) -> int:
+    return 1 if obs.ndim == 1 else obs.shape[0]
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes | None:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data.extend(chunk)
+    return bytes(data)
+
+
+def serve_tcp(
+    server: BatchedPolicyServer, host: str = "127.0.0.1", port: int = 8765
+) -> socketserver.ThreadingTCPServer:
+    """TCP front-end; one handler thread per connection feeds ``server``."""
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            sock = self.request
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.sendall(_DIMS.pack(server.num_obs, server.num_actions))
+            while True:
+                header = _recv_exact(sock, _HEADER.size)
+                if header is None:
+                    return
+                (rows,) = _HEADER.unpack(header)
+                payload = _recv_exact(sock, rows * server.num_obs * 4)
+                if payload is None:
+                    return
+                obs = np.frombuffer(payload, dtype="<f4").reshape(rows, server.num_obs)
+                sock.sendall(server.infer(obs).astype("<f4").tobytes())
+
+    return _TCPServer((host, port), Handler)
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+    # Many controllers may connect at once; the default backlog is 5.
+    request_queue_size = 128
+
+
+class PolicyClient:
+    """Blocking client of ``serve_tcp``."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765):
+        self._sock = socket.create_connection((host, port))
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.num_obs, self.num_actions = _DIMS.unpack(
+            _recv_exact(self._sock, _DIMS.size)
+        )
+
+    def act(self, obs: np.ndarray) -> np.ndarray:
+        obs = np.asarray(obs, dtype="<f4")
+        rows = _rows(obs)
+        self._sock.sendall(_HEADER.pack(rows) + obs.tobytes())
+        reply = _recv_exact(self._sock, rows * self.num_actions * 4)
+        if reply is None:
+            raise ConnectionError("Policy server closed the connection")
+        actions = np.frombuffer(reply, dtype="<f4").reshape(rows, self.num_actions)
+        return actions[0] if obs.ndim == 1 else actions
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="train.py serve", description="Batched inference server for T1 policies"
+    )
+    parser.add_argument("policy", help="Exported policy.pt or policy.onnx")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=0.0)
+    parser.add_argument("--threads", type=int, default=None, help="torch threads")
+    parser.add_argument(
+        "--report-interval", type=float, default=10.0, help="Seconds between stats"
+    )
+    args = parser.parse_args(argv)
+
+    if args.threads is not None:
+        import torch
+
+        torch.set_num_threads(args.threads)
+    server = BatchedPolicyServer(args.policy, args.max_batch, args.max_wait_ms)
+    server.start()
+    tcp = serve_tcp(server, args.host, args.port)
+    threading.Thread(target=tcp.serve_forever, daemon=True).start()
+    print(
+        f"[INFO] Serving {args.policy} on {args.host}:{args.port}"
+        f" (obs {server.num_obs}, actions {server.num_actions},"
+        f" max batch {args.max_batch}, max wait {args.max_wait_ms} ms)"
+    )
+    try:
+        while True:
+            time.sleep(args.report_interval)
+            stats = server.stats()
+            if stats["requests"]:
+                print(
+                    f"[INFO] {stats['requests_per_s']:.0f} req/s,"
+                    f" batch {stats['mean_batch']:.1f},"
+                    f" p50 {stats['p50_ms']:.3f} ms, p99 {stats['p99_ms']:.3f} ms"
+                )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tcp.shutdown()
+        tcp.server_close()
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
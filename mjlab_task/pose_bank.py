@@ -0,0 +1,280 @@
+"""Offline bank of settled fallen robot states.
+
+A fallen reset drops the robot from ``fall_height`` with a random orientation and
+random joints, then spends the first steps of the episode falling and settling.
+``generate`` simulates those drops once and stores the settled state in a
+``.npy`` file (float32, one row per pose):
+
+    root_pose (7, xy relative to the env origin) | root_vel (6)
+    | joint_pos (J) | joint_vel (J)
+
+with the column layout and provenance in a ``.json`` sidecar. Passing the file as
+the ``pose_bank`` param of ``reset_fallen_or_standing`` (stand or getup) makes
+fallen resets sample from it and skip the settle phase. The bank is read into
+memory (on the env device) once per process; at a few hundred bytes per pose
+even large banks are small next to the simulation state.
+
+Usage:
+    python -m mjlab_task.pose_bank generate --task T1-Stand-v0 --num-poses 4096 \\
+        --output pose_banks/t1_fallen.npy
+    python -m mjlab_task.pose_bank info pose_banks/t1_fallen.npy
+    python -m mjlab_task.pose_bank bench --pose-bank pose_banks/t1_fallen.npy
+
+Set ``BOOSTER_T1_POSE_BANK`` to a bank file to enable it in the registered
+T1-Stand-v0 / T1-Getup-v0 configs.
+"""
+
+import argparse
+import functools
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+POSE_BANK_ENV = "BOOSTER_T1_POSE_BANK"
+_FIELDS = ("root_pose", "root_vel", "joint_pos", "joint_vel")
+
+
+def default_pose_bank() -> str | None:
+    """Pose bank selected through ``BOOSTER_T1_POSE_BANK``, if any."""
+    return os.environ.get(POSE_BANK_ENV) or None
+
+
+def _metadata_path(path: str | Path) -> Path:
+    return Path(path).with_suffix(".json")
+
+
+@functools.lru_cache(maxsize=None)
+def load_pose_bank(path: str, device: str) -> dict[str, torch.Tensor]:
+    """Load a bank onto ``device`` as ``{field: (num_poses, dim)}`` tensors.
+
+    Cached per (path, device) so every reset term and env shares one copy.
+    """
+    metadata = json.loads(_metadata_path(path).read_text())
+    rows = torch.from_numpy(np.load(path)).to(device)
+    bank = {}
+    start = 0
+    for field in _FIELDS:
+        width = metadata["columns"][field]
+        bank[field] = rows[:, start : start + width]
+        start += width
+    return bank
+
+
+def sample_pose_bank(
+    bank: dict[str, torch.Tensor], n: int, num_joints: int
+) -> dict[str, torch.Tensor]:
+    """Draw ``n`` poses uniformly (with replacement) from ``bank``."""
+    if bank["joint_pos"].shape[1] != num_joints:
+        raise ValueError(
+            f"Pose bank has {bank['joint_pos'].shape[1]} joints, robot has {num_joints}"
+        )
+    device = bank["joint_pos"].device
+    idx = torch.randint(0, bank["joint_pos"].shape[0], (n,), device=device)
+    return {field: values[idx] for field, values in bank.items()}
+
+
+def generate(
+    task: str,
+    output: str,
+    num_poses: int = 4096,
+    num_envs: int = 512,
+    settle_s: float = 1.0,
+    device: str = "cpu",
+) -> Path:
+    """Drop robots with fallen resets, hold the reset action and store the states
+    reached after ``settle_s`` seconds. Envs terminated in between are discarded."""
+    import mjlab_task  # noqa: F401  (registers the tasks)
+    from mjlab.envs import ManagerBasedRlEnv
+    from mjlab.tasks.registry import load_env_cfg
+
+    env_cfg = load_env_cfg(task)
+    env_cfg.scene.num_envs = num_envs
+    reset_params = env_cfg.events["reset_fallen_or_standing"].params
+    reset_params["fall_probability"] = 1.0
+    reset_params["pose_bank"] = None
+    env = ManagerBasedRlEnv(cfg=env_cfg, device=device)
+    asset = env.scene["robot"]
+    num_joints = asset.num_joints
+    columns = {
+        "root_pose": 7,
+        "root_vel": 6,
+        "joint_pos": num_joints,
+        "joint_vel": num_joints,
+    }
+
+    output_path = Path(output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    bank = np.lib.format.open_memmap(
+        output_path,
+        mode="w+",
+        dtype=np.float32,
+        shape=(num_poses, sum(columns.values())),
+    )
+    actions = torch.zeros(
+        num_envs, env.action_manager.total_action_dim, device=env.device
+    )
+    num_steps = max(1, round(settle_s / env.step_dt))
+
+    start = time.perf_counter()
+    filled = 0
+    while filled < num_poses:
+        env.reset()
+        alive = torch.ones(num_envs, dtype=torch.bool, device=env.device)
+        for _ in range(num_steps):
+            env.step(actions)
+            alive &= ~env.reset_buf
+        root_pose = asset.data.root_link_pose_w.clone()
+        root_pose[:, 0:2] -= env.scene.env_origins[:, 0:2]
+        state = (
+            root_pose,
+            asset.data.root_link_vel_w,
+            asset.data.joint_pos,
+            asset.data.joint_vel,
+        )
+        rows = torch.cat(state, dim=-1)[alive]
+        take = min(len(rows), num_poses - filled)
+        bank[filled : filled + take] = rows[:take].cpu().numpy()
+        filled += take
+        print(f"[pose_bank] {filled}/{num_poses} poses")
+    bank.flush()
+    env.close()
+
+    metadata = {
+        "task": task,
+        "num_poses": num_poses,
+        "settle_s": num_steps * env.step_dt,
+        "columns": columns,
+        "joint_names": list(asset.joint_names),
+        "generation_s": time.perf_counter() - start,
+    }
+    _metadata_path(output_path).write_text(json.dumps(metadata, indent=2))
+    return output_path
+
+
+def bench(
+    task: str,
+    pose_bank: str | None,
+    num_envs: int = 256,
+    num_steps: int = 200,
+    episode_length_s: float = 2.0,
+    device: str = "cpu",
+) -> dict[str, float]:
+    """Effective policy steps/s: env steps whose actions reach the actuators.
+
+    Substeps in which the settle logic overrides the policy are not counted.
+    Short episodes make resets (and hence settling) frequent, as early
+    terminations do during training.
+    """
+    import mjlab_task  # noqa: F401
+    from mjlab.envs import ManagerBasedRlEnv
+    from mjlab.tasks.registry import load_env_cfg
+
+    env_cfg = load_env_cfg(task)
+    env_cfg.scene.num_envs = num_envs
+    env_cfg.episode_length_s = episode_length_s
+    env_cfg.events["reset_fallen_or_standing"].params["pose_bank"] = pose_bank
+    env = ManagerBasedRlEnv(cfg=env_cfg, device=device)
+    env.reset()
+    action_term = env.action_manager.get_term("joint_pos")
+    decimation = env.cfg.decimation
+
+    def settling() -> torch.Tensor:
+        if hasattr(action_term, "_settle_counter"):  # stand: per-substep counter
+            return action_term._settle_counter.clamp(max=decimation) / decimation
+        settle_mask = env.extras.get("settle_mask")  # getup: first settle_steps steps
+        if settle_mask is None:
+            return torch.zeros(num_envs, device=env.device)
+        in_window = env.episode_length_buf < action_term._settle_steps
+        return (settle_mask & in_window).float()
+
+    actions = torch.zeros(
+        num_envs, env.action_manager.total_action_dim, device=env.device
+    )
+    suppressed = torch.zeros((), device=env.device)
+    start = time.perf_counter()
+    for _ in range(num_steps):
+        suppressed += settling().sum()
+        env.step(actions + 0.1 * torch.randn_like(actions))
+    elapsed = time.perf_counter() - start
+    env.close()
+
+    total = num_steps * num_envs
+    policy_steps = total - suppressed.item()
+    return {
+        "env_steps_per_s": total / elapsed,
+        "policy_steps_per_s": policy_steps / elapsed,
+        "suppressed_fraction": 1.0 - policy_steps / total,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fallen pose bank for Booster T1")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Simulate drops and store settled states")
+    gen.add_argument("--task", default="T1-Stand-v0")
+    gen.add_argument("--output", required=True)
+    gen.add_argument("--num-poses", type=int, default=4096)
+    gen.add_argument("--num-envs", type=int, default=512)
+    gen.add_argument("--settle-s", type=float, default=1.0)
+    gen.add_argument("--device", default="cpu")
+
+    info = sub.add_parser("info", help="Print bank metadata")
+    info.add_argument("path")
+
+    bench_cmd = sub.add_parser("bench", help="Policy steps/s with and without a bank")
+    bench_cmd.add_argument("--task", default="T1-Stand-v0")
+    bench_cmd.add_argument("--pose-bank", required=True)
+    bench_cmd.add_argument("--num-envs", type=int, default=256)
+    bench_cmd.add_argument("--num-steps", type=int, default=200)
+    bench_cmd.add_argument("--episode-length-s", type=float, default=2.0)
+    bench_cmd.add_argument("--device", default="cpu")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        path = generate(
+            args.task,
+            args.output,
+            num_poses=args.num_poses,
+            num_envs=args.num_envs,
+            settle_s=args.settle_s,
+            device=args.device,
+        )
+        print(f"Wrote {path} and {_metadata_path(path)}")
+    elif args.command == "info":
+        metadata = json.loads(_metadata_path(args.path).read_text())
+        metadata.pop("joint_names")
+        print(json.dumps(metadata, indent=2))
+    elif args.command == "bench":
+        print(
+            f"{args.task}, {args.num_envs} envs, {args.num_steps} steps"
+            f" on {args.device}"
+        )
+        header = (
+            f"{'reset':<8} {'env-steps/s':>12} {'policy-steps/s':>15}"
+            f" {'suppressed':>11}"
+        )
+        print(header)
+        print("-" * len(header))
+        for name, bank in (("settle", None), ("bank", args.pose_bank)):
+            row = bench(
+                args.task,
+                bank,
+                num_envs=args.num_envs,
+                num_steps=args.num_steps,
+                episode_length_s=args.episode_length_s,
+                device=args.device,
+            )
+            print(
+                f"{name:<8} {row['env_steps_per_s']:>12.0f}"
+                f" {row['policy_steps_per_s']:>15.0f}"
+                f" {row['suppressed_fraction']:>11.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
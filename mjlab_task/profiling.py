@@ -0,0 +1,242 @@
+"""Opt-in per-term profiling of ManagerBasedRlEnv steps.
+
+``TermProfiler(env).install()`` wraps, on that env instance only:
+
+* every reward, termination, observation, event and curriculum term function
+  (class terms keep their ``reset`` and other attributes);
+* ``process_actions`` / ``apply_actions`` of every action term (e.g.
+  ``SettleJointPositionAction``);
+* ``update`` and the lazy ``_compute_data`` of every scene sensor;
+* the physics step.
+
+On CPU each call is timed with ``perf_counter_ns``. On CUDA the wrapper only
+records a pair of (pooled) CUDA events; nothing synchronizes until ``flush``,
+which resolves all pending events after a single ``synchronize``.
+
+Durations go into per-term log-scale histograms (four buckets per octave), so
+``summary`` reports count / mean / p50 / p90 / p99 / max for the window since
+the previous call, and the most recent ``trace_capacity`` calls are kept for
+``write_chrome_trace`` (open in ``chrome://tracing`` or Perfetto).
+
+``VideoOnPolicyRunner`` installs a profiler when ``T1RunnerCfg.profile_interval``
+is positive, e.g. ``--agent.profile-interval 10``.
+"""
+
+import collections
+import json
+import math
+import time
+from typing import Any, Callable
+
+import torch
+
+_BUCKETS_PER_OCTAVE = 4
+_NUM_BUCKETS = 48 * _BUCKETS_PER_OCTAVE  # up to 2**48 ns
+
+
+class _Histogram:
+    """Log-scale latency histogram over nanoseconds."""
+
+    def __init__(self):
+        self.counts = [0] * _NUM_BUCKETS
+        self.count = 0
+        self.total_ns = 0.0
+        self.max_ns = 0.0
+
+    def add(self, ns: float) -> None:
+        index = int(math.log2(ns + 1.0) * _BUCKETS_PER_OCTAVE)
+        self.counts[min(index, _NUM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total_ns += ns
+        self.max_ns = max(self.max_ns, ns)
+
+    def quantile(self, q: float) -> float:
+        """Geometric centre (ns) of the bucket holding the ``q`` quantile."""
+        target = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return 2.0 ** ((index + 0.5) / _BUCKETS_PER_OCTAVE)
+        return self.max_ns
+
+
+class _TimedTerm:
+    """Callable proxy that times calls and forwards everything else."""
+
+    def __init__(self, func: Callable, timer: Callable):
+        self._func = func
+        self._timer = timer
+
+    def __call__(self, *args, **kwargs):
+        return self._timer(self._func, args, kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._func, name)
+
+
+class TermProfiler:
+    """Times the hot-path callables of one environment."""
+
+    def __init__(self, env, trace_capacity: int = 200_000):
+        self._env = env
+        self._cuda = str(env.device).startswith("cuda")
+        self._histograms: dict[str, _Histogram] = collections.defaultdict(_Histogram)
+        self._trace: collections.deque = collections.deque(maxlen=trace_capacity)
+        self._pending: list[tuple[str, torch.cuda.Event, torch.cuda.Event]] = []
+        self._event_pool: list[torch.cuda.Event] = []
+        self._origin_ns = time.perf_counter_ns()
+        self._origin_event = None
+        self._installed = False
+
+    # ---- instrumentation ----
+    def install(self) -> "TermProfiler":
+        if self._installed:
+            return self
+        env = self._env
+        if self._cuda:
+            self._origin_event = self._new_event()
+            self._origin_event.record()
+
+        for name, cfg in zip(
+            env.reward_manager._term_names, env.reward_manager._term_cfgs
+        ):
+            self._wrap_term(cfg, f"rewards/{name}")
+        for name, cfg in zip(
+            env.termination_manager._term_names, env.termination_manager._term_cfgs
+        ):
+            self._wrap_term(cfg, f"terminations/{name}")
+        obs = env.observation_manager
+        for group, cfgs in obs._group_obs_term_cfgs.items():
+            for name, cfg in zip(obs._group_obs_term_names[group], cfgs):
+                self._wrap_term(cfg, f"observations/{group}.{name}")
+        events = env.event_manager
+        for mode, cfgs in events._mode_term_cfgs.items():
+            for name, cfg in zip(events._mode_term_names[mode], cfgs):
+                self._wrap_term(cfg, f"events/{mode}.{name}")
+        curriculum = env.curriculum_manager
+        for name, cfg in zip(
+            getattr(curriculum, "_term_names", []),
+            getattr(curriculum, "_term_cfgs", []),
+        ):
+            self._wrap_term(cfg, f"curriculum/{name}")
+
+        for name, term in env.action_manager._terms.items():
+            self._wrap_method(term, "process_actions", f"actions/{name}.process")
+            self._wrap_method(term, "apply_actions", f"actions/{name}.apply")
+        for name, sensor in env.scene.sensors.items():
+            self._wrap_method(sensor, "update", f"sensors/{name}.update")
+            self._wrap_method(sensor, "_compute_data", f"sensors/{name}.data")
+        self._wrap_method(env.sim, "step", "physics/step")
+        self._installed = True
+        return self
+
+    def _wrap_term(self, term_cfg, key: str) -> None:
+        term_cfg.func = _TimedTerm(term_cfg.func, self._timer(key))
+
+    def _wrap_method(self, owner, method: str, key: str) -> None:
+        timer = self._timer(key)
+        original = getattr(owner, method)
+
+        def timed(*args, **kwargs):
+            return timer(original, args, kwargs)
+
+        setattr(owner, method, timed)
+
+    def _timer(self, key: str) -> Callable:
+        if self._cuda:
+
+            def timer(func, args, kwargs):
+                start = self._new_event()
+                start.record()
+                result = func(*args, **kwargs)
+                end = self._new_event()
+                end.record()
+                self._pending.append((key, start, end))
+                return result
+
+        else:
+
+            def timer(func, args, kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    end = time.perf_counter_ns()
+                    self._record(key, start - self._origin_ns, end - start)
+
+        return timer
+
+    def _new_event(self) -> torch.cuda.Event:
+        if self._event_pool:
+            return self._event_pool.pop()
+        return torch.cuda.Event(enable_timing=True)
+
+    def _record(self, key: str, start_ns: float, duration_ns: float) -> None:
+        self._histograms[key].add(duration_ns)
+        self._trace.append((key, start_ns, duration_ns))
+
+    # ---- results ----
+    def flush(self) -> None:
+        """Resolve pending CUDA events (one synchronize for the whole batch)."""
+        if not self._pending:
+            return
+        torch.cuda.synchronize()
+        for key, start, end in self._pending:
+            start_ns = self._origin_event.elapsed_time(start) * 1e6
+            self._record(key, start_ns, start.elapsed_time(end) * 1e6)
+            self._event_pool.extend((start, end))
+        self._pending.clear()
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Per-term latency (µs) since the previous call, then start a new window."""
+        self.flush()
+        histograms, self._histograms = (
+            self._histograms,
+            collections.defaultdict(_Histogram),
+        )
+        return {
+            key: {
+                "count": float(h.count),
+                "mean_us": h.total_ns / h.count / 1e3,
+                "p50_us": h.quantile(0.5) / 1e3,
+                "p90_us": h.quantile(0.9) / 1e3,
+                "p99_us": h.quantile(0.99) / 1e3,
+                "max_us": h.max_ns / 1e3,
+                "total_ms": h.total_ns / 1e6,
+            }
+            for key, h in sorted(histograms.items())
+            if h.count
+        }
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Write the retained calls as Chrome trace-event JSON."""
+        self.flush()
+        sections = {}
+        events = []
+        for key, start_ns, duration_ns in self._trace:
+            section, name = key.split("/", 1)
+            tid = sections.setdefault(section, len(sections))
+            events.append(
+                {
+                    "name": name,
+                    "cat": section,
+                    "ph": "X",
+                    "ts": start_ns / 1e3,
+                    "dur": duration_ns / 1e3,
+                    "pid": 0,
+                    "tid": tid,
+                }
+            )
+        events.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 0,
+                "tid": tid,
+                "args": {"name": section},
+            }
+            for section, tid in sections.items()
+        )
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
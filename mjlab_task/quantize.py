@@ -0,0 +1,270 @@
+"""Post-training int8 quantization of T1 actors for onboard CPU control.
+
+``python train.py quantize`` takes the fp32 actor of an rsl_rl checkpoint (the
+``booster_t1_ppo_runner_cfg`` 512-256-128 ELU MLP) and builds:
+
+* ``dynamic`` -- int8 weights, activations quantized per call from their
+  observed range (``torch.ao.quantization.quantize_dynamic``); no data needed;
+* ``static``  -- int8 weights (per channel) and int8 activations with ranges
+  calibrated on observations recorded from fp32 rollouts, so the ELUs run on
+  int8 too. Observation normalization stays in fp32 in front of the graph.
+
+Each variant is validated by replaying it in ``T1-Stand-v0`` play mode (every
+episode starts fallen) against the fp32 policy, from the same reset states:
+
+* stand success -- share of envs that stood up (``stand_mdp.stand_success``:
+  trunk upright and at standing height) before the end of the rollout or an
+  early termination;
+* action error -- |a_int8 - a_fp32| on the observations the quantized policy
+  itself encounters (closed loop), mean and max;
+* batch-1 latency on one thread (the 50 Hz onboard case) and the size of the
+  serialized model.
+
+The quantized actors are written as TorchScript (``policy_int8_<mode>.pt``,
+with the ``train.py export`` metadata) next to the export, together with the
+calibration observations and ``quantize_report.json``:
+
+    python train.py quantize --task T1-Stand-v0 --checkpoint-select best
+    python train.py serve logs/rsl_rl/T1-Stand-PPO/<run>/exported/policy_int8_static.pt
+
+``--engine qnnpack`` targets ARM CPUs (x86 / fbgemm is the default here).
+"""
+
+import argparse
+import copy
+import io
+import json
+import time
+from pathlib import Path
+
+import torch
+from torch import nn
+
+MODES = ("dynamic", "static")
+
+
+class StaticQuantActor(nn.Module):
+    """fp32 normalization, then the int8 actor between quant / dequant stubs."""
+
+    def __init__(self, policy):
+        from torch.ao.quantization import DeQuantStub, QuantStub
+
+        super().__init__()
+        self.register_buffer("obs_mean", policy.obs_mean.clone())
+        self.register_buffer("obs_std", policy.obs_std.clone())
+        self.quant = QuantStub()
+        # rsl_rl's MLP reuses one activation module; convert needs one per layer.
+        self.actor = nn.Sequential(*[copy.deepcopy(layer) for layer in policy.actor])
+        self.dequant = DeQuantStub()
+
+    def forward(self, obs: torch.Tensor) -> torch.Tensor:
+        x = self.quant((obs - self.obs_mean) / self.obs_std)
+        return self.dequant(self.actor(x))
+
+
+def quantize_dynamic_actor(policy) -> nn.Module:
+    from torch.ao.quantization import quantize_dynamic
+
+    return quantize_dynamic(copy.deepcopy(policy), {nn.Linear}, dtype=torch.qint8)
+
+
+def quantize_static_actor(
+    policy, calibration_obs: torch.Tensor, engine: str = "x86"
+) -> nn.Module:
+    from torch.ao.quantization import convert, get_default_qconfig, prepare
+
+    torch.backends.quantized.engine = engine
+    model = StaticQuantActor(policy).eval()
+    model.qconfig = get_default_qconfig(engine)
+    prepared = prepare(model)
+    with torch.inference_mode():
+        for batch in calibration_obs.split(4096):
+            prepared(batch)
+    return convert(prepared)
+
+
+def rollout(env, policy, steps: int, seed: int, reference=None) -> dict:
+    """Run ``policy`` in ``env`` from a seeded reset.
+
+    Returns the stand success rate, the final trunk height, the recorded
+    policy observations and, with ``reference``, its action error on them.
+    """
+    from mjlab.managers.scene_entity_config import SceneEntityCfg
+
+    from mjlab_task.stand_mdp import stand_success
+
+    trunk = SceneEntityCfg("robot", body_names=("Trunk",))
+    trunk.resolve(env.scene)
+    success = stand_success(None, env)
+    obs, _ = env.reset(seed=seed)
+    failed = torch.zeros(env.num_envs, dtype=torch.bool, device=env.device)
+    stood_up = torch.zeros(env.num_envs, device=env.device)
+    recorded = []
+    error_sum = 0.0
+    error_max = 0.0
+    # no_grad, not inference_mode: the env's buffers are updated in place later.
+    with torch.no_grad():
+        for _ in range(steps):
+            policy_obs = obs["policy"].cpu()
+            recorded.append(policy_obs)
+            actions = policy(policy_obs)
+            if reference is not None:
+                error = (actions - reference(policy_obs)).abs()
+                error_sum += error.mean().item()
+                error_max = max(error_max, error.max().item())
+            obs, _, terminated, _, _ = env.step(actions.to(env.device))
+            # Latches per env; an early termination resets the env, so stop
+            # counting it from then on.
+            standing = success(env, asset_cfg=trunk)
+            failed |= terminated
+            stood_up = torch.where(failed, stood_up, standing)
+        height = env.scene["robot"].data.body_link_pos_w[:, trunk.body_ids, 2]
+    result = {
+        "stand_success": stood_up.mean().item(),
+        "terminated": failed.float().mean().item(),
+        "trunk_height": height.mean().item(),
+        "observations": torch.cat(recorded),
+    }
+    if reference is not None:
+        result["action_error_mean"] = error_sum / steps
+        result["action_error_max"] = error_max
+    return result
+
+
+def measure_latency(module, num_obs: int, iterations: int = 2000) -> dict:
+    """Batch-1 forward latency (µs) on the current torch thread count."""
+    obs = torch.randn(1, num_obs)
+    times = []
+    with torch.inference_mode():
+        for _ in range(100):
+            module(obs)
+        for _ in range(iterations):
+            start = time.perf_counter()
+            module(obs)
+            times.append(time.perf_counter() - start)
+    times.sort()
+    return {
+        "p50_us": times[len(times) // 2] * 1e6,
+        "p99_us": times[int(len(times) * 0.99)] * 1e6,
+    }
+
+
+def serialized_size(module) -> int:
+    buffer = io.BytesIO()
+    torch.jit.save(module, buffer)
+    return buffer.getbuffer().nbytes
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="train.py quantize", description="int8 quantization of a T1 actor"
+    )
+    parser.add_argument("--task", type=str, default="T1-Stand-v0")
+    parser.add_argument("--checkpoint", type=str, default=None)
+    parser.add_argument(
+        "--checkpoint-select", choices=["latest", "best"], default="best"
+    )
+    parser.add_argument("--checkpoint-iteration", type=int, default=None)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--engine", type=str, default="x86", help="x86 or qnnpack")
+    parser.add_argument("--num-envs", type=int, default=32)
+    parser.add_argument("--steps", type=int, default=500, help="Steps per rollout")
+    parser.add_argument(
+        "--calibration-steps", type=int, default=200, help="fp32 rollout steps"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", type=str, default=None, help="Default: <run>/exported"
+    )
+    args = parser.parse_args(argv)
+
+    from mjlab.envs import ManagerBasedRlEnv
+    from mjlab.tasks.registry import load_env_cfg
+
+    import mjlab_task  # noqa: F401
+    from mjlab_task.export import (
+        METADATA_FILE,
+        env_metadata,
+        load_actor,
+        resolve_checkpoint,
+    )
+
+    checkpoint = resolve_checkpoint(
+        args.task, args.checkpoint, args.checkpoint_select, args.checkpoint_iteration
+    )
+    output_dir = Path(args.output or Path(checkpoint).parent / "exported")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # Onboard control runs one policy evaluation at a time on one core.
+    torch.set_num_threads(1)
+
+    env_cfg = load_env_cfg(args.task, play=True)
+    env_cfg.scene.num_envs = args.num_envs
+    env = ManagerBasedRlEnv(cfg=env_cfg, device="cpu")
+    metadata = env_metadata(env, args.task, checkpoint)
+    policy = load_actor(checkpoint, args.task)
+    fp32 = torch.jit.script(policy)
+
+    # Calibrate on rollouts from other reset states than the evaluation.
+    print(f"[INFO] Recording {args.calibration_steps} calibration steps")
+    calibration = rollout(env, fp32, args.calibration_steps, args.seed + 1)
+    calibration_obs = calibration["observations"]
+    torch.save(calibration_obs, output_dir / "calibration_obs.pt")
+
+    variants = {"fp32": fp32}
+    for mode in args.modes:
+        if mode == "dynamic":
+            quantized = quantize_dynamic_actor(policy)
+        else:
+            quantized = quantize_static_actor(policy, calibration_obs, args.engine)
+        variants[f"int8_{mode}"] = torch.jit.script(quantized)
+
+    report = {
+        "checkpoint": str(checkpoint),
+        "task": args.task,
+        "engine": args.engine,
+        "num_envs": args.num_envs,
+        "steps": args.steps,
+        "calibration_samples": len(calibration_obs),
+        "variants": {},
+    }
+    for name, module in variants.items():
+        print(f"[INFO] Replaying {name} in {args.task} play mode")
+        reference = None if name == "fp32" else fp32
+        result = rollout(env, module, args.steps, args.seed, reference)
+        del result["observations"]
+        result.update(measure_latency(module, policy.num_obs))
+        result["size_bytes"] = serialized_size(module)
+        report["variants"][name] = result
+        if name != "fp32":
+            path = output_dir / f"policy_{name}.pt"
+            module.save(str(path), _extra_files={METADATA_FILE: json.dumps(metadata)})
+    env.close()
+
+    with open(output_dir / "quantize_report.json", "w") as f:
+        json.dump(report, f, indent=2)
+
+    base = report["variants"]["fp32"]
+    header = (
+        f"{'variant':<12} {'success':>8} {'height':>7} {'act err':>8} {'max err':>8}"
+        f" {'p50 us':>8} {'p99 us':>8} {'speedup':>8} {'KiB':>7} {'size':>6}"
+    )
+    print(f"\n{checkpoint} ({args.num_envs} envs x {args.steps} steps)")
+    print(header)
+    print("-" * len(header))
+    for name, row in report["variants"].items():
+        error = row.get("action_error_mean")
+        error_max = row.get("action_error_max")
+        print(
+            f"{name:<12} {row['stand_success']:>8.1%} {row['trunk_height']:>7.3f}"
+            f" {'-' if error is None else f'{error:.4f}':>8}"
+            f" {'-' if error_max is None else f'{error_max:.4f}':>8}"
+            f" {row['p50_us']:>8.1f} {row['p99_us']:>8.1f}"
+            f" {base['p50_us'] / row['p50_us']:>7.2f}x"
+            f" {row['size_bytes'] / 1024:>7.0f}"
+            f" {row['size_bytes'] / base['size_bytes']:>6.2f}"
+        )
+    print(f"Wrote {output_dir / 'quantize_report.json'}")
+
+
+if __name__ == "__main__":
+    main()
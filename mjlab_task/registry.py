@@ -0,0 +1,80 @@
+"""Lazy task registration on top of mjlab's task registry.
+
+mjlab's ``register_mjlab_task`` takes fully built configs, so every task in the
+package is generated as soon as the ``mjlab.tasks`` entry point is imported.
+``register_lazy_task`` registers factories instead; a task's configs are only
+built the first time mjlab asks for them (``load_env_cfg`` / ``load_rl_cfg`` /
+``load_runner_cls``). Set ``BOOSTER_T1_EAGER_REGISTRATION=1`` to fall back to
+eager registration.
+"""
+
+import os
+from collections.abc import Callable
+from functools import cached_property
+
+from mjlab.envs import ManagerBasedRlEnvCfg
+from mjlab.rl import RslRlOnPolicyRunnerCfg
+from mjlab.tasks import registry as mjlab_registry
+
+EAGER_REGISTRATION_ENV = "BOOSTER_T1_EAGER_REGISTRATION"
+
+
+def eager_registration() -> bool:
+    """Return True if tasks should be built at import time."""
+    value = os.environ.get(EAGER_REGISTRATION_ENV, "0").lower()
+    return value in ("1", "true", "yes")
+
+
+class _LazyTaskCfg:
+    """Drop-in for mjlab's ``_TaskCfg`` that builds each field on first access."""
+
+    def __init__(
+        self,
+        env_cfg_fn: Callable[..., ManagerBasedRlEnvCfg],
+        rl_cfg_fn: Callable[[], RslRlOnPolicyRunnerCfg],
+        runner_cls: type | None,
+    ):
+        self._env_cfg_fn = env_cfg_fn
+        self._rl_cfg_fn = rl_cfg_fn
+        self.runner_cls = runner_cls
+
+    @cached_property
+    def env_cfg(self) -> ManagerBasedRlEnvCfg:
+        return self._env_cfg_fn(play=False)
+
+    @cached_property
+    def play_env_cfg(self) -> ManagerBasedRlEnvCfg:
+        return self._env_cfg_fn(play=True)
+
+    @cached_property
+    def rl_cfg(self) -> RslRlOnPolicyRunnerCfg:
+        return self._rl_cfg_fn()
+
+
+def register_lazy_task(
+    task_id: str,
+    env_cfg_fn: Callable[..., ManagerBasedRlEnvCfg],
+    rl_cfg_fn: Callable[[], RslRlOnPolicyRunnerCfg],
+    runner_cls: type | None = None,
+) -> None:
+    """Register a task whose configs are generated on demand.
+
+    Args:
+      task_id: Unique task identifier (e.g., "T1-Stand-v0").
+      env_cfg_fn: Factory accepting ``play: bool`` and returning the env config.
+      rl_cfg_fn: Factory returning the RL runner config.
+      runner_cls: Optional custom runner class.
+    """
+    if eager_registration():
+        mjlab_registry.register_mjlab_task(
+            task_id=task_id,
+            env_cfg=env_cfg_fn(play=False),
+            play_env_cfg=env_cfg_fn(play=True),
+            rl_cfg=rl_cfg_fn(),
+            runner_cls=runner_cls,
+        )
+        return
+
+    if task_id in mjlab_registry._REGISTRY:
+        raise ValueError(f"Task '{task_id}' is already registered")
+    mjlab_registry._REGISTRY[task_id] = _LazyTaskCfg(env_cfg_fn, rl_cfg_fn, runner_cls)
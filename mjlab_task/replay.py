@@ -0,0 +1,343 @@
+"""Kinematic replay of recorded T1 trajectories.
+
+Plays back recorded ``qpos`` instead of rebuilding the environment and
+re-running the policy (``train.py --test``): each frame only sets the joint
+positions and runs ``mj_forward``, so looking at a large run costs no physics
+or policy compute. Sources:
+
+* a rollout directory (``train.py record`` / ``RolloutRecorder``), whose
+  metadata names the task; ``--failures`` keeps the envs that terminated;
+* a ``(steps, num_envs, nq)`` ``.npy`` file, e.g. the ``rl-video-step-*.npy``
+  written next to every training video (needs ``--task``; ``--train-cfg``
+  for the training meshes).
+
+In the native viewer the selected envs are tiled on a grid ``--spacing``
+metres apart (each env keeps its motion relative to its first frame) and
+playback is driven by the keyboard:
+
+    space          pause / resume        left / right   seek -/+ 1 s
+    , / .          one frame back / on   up / down      speed x2 / /2
+    home / end     first / last frame    backspace      speed 1x
+
+With ``--output`` the selection is rendered offscreen to an MP4 instead, one
+tracking-camera tile per env (as the training videos):
+
+    python train.py replay logs/rollouts/T1-Stand-v0_<time> --failures
+    python train.py replay <run>/videos/train/rl-video-step-2000.npy \\
+        --task T1-Stand-v0 --train-cfg --output clip.mp4 --speed 0.5
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .rollout_recorder import META_NAME, RolloutReader
+from .video_renderer import TileRenderer, viewer_camera
+
+
+class PlaybackClock:
+    """Playback position (in frames) with pause, seek and speed control."""
+
+    def __init__(self, num_frames: int, step_dt: float, speed: float = 1.0):
+        self.num_frames = num_frames
+        self.step_dt = step_dt
+        self.speed = speed
+        self.position = 0.0
+        self.paused = False
+        self.loop = True
+
+    @property
+    def frame(self) -> int:
+        return int(self.position)
+
+    def advance(self, seconds: float) -> None:
+        """Move on by ``seconds`` of wall time (at ``speed``) unless paused."""
+        if self.paused:
+            return
+        position = self.position + seconds * self.speed / self.step_dt
+        if position >= self.num_frames:
+            position = position % self.num_frames if self.loop else self.num_frames - 1
+        self.position = position
+
+    def seek(self, frame: float) -> None:
+        self.position = float(min(max(frame, 0), self.num_frames - 1))
+
+    def seek_seconds(self, seconds: float) -> None:
+        self.seek(self.position + seconds / self.step_dt)
+
+    def step(self, frames: int) -> None:
+        self.paused = True
+        self.seek(self.frame + frames)
+
+    def toggle_pause(self) -> None:
+        self.paused = not self.paused
+
+    def scale_speed(self, factor: float) -> None:
+        self.speed = min(max(self.speed * factor, 1 / 64), 64.0)
+
+    def status(self) -> str:
+        state = "paused" if self.paused else f"{self.speed:g}x"
+        return (
+            f"frame {self.frame + 1}/{self.num_frames}"
+            f"  t={self.frame * self.step_dt:.2f}s  {state}"
+        )
+
+
+def load_qpos(
+    source: str | Path,
+    envs: list[int] | None = None,
+    failures: bool = False,
+    max_envs: int = 16,
+) -> tuple[np.ndarray, list[int], dict]:
+    """``(steps, envs, nq)`` qpos of the selected envs, their recorded env
+    ids and the rollout metadata (empty for ``.npy`` files).
+
+    ``envs`` are positions among the recorded envs; without them the first
+    ``max_envs`` (of the failed ones with ``failures``) are kept. Rollouts are
+    read chunk by chunk, so only the selection is held in memory.
+    """
+    source = Path(source)
+    if source.suffix == ".npy":
+        qpos = np.load(source, mmap_mode="r")
+        columns = envs if envs is not None else list(range(qpos.shape[1]))
+        columns = columns[:max_envs]
+        return np.ascontiguousarray(qpos[:, columns]), columns, {}
+
+    if not (source / META_NAME).exists():
+        raise FileNotFoundError(f"{source} is neither a .npy file nor a rollout")
+    reader = RolloutReader(source)
+    if "qpos" not in reader.fields:
+        raise ValueError(f"{source} has no qpos field")
+    if envs is not None:
+        columns = list(envs)
+    elif failures:
+        failed = np.zeros(reader.meta["num_envs"], dtype=bool)
+        for chunk in reader.iter_chunks(["terminated"]):
+            failed |= chunk["terminated"].any(axis=0)
+        columns = np.flatnonzero(failed).tolist()
+        if not columns:
+            raise ValueError(f"No env terminated in {source}")
+    else:
+        columns = list(range(reader.meta["num_envs"]))
+    columns = columns[:max_envs]
+    qpos = np.concatenate(
+        [chunk["qpos"][:, columns] for chunk in reader.iter_chunks(["qpos"])]
+    )
+    env_ids = reader.meta.get("env_ids", list(range(reader.meta["num_envs"])))
+    return qpos, [env_ids[column] for column in columns], reader.meta
+
+
+def tile_offsets(model, first: np.ndarray, spacing: float) -> np.ndarray:
+    """Per-env ``(x, y)`` shift that puts each env's free root on a grid cell
+    (zeros if the model's first joint is not free)."""
+    import mujoco
+
+    offsets = np.zeros((len(first), 2))
+    if model.njnt == 0 or model.jnt_type[0] != mujoco.mjtJoint.mjJNT_FREE:
+        return offsets
+    columns = int(np.ceil(np.sqrt(len(first))))
+    for index, qpos in enumerate(first):
+        row, column = divmod(index, columns)
+        offsets[index] = np.array([column, -row]) * spacing - qpos[:2]
+    return offsets
+
+
+def play_native(
+    model, qpos: np.ndarray, clock: PlaybackClock, camera: dict, spacing: float
+) -> None:
+    """Interactive playback in MuJoCo's native viewer (until it is closed)."""
+    import mujoco
+    import mujoco.viewer
+    from mjlab.viewer.native import keys
+
+    offsets = tile_offsets(model, qpos[0], spacing)
+    data = mujoco.MjData(model)
+    other = mujoco.MjData(model)
+    option, perturb = mujoco.MjvOption(), mujoco.MjvPerturb()
+    catmask = mujoco.mjtCatBit.mjCAT_DYNAMIC.value
+    actions = {
+        keys.KEY_SPACE: clock.toggle_pause,
+        keys.KEY_RIGHT: lambda: clock.seek_seconds(1.0),
+        keys.KEY_LEFT: lambda: clock.seek_seconds(-1.0),
+        keys.KEY_PERIOD: lambda: clock.step(1),
+        keys.KEY_COMMA: lambda: clock.step(-1),
+        keys.KEY_UP: lambda: clock.scale_speed(2.0),
+        keys.KEY_DOWN: lambda: clock.scale_speed(0.5),
+        keys.KEY_BACKSPACE: lambda: clock.scale_speed(1.0 / clock.speed),
+        keys.KEY_HOME: lambda: clock.seek(0),
+        keys.KEY_END: lambda: clock.seek(clock.num_frames - 1),
+    }
+
+    def pose(target, env_qpos: np.ndarray, offset: np.ndarray) -> None:
+        target.qpos[:] = env_qpos
+        target.qpos[:2] += offset
+        mujoco.mj_forward(model, target)
+
+    viewer = mujoco.viewer.launch_passive(
+        model,
+        data,
+        key_callback=lambda key: actions.get(key, lambda: None)(),
+        show_left_ui=False,
+        show_right_ui=False,
+    )
+    if not camera["shadows"]:
+        viewer.user_scn.flags[mujoco.mjtRndFlag.mjRND_SHADOW] = 0
+    if not camera["reflections"]:
+        viewer.user_scn.flags[mujoco.mjtRndFlag.mjRND_REFLECTION] = 0
+    with viewer.lock():
+        if len(offsets) == 1:
+            viewer.cam.type = mujoco.mjtCamera.mjCAMERA_TRACKING
+            viewer.cam.trackbodyid = camera["track_body"]
+            viewer.cam.distance = camera["distance"]
+        else:
+            # A fixed view of the whole grid.
+            columns = int(np.ceil(np.sqrt(len(offsets))))
+            extent = (columns - 1) * spacing
+            viewer.cam.type = mujoco.mjtCamera.mjCAMERA_FREE
+            viewer.cam.lookat[:] = (extent / 2, -extent / 2, 0.5)
+            viewer.cam.distance = camera["distance"] + 1.5 * extent
+        viewer.cam.elevation = camera["elevation"]
+        viewer.cam.azimuth = camera["azimuth"]
+    last = time.perf_counter()
+    while viewer.is_running():
+        now = time.perf_counter()
+        clock.advance(now - last)
+        last = now
+        frame = qpos[clock.frame]
+        with viewer.lock():
+            pose(data, frame[0], offsets[0])
+            viewer.user_scn.ngeom = 0
+            for env_qpos, offset in zip(frame[1:], offsets[1:]):
+                pose(other, env_qpos, offset)
+                mujoco.mjv_addGeoms(
+                    model, other, option, perturb, catmask, viewer.user_scn
+                )
+            viewer.set_texts((None, None, clock.status(), None))
+        viewer.sync(state_only=True)
+        time.sleep(max(0.0, 1 / 60 - (time.perf_counter() - now)))
+    viewer.close()
+
+
+def write_video(
+    model,
+    qpos: np.ndarray,
+    clock: PlaybackClock,
+    camera: dict,
+    path: Path,
+    size: tuple[int, int],
+    end: int | None = None,
+) -> int:
+    """Render frames from the clock's position to ``end`` at its speed into
+    ``path`` (at the recording rate); returns the number of frames written."""
+    import imageio.v2 as imageio
+
+    stop = clock.num_frames if end is None else end
+    frames = np.arange(clock.position, stop, clock.speed)
+    tiles = TileRenderer(model, qpos.shape[1], *size, **camera)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    writer = imageio.get_writer(
+        path, format="FFMPEG", fps=1.0 / clock.step_dt, macro_block_size=1
+    )
+    try:
+        for frame in frames.astype(int):
+            writer.append_data(tiles.render(qpos[frame]))
+    finally:
+        writer.close()
+        tiles.close()
+    return len(frames)
+
+
+def load_model(task: str, play: bool):
+    """The task's compiled MuJoCo model, viewer configuration and step dt,
+    without building the environment."""
+    from mjlab.scene import Scene
+    from mjlab.tasks.registry import load_env_cfg
+
+    import mjlab_task  # noqa: F401
+
+    env_cfg = load_env_cfg(task, play=play)
+    model = Scene(env_cfg.scene, device="cpu").compile()
+    return model, env_cfg.viewer, env_cfg.sim.mujoco.timestep * env_cfg.decimation
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="train.py replay",
+        description="Play back recorded qpos kinematically (no physics, no policy)",
+    )
+    parser.add_argument("source", type=str, help="Rollout directory or qpos .npy")
+    parser.add_argument(
+        "--task", type=str, default=None, help="Default: the rollout's task"
+    )
+    parser.add_argument(
+        "--train-cfg",
+        action="store_true",
+        help="Build the training-configuration model (training videos)",
+    )
+    parser.add_argument(
+        "--envs", type=int, nargs="+", default=None, help="Recorded env positions"
+    )
+    parser.add_argument(
+        "--failures", action="store_true", help="Only envs that terminated"
+    )
+    parser.add_argument("--max-envs", type=int, default=16)
+    parser.add_argument("--start", type=float, default=0.0, help="Start time (s)")
+    parser.add_argument("--end", type=float, default=None, help="End time (s)")
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument(
+        "--spacing", type=float, default=2.0, help="Grid spacing of tiled envs (m)"
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="Write an MP4 instead of viewing"
+    )
+    parser.add_argument("--size", type=int, nargs=2, default=[320, 240])
+    parser.add_argument(
+        "--no-shadows",
+        action="store_true",
+        help="Render without shadows and reflections (much faster in software GL)",
+    )
+    args = parser.parse_args(argv)
+    if args.failures and Path(args.source).suffix == ".npy":
+        parser.error("--failures needs a rollout directory (.npy has no terminations)")
+
+    qpos, env_ids, meta = load_qpos(
+        args.source, args.envs, args.failures, args.max_envs
+    )
+    task = args.task or meta.get("task")
+    if task is None:
+        parser.error("--task is required for .npy sources")
+    play = meta.get("play", True) and not args.train_cfg
+    model, viewer_cfg, step_dt = load_model(task, play)
+    if model.nq != qpos.shape[2]:
+        parser.error(f"{task} has nq={model.nq}, the recording {qpos.shape[2]}")
+    camera = viewer_camera(model, viewer_cfg)
+    if args.no_shadows:
+        camera.update(shadows=False, reflections=False)
+    step_dt = meta.get("step_dt", step_dt)
+    clock = PlaybackClock(len(qpos), step_dt, args.speed)
+    clock.seek(args.start / step_dt)
+    end = None if args.end is None else min(int(args.end / step_dt), len(qpos))
+    if end is not None and end <= clock.position:
+        parser.error("--end must be after --start")
+    print(
+        f"[INFO] {task}: {len(qpos)} frames ({len(qpos) * step_dt:.1f} s)"
+        f" of envs {env_ids}"
+    )
+
+    if args.output:
+        count = write_video(
+            model, qpos, clock, camera, Path(args.output), tuple(args.size), end
+        )
+        print(f"[INFO] Rendered {count} frames")
+        print(f"Wrote {args.output}")
+        return
+    if end is not None:
+        qpos = qpos[:end]
+        clock.num_frames = end
+    play_native(model, qpos, clock, camera, args.spacing)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+
 from mjlab.rl import (
     RslRlOnPolicyRunnerCfg,
     RslRlPpoActorCriticCfg,
@@ -5,11 +7,53 @@ from mjlab.rl import (
 )
 
 
-def booster_t1_ppo_runner_cfg(
-    exp_name: str, num_iterations: int
-) -> RslRlOnPolicyRunnerCfg:
+@dataclass
+class T1RunnerCfg(RslRlOnPolicyRunnerCfg):
+    """Runner configuration with the checkpointing, metric-streaming, PBT,
+    profiling and video options of VideoOnPolicyRunner."""
+
+    async_checkpoints: bool = False
+    """Snapshot checkpoints to CPU and write them on a background thread."""
+    keep_last_checkpoints: int = 0
+    """Checkpoints kept on disk besides the best one (0 keeps all), with
+    synchronous and asynchronous saves alike."""
+    keep_best_checkpoint: bool = True
+    """Never delete the checkpoint with the highest mean episode reward."""
+    metrics_file: str | None = None
+    """Append per-iteration reward metrics to this JSON-lines file (sweeps)."""
+    stop_file: str | None = None
+    """Save and stop training as soon as this file exists (early stopping)."""
+    pbt_dir: str | None = None
+    """Shared population directory; enables population-based training."""
+    pbt_member: int = 0
+    """This run's index in the population."""
+    pbt_interval: int = 50
+    """Iterations between publishing to and exploiting from the population."""
+    pbt_quantile: float = 0.25
+    """Fraction of the population that is replaced / copied from."""
+    pbt_hyperparams: tuple[str, ...] = ("learning_rate", "entropy_coef", "desired_kl")
+    """PPO attributes copied from the donor and perturbed on exploit."""
+    pbt_perturb_factors: tuple[float, ...] = (0.8, 1.2)
+    """Factors a perturbed hyperparameter is multiplied by (one at random)."""
+    profile_interval: int = 0
+    """Profile every env term / action / sensor and log latencies under
+    ``Profile/`` every N iterations (0 disables)."""
+    video_envs: int = 0
+    """Render the first N envs to MP4 in an offscreen worker process that
+    training only hands qpos snapshots to (0 disables; ``train.py --video``)."""
+    video_interval: int = 2000
+    """Env steps between the starts of two video clips."""
+    video_length: int = 200
+    """Env steps per video clip."""
+    video_size: tuple[int, int] = (320, 240)
+    """Width and height of each env's tile in the video."""
+    video_backend: str = "egl"
+    """``MUJOCO_GL`` of the render worker: ``egl`` or ``osmesa``."""
+
+
+def booster_t1_ppo_runner_cfg(exp_name: str, num_iterations: int) -> T1RunnerCfg:
     """Create RL runner configuration for Booster T1 task."""
-    return RslRlOnPolicyRunnerCfg(
+    return T1RunnerCfg(
         policy=RslRlPpoActorCriticCfg(
             init_noise_std=1.0,
             noise_std_type="log",
@@ -1,8 +1,8 @@
-import os
 from dataclasses import dataclass, field
 from mjlab.entity.entity import EntityCfg, EntityArticulationInfoCfg
 from mjlab.actuator import BuiltinPositionActuatorCfg
-from mujoco import MjSpec
+
+from mjlab_task.spec_cache import Fidelity, load_robot_spec
 
 
 @dataclass
@@ -23,21 +23,22 @@ class BoosterT1Cfg(EntityCfg):
             soft_joint_pos_limit_factor=0.9,
         )
     )
+    # Visual meshes: "full" STLs, decimated "train" copies or none ("headless").
+    # Collision geoms are primitives in every mode.
+    fidelity: Fidelity = "full"
 
-    def __post_init__(self):
-        # Configure MuJoCo model loading
-        def get_booster_spec():
-            model_path = os.path.join(
-                os.path.dirname(__file__), "../assets/booster_t1/t1.xml"
-            )
-            spec = MjSpec.from_file(model_path)
-            # Clear existing actuators to avoid collisions when mjlab adds its own
-            while len(spec.actuators) > 0:
-                spec.delete(spec.actuators[0])
+    def spec_cache_extra(self) -> str:
+        """Actuator config folded into the robot spec cache key."""
+        return repr(self.articulation)
 
-            return spec
+    def build_spec(self):
+        # Actuator-free spec with meshes served from the on-disk cache
+        # (see mjlab_task/spec_cache.py).
+        return load_robot_spec(self.spec_cache_extra(), self.fidelity)
 
-        self.spec_fn = get_booster_spec
+    def __post_init__(self):
+        # Bound method, so copies of the config keep their own fidelity.
+        self.spec_fn = self.build_spec
 
         # Initial state from keyframe "home"
         self.init_state = EntityCfg.InitialStateCfg(
@@ -0,0 +1,552 @@
+"""Streaming rollout recorder for the Booster T1 tasks.
+
+``RolloutRecorder(env, directory).attach()`` wraps ``env.step`` of any T1 task
+(like ``TermProfiler``, on that instance only) and records, per step and per
+recorded env:
+
+* ``obs/<group>``        -- the observations the action was computed from
+  (``policy`` and ``critic`` by default);
+* ``action``             -- the action passed to ``env.step``;
+* ``reward``             -- the total (dt-scaled) reward;
+* ``reward_terms``       -- each reward term's unscaled rate, in the order of
+  ``meta["reward_terms"]``;
+* ``terminated`` / ``time_out`` and ``termination_terms`` (which terms fired);
+* ``episode_step``, ``qpos`` (the full MuJoCo state, for kinematic replay) and
+  the robot's ``root_pos``, ``root_quat``, ``root_lin_vel``, ``root_ang_vel``,
+  ``joint_pos``, ``joint_vel`` -- all taken before the step, so a row is
+  (state, obs, action) followed by that action's reward and termination.
+
+The step only copies into preallocated per-chunk buffers. Every
+``chunk_steps`` steps the full chunk is handed to a writer thread that
+compresses each field (byte shuffle + zlib, as in blosc: grouping the n-th
+byte of every value puts the slowly varying sign / exponent bytes together),
+appends it to the current shard and hands the buffers back for reuse; a shard
+is finalized (index + footer written, ``.tmp`` renamed) every ``shard_steps``
+steps and listed in ``rollout.json``. At most ``max_pending_chunks + 1``
+buffer sets are ever allocated: a slow disk blocks the step until the writer
+returns one instead of growing memory.
+
+Shard file: ``MAGIC``, the compressed chunks, a JSON index (per field: dtype,
+per-step shape, ``[offset, nbytes, steps]`` of every chunk) and a footer with
+the index offset and size. ``RolloutReader`` memory-maps shards and
+decompresses one chunk at a time, so runs larger than RAM iterate lazily:
+
+    python train.py record --task T1-Stand-v0 --steps 1000 --num-envs 64
+    reader = RolloutReader("logs/rollouts/T1-Stand-v0_<time>")
+    for chunk in reader.iter_chunks(["obs/policy", "action"]): ...
+"""
+
+import argparse
+import json
+import mmap
+import os
+import queue
+import random
+import struct
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+import torch
+
+MAGIC = b"T1ROLL01"
+META_NAME = "rollout.json"
+_FOOTER = struct.Struct("<QQ8s")
+_ROBOT_STATE = (
+    "root_pos",
+    "root_quat",
+    "root_lin_vel",
+    "root_ang_vel",
+    "joint_pos",
+    "joint_vel",
+)
+
+
+class RolloutRecorder:
+    """Records the steps of one environment into compressed shard files."""
+
+    def __init__(
+        self,
+        env,
+        directory: str | Path,
+        groups: tuple[str, ...] = ("policy", "critic"),
+        env_ids: list[int] | None = None,
+        chunk_steps: int = 64,
+        shard_steps: int = 1024,
+        compression_level: int = 1,
+        max_pending_chunks: int = 8,
+        metadata: dict | None = None,
+    ):
+        self._env = env
+        self.directory = Path(directory)
+        self.groups = tuple(groups)
+        self.env_ids = list(range(env.num_envs)) if env_ids is None else list(env_ids)
+        self.chunk_steps = chunk_steps
+        self.shard_steps = max(shard_steps, chunk_steps)
+        self.compression_level = compression_level
+        self._index = torch.as_tensor(self.env_ids, device=env.device)
+        self._robot = env.scene["robot"]
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending_chunks)
+        # Buffer sets the writer has compressed, ready to be refilled.
+        self._free: queue.Queue = queue.Queue()
+        self._pool_size = max_pending_chunks + 1
+        self._allocated = 0
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+        self._buffers: dict[str, np.ndarray] | None = None
+        self._chunk_fill = 0
+        self.steps = 0
+        self._original_step = None
+        self.meta = {
+            "version": 1,
+            "num_envs": len(self.env_ids),
+            "env_ids": self.env_ids,
+            "step_dt": env.step_dt,
+            "groups": {
+                group: env.observation_manager.active_terms[group]
+                for group in self.groups
+            },
+            "reward_terms": list(env.reward_manager._term_names),
+            "termination_terms": list(env.termination_manager._term_names),
+            "joint_names": list(self._robot.joint_names),
+            "fields": {},
+            "shards": [],
+            "steps": 0,
+            **(metadata or {}),
+        }
+
+    # ---- attaching ----
+    def attach(self) -> "RolloutRecorder":
+        if self._original_step is not None:
+            return self
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._write_loop, name="rollout-writer", daemon=True
+        )
+        self._thread.start()
+        original = self._env.step
+        self._original_step = original
+
+        def step(action: torch.Tensor):
+            before = self._snapshot(action)
+            result = original(action)
+            self._append(before, self._outcome())
+            return result
+
+        self._env.step = step
+        return self
+
+    def close(self) -> None:
+        """Flush the partial chunk, finalize the open shard and detach."""
+        if self._original_step is None:
+            return
+        self._env.step = self._original_step
+        self._original_step = None
+        if self._chunk_fill:
+            self._submit_chunk()
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise RuntimeError("Rollout writer failed") from self._error
+
+    def __enter__(self) -> "RolloutRecorder":
+        return self.attach()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- capture (training / rollout thread) ----
+    def _snapshot(self, action: torch.Tensor) -> dict[str, torch.Tensor]:
+        env, data, ids = self._env, self._robot.data, self._index
+        fields = {}
+        for group in self.groups:
+            obs = env.obs_buf[group]
+            if isinstance(obs, dict):
+                for term, value in obs.items():
+                    fields[f"obs/{group}/{term}"] = value[ids]
+            else:
+                fields[f"obs/{group}"] = obs[ids]
+        fields["action"] = action[ids]
+        fields["episode_step"] = env.episode_length_buf[ids].int()
+        fields["qpos"] = env.sim.data.qpos[ids]
+        state = (
+            data.root_link_pos_w,
+            data.root_link_quat_w,
+            data.root_link_lin_vel_w,
+            data.root_link_ang_vel_w,
+            data.joint_pos,
+            data.joint_vel,
+        )
+        for name, value in zip(_ROBOT_STATE, state):
+            fields[name] = value[ids]
+        return fields
+
+    def _outcome(self) -> dict[str, torch.Tensor]:
+        env, ids = self._env, self._index
+        terminations = env.termination_manager
+        names = terminations.active_terms
+        return {
+            "reward": env.reward_buf[ids],
+            "reward_terms": env.reward_manager._step_reward[ids],
+            "terminated": terminations.terminated[ids],
+            "time_out": terminations.time_outs[ids],
+            "termination_terms": torch.stack(
+                [terminations.get_term(name)[ids] for name in names], dim=-1
+            ),
+        }
+
+    def _append(self, *parts: dict[str, torch.Tensor]) -> None:
+        if self._error is not None:
+            raise RuntimeError("Rollout writer failed") from self._error
+        fields = {name: value for part in parts for name, value in part.items()}
+        if self._buffers is None:
+            self._buffers = self._take_buffers(fields)
+        for name, value in fields.items():
+            self._buffers[name][self._chunk_fill] = value.detach().cpu().numpy()
+        self._chunk_fill += 1
+        self.steps += 1
+        if self._chunk_fill == self.chunk_steps:
+            self._submit_chunk()
+
+    def _take_buffers(self, fields: dict[str, torch.Tensor]) -> dict[str, np.ndarray]:
+        if self._allocated < self._pool_size:
+            self._allocated += 1
+            buffers = {
+                name: np.empty(
+                    (self.chunk_steps, *value.shape),
+                    dtype=torch.empty((), dtype=value.dtype).numpy().dtype,
+                )
+                for name, value in fields.items()
+            }
+            if not self.meta["fields"]:
+                self.meta["fields"] = {
+                    name: {"dtype": buffer.dtype.str, "shape": list(buffer.shape[1:])}
+                    for name, buffer in buffers.items()
+                }
+            return buffers
+        buffers = self._free.get()
+        if buffers is None:  # the writer failed while we waited
+            raise RuntimeError("Rollout writer failed") from self._error
+        return buffers
+
+    def _submit_chunk(self) -> None:
+        # The writer owns the filled buffers until it returns them to the pool.
+        self._queue.put((self._buffers, self._chunk_fill))
+        self._buffers = None
+        self._chunk_fill = 0
+
+    # ---- writer thread ----
+    def _write_loop(self) -> None:
+        shard = None
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                buffers, fill = item
+                if shard is None:
+                    shard = _ShardWriter(self._shard_path(len(self.meta["shards"])))
+                chunk = {name: buffer[:fill] for name, buffer in buffers.items()}
+                shard.add_chunk(chunk, self.compression_level)
+                self._free.put(buffers)
+                if shard.steps >= self.shard_steps:
+                    self._finalize(shard)
+                    shard = None
+            if shard is not None:
+                self._finalize(shard)
+        except BaseException as e:  # surfaced on the next step / close
+            self._error = e
+            # Unblock a producer waiting on a full queue.
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._free.put(None)
+
+    def _shard_path(self, index: int) -> Path:
+        return self.directory / f"shard_{index:05d}.t1r"
+
+    def _finalize(self, shard: "_ShardWriter") -> None:
+        shard.close()
+        self.meta["shards"].append({"file": shard.path.name, "steps": shard.steps})
+        self.meta["steps"] += shard.steps
+        tmp_path = self.directory / f"{META_NAME}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp_path, self.directory / META_NAME)
+
+
+class _ShardWriter:
+    def __init__(self, path: Path):
+        self.path = path
+        self._tmp_path = path.with_name(path.name + ".tmp")
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(MAGIC)
+        self._fields: dict[str, dict] = {}
+        self.steps = 0
+
+    def add_chunk(self, chunk: dict[str, np.ndarray], level: int) -> None:
+        steps = 0
+        for name, array in chunk.items():
+            blob = zlib.compress(_shuffle(array), level)
+            field = self._fields.setdefault(
+                name,
+                {
+                    "dtype": array.dtype.str,
+                    "shape": list(array.shape[1:]),
+                    "chunks": [],
+                },
+            )
+            field["chunks"].append([self._file.tell(), len(blob), len(array)])
+            self._file.write(blob)
+            steps = len(array)
+        self.steps += steps
+
+    def close(self) -> None:
+        index = json.dumps({"steps": self.steps, "fields": self._fields}).encode()
+        offset = self._file.tell()
+        self._file.write(index)
+        self._file.write(_FOOTER.pack(offset, len(index), MAGIC))
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+
+def _shuffle(array: np.ndarray) -> bytes:
+    """Bytes of ``array`` grouped by position within each value."""
+    raw = np.frombuffer(np.ascontiguousarray(array).tobytes(), dtype=np.uint8)
+    return raw.reshape(-1, array.itemsize).T.tobytes()
+
+
+def _unshuffle(raw: bytes, dtype: np.dtype) -> np.ndarray:
+    planes = np.frombuffer(raw, dtype=np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(planes.T).view(dtype).reshape(-1)
+
+
+class RolloutShard:
+    """One memory-mapped shard; chunks are decompressed on access."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        offset, size, magic = _FOOTER.unpack(self._mmap[-_FOOTER.size :])
+        if magic != MAGIC or self._mmap[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path} is not a T1 rollout shard")
+        index = json.loads(self._mmap[offset : offset + size])
+        self.steps: int = index["steps"]
+        self.fields: dict[str, dict] = index["fields"]
+
+    @property
+    def num_chunks(self) -> int:
+        return len(next(iter(self.fields.values()))["chunks"])
+
+    def read(self, field: str, chunk: int) -> np.ndarray:
+        """``(steps, num_envs, ...)`` array of one field of one chunk."""
+        spec = self.fields[field]
+        offset, nbytes, steps = spec["chunks"][chunk]
+        raw = zlib.decompress(self._mmap[offset : offset + nbytes])
+        dtype = np.dtype(spec["dtype"])
+        return _unshuffle(raw, dtype).reshape(steps, *spec["shape"])
+
+    def close(self) -> None:
+        self._mmap.close()
+
+
+class RolloutReader:
+    """Lazy reader of a recorded rollout directory."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        with open(self.directory / META_NAME) as f:
+            self.meta: dict = json.load(f)
+
+    @property
+    def fields(self) -> list[str]:
+        return list(self.meta["fields"])
+
+    @property
+    def steps(self) -> int:
+        return self.meta["steps"]
+
+    def __len__(self) -> int:
+        """Recorded transitions (steps x recorded envs)."""
+        return self.meta["steps"] * self.meta["num_envs"]
+
+    def shards(self) -> Iterator[RolloutShard]:
+        for entry in self.meta["shards"]:
+            shard = RolloutShard(self.directory / entry["file"])
+            try:
+                yield shard
+            finally:
+                shard.close()
+
+    def iter_chunks(
+        self, fields: list[str] | None = None
+    ) -> Iterator[dict[str, np.ndarray]]:
+        """Chunks in recording order, each ``{field: (steps, num_envs, ...)}``."""
+        fields = fields or self.fields
+        for shard in self.shards():
+            for chunk in range(shard.num_chunks):
+                yield {field: shard.read(field, chunk) for field in fields}
+
+    def iter_batches(
+        self,
+        fields: list[str],
+        batch_size: int,
+        shuffle: bool = True,
+        buffer_chunks: int = 16,
+        seed: int = 0,
+    ) -> Iterator[dict[str, np.ndarray]]:
+        """Flattened ``(batch_size, ...)`` transitions.
+
+        With ``shuffle``, chunks are visited in random order and rows are
+        shuffled within a window of ``buffer_chunks`` chunks, so memory stays
+        bounded by that window.
+        """
+        rng = random.Random(seed)
+        locations = [
+            (entry["file"], chunk)
+            for entry, shard in zip(self.meta["shards"], self.shards())
+            for chunk in range(shard.num_chunks)
+        ]
+        if shuffle:
+            rng.shuffle(locations)
+        shards: dict[str, RolloutShard] = {}
+
+        def chunks() -> Iterator[dict[str, np.ndarray]]:
+            for file, chunk in locations:
+                if file not in shards:
+                    shards[file] = RolloutShard(self.directory / file)
+                yield {field: shards[file].read(field, chunk) for field in fields}
+
+        try:
+            yield from shuffle_batches(
+                chunks(), batch_size, shuffle, buffer_chunks, rng.randrange(2**32)
+            )
+        finally:
+            for shard in shards.values():
+                shard.close()
+
+
+def shuffle_batches(
+    chunks: Iterable[dict[str, np.ndarray]],
+    batch_size: int,
+    shuffle: bool = True,
+    buffer_chunks: int = 16,
+    seed: int = 0,
+) -> Iterator[dict[str, np.ndarray]]:
+    """Flatten ``{field: (steps, num_envs, ...)}`` chunks into batches of rows.
+
+    Rows are shuffled within windows of ``buffer_chunks`` chunks; the last
+    batch of a window may be smaller than ``batch_size``.
+    """
+    rng = np.random.default_rng(seed)
+    pending: list[dict[str, np.ndarray]] = []
+
+    def drain() -> Iterator[dict[str, np.ndarray]]:
+        window = {
+            field: np.concatenate(
+                [chunk[field].reshape(-1, *chunk[field].shape[2:]) for chunk in pending]
+            )
+            for field in pending[0]
+        }
+        pending.clear()
+        order = np.arange(len(next(iter(window.values()))))
+        if shuffle:
+            rng.shuffle(order)
+        for start in range(0, len(order), batch_size):
+            rows = order[start : start + batch_size]
+            yield {field: array[rows] for field, array in window.items()}
+
+    for chunk in chunks:
+        pending.append(chunk)
+        if len(pending) == buffer_chunks:
+            yield from drain()
+    if pending:
+        yield from drain()
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="train.py record", description="Record rollouts of a T1 policy"
+    )
+    parser.add_argument("--task", type=str, default="T1-Stand-v0")
+    parser.add_argument(
+        "--policy",
+        type=str,
+        default=None,
+        help="Exported policy.pt; default: the task's checkpoint (see --checkpoint)",
+    )
+    parser.add_argument("--checkpoint", type=str, default=None)
+    parser.add_argument(
+        "--checkpoint-select", choices=["latest", "best"], default="best"
+    )
+    parser.add_argument("--num-envs", type=int, default=64)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--record-envs", type=int, default=None, help="First N envs")
+    parser.add_argument("--groups", nargs="+", default=["policy", "critic"])
+    parser.add_argument("--chunk-steps", type=int, default=64)
+    parser.add_argument("--shard-steps", type=int, default=1024)
+    parser.add_argument(
+        "--train-cfg",
+        action="store_true",
+        help="Use the training configuration instead of play mode",
+    )
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None)
+    args = parser.parse_args(argv)
+
+    from mjlab.envs import ManagerBasedRlEnv
+    from mjlab.tasks.registry import load_env_cfg
+
+    import mjlab_task  # noqa: F401
+    from mjlab_task.export import load_actor, resolve_checkpoint
+
+    if args.policy is not None:
+        policy = torch.jit.load(args.policy, map_location=args.device)
+        source = args.policy
+    else:
+        source = resolve_checkpoint(args.task, args.checkpoint, args.checkpoint_select)
+        policy = load_actor(source, args.task).to(args.device)
+
+    env_cfg = load_env_cfg(args.task, play=not args.train_cfg)
+    env_cfg.scene.num_envs = args.num_envs
+    env = ManagerBasedRlEnv(cfg=env_cfg, device=args.device)
+    name = f"{args.task}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
+    output = Path(args.output or Path("logs") / "rollouts" / name)
+    env_ids = None if args.record_envs is None else list(range(args.record_envs))
+    recorder = RolloutRecorder(
+        env,
+        output,
+        tuple(args.groups),
+        env_ids,
+        args.chunk_steps,
+        args.shard_steps,
+        metadata={"task": args.task, "policy": str(source), "play": not args.train_cfg},
+    )
+
+    obs, _ = env.reset(seed=args.seed)
+    with recorder, torch.no_grad():
+        for _ in range(args.steps):
+            obs, *_ = env.step(policy(obs["policy"]))
+    env.close()
+
+    reader = RolloutReader(output)
+    size = sum(entry.stat().st_size for entry in output.glob("shard_*.t1r"))
+    # Per-step field shapes include the recorded-env axis.
+    raw = sum(
+        reader.steps * int(np.prod(spec["shape"])) * np.dtype(spec["dtype"]).itemsize
+        for spec in reader.meta["fields"].values()
+    )
+    print(
+        f"[INFO] Recorded {reader.steps} steps x {reader.meta['num_envs']} envs"
+        f" in {len(reader.meta['shards'])} shards:"
+        f" {size / 2**20:.1f} MiB ({raw / max(size, 1):.1f}x compression)"
+    )
+    print(f"Wrote {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,241 @@
+import json
 import os
-
-import wandb
+import statistics
+import time
 
 from mjlab.rl import MjlabOnPolicyRunner
 
+from .checkpoint_catalog import CheckpointCatalog
+from .checkpoint_writer import AsyncCheckpointWriter, CheckpointRetention
+from .pbt import PopulationMember
+from .profiling import TermProfiler
+from .video_renderer import VideoRenderer
+from .video_upload import VideoUploader, wandb_upload
+
 
 class VideoOnPolicyRunner(MjlabOnPolicyRunner):
-    """Runner that uploads recorded training videos to wandb."""
+    """Runner that uploads recorded training videos to wandb.
+
+    Uploads run on background threads (see ``VideoUploader``); ``save`` only
+    asks the uploader to look for new videos, and ``log`` adds its backlog and
+    latency counters under ``Video/``.
+
+    With ``async_checkpoints`` (see ``T1RunnerCfg``) checkpoints are written by
+    an ``AsyncCheckpointWriter``; its queue depth and latencies are logged under
+    ``Checkpoint/``. In either mode ``keep_last_checkpoints > 0`` keeps only
+    that many recent checkpoints plus the best one by mean episode reward.
+
+    Every written checkpoint is recorded, with the mean episode reward and
+    length at save time, in the experiment's ``CheckpointCatalog`` (the parent
+    of ``log_dir``); checkpoints deleted by retention are dropped from it.
+
+    With ``metrics_file`` each iteration's mean reward is appended there as a
+    JSON line, and training stops (after a final save) once ``stop_file``
+    exists; ``mjlab_task.sweep`` uses both for early stopping. With ``pbt_dir``
+    the runner is a member of a population (see ``mjlab_task.pbt``) and
+    exploits / explores every ``pbt_interval`` iterations, logged under ``Pbt/``.
+
+    With ``profile_interval`` a ``TermProfiler`` times every env term, action
+    and sensor; per-term mean and p99 latency are logged under ``Profile/``
+    every ``profile_interval`` iterations, along with ``profile_trace.json``
+    (Chrome trace of the latest calls) in ``log_dir``.
+
+    With ``video_envs`` a ``VideoRenderer`` copies the qpos of that many envs
+    during ``video_length``-step clips every ``video_interval`` steps and a
+    worker process renders them offscreen into ``log_dir/videos/train``, where
+    the uploader picks them up; its clip counters are logged under ``Render/``.
+    """
+
+    upload_fn = staticmethod(wandb_upload)
+
+    _uploader: VideoUploader | None = None
+    _checkpoint_writer: AsyncCheckpointWriter | None = None
+    _retention: CheckpointRetention | None = None
+    _mean_reward: float | None = None
+    _mean_episode_length: float | None = None
+    _pbt: PopulationMember | None = None
+    _profiler: TermProfiler | None = None
+    _renderer: VideoRenderer | None = None
 
     def save(self, path: str, infos=None):
-        super().save(path, infos)
-        self._log_videos()
+        if self.cfg.get("async_checkpoints", False):
+            self._save_async(path, infos)
+        else:
+            super().save(path, infos)
+            self._record_checkpoint(path, self._checkpoint_stats())
+            if self._retention is None:
+                self._retention = CheckpointRetention(
+                    keep_last=self.cfg.get("keep_last_checkpoints", 0),
+                    keep_best=self.cfg.get("keep_best_checkpoint", True),
+                    on_removed=self._on_checkpoint_removed,
+                )
+            self._retention.record(
+                path, self.current_learning_iteration, self._mean_reward
+            )
+        uploader = self._video_uploader()
+        if uploader is not None:
+            uploader.poke()
+
+    def _save_async(self, path: str, infos=None):
+        # Same payload as MjlabOnPolicyRunner.save / OnPolicyRunner.save.
+        env_state = {"common_step_counter": self.env.unwrapped.common_step_counter}
+        saved_dict = {
+            "model_state_dict": self.alg.policy.state_dict(),
+            "optimizer_state_dict": self.alg.optimizer.state_dict(),
+            "iter": self.current_learning_iteration,
+            "infos": {**(infos or {}), "env_state": env_state},
+        }
+        if hasattr(self.alg, "rnd") and self.alg.rnd:
+            saved_dict["rnd_state_dict"] = self.alg.rnd.state_dict()
+            saved_dict["rnd_optimizer_state_dict"] = self.alg.rnd_optimizer.state_dict()
+        if self._checkpoint_writer is None:
+            self._checkpoint_writer = AsyncCheckpointWriter(
+                keep_last=self.cfg.get("keep_last_checkpoints", 0),
+                keep_best=self.cfg.get("keep_best_checkpoint", True),
+                on_written=self._on_checkpoint_written,
+                on_removed=self._on_checkpoint_removed,
+            )
+        self._checkpoint_writer.submit(
+            path,
+            saved_dict,
+            self.current_learning_iteration,
+            self._mean_reward,
+            self._checkpoint_stats(),
+        )
+
+    def _on_checkpoint_written(self, path: str, iteration: int, stats: dict):
+        self._record_checkpoint(path, stats)
+        # upload model to external logging service
+        if self.logger_type in ["neptune", "wandb"] and not self.disable_logs:
+            self.writer.save_model(path, iteration)
 
-    def _log_videos(self):
-        if self.logger_type != "wandb" or not self.log_dir:
+    def _on_checkpoint_removed(self, path: str):
+        catalog = self._catalog()
+        if catalog is not None:
+            catalog.remove(path)
+
+    def _checkpoint_stats(self) -> dict:
+        return {
+            "mean_reward": self._mean_reward,
+            "mean_episode_length": self._mean_episode_length,
+        }
+
+    def _record_checkpoint(self, path: str, stats: dict):
+        catalog = self._catalog()
+        if catalog is None:
+            return
+        try:
+            catalog.record(path, **stats)
+        except OSError as e:
+            print(f"[WARN] Failed to record checkpoint {path} in catalog: {e}")
+
+    def _catalog(self) -> CheckpointCatalog | None:
+        if not self.log_dir:
+            return None
+        return CheckpointCatalog(os.path.dirname(os.path.abspath(self.log_dir)))
+
+    def log(self, locs: dict, *args, **kwargs):
+        super().log(locs, *args, **kwargs)
+        if len(locs["rewbuffer"]) > 0:
+            self._mean_reward = statistics.mean(locs["rewbuffer"])
+            self._mean_episode_length = statistics.mean(locs["lenbuffer"])
+        self._stream_metrics(locs["it"])
+        self._pbt_step(locs["it"])
+        self._log_profile(locs["it"])
+        if self.writer is not None:
+            for prefix, source in (
+                ("Video", self._uploader),
+                ("Render", self._renderer),
+                ("Checkpoint", self._checkpoint_writer),
+            ):
+                if source is not None:
+                    for key, value in source.metrics().items():
+                        self.writer.add_scalar(f"{prefix}/{key}", value, locs["it"])
+        stop_file = self.cfg.get("stop_file")
+        if stop_file and os.path.exists(stop_file):
+            raise _StopTraining
+
+    def _pbt_step(self, iteration: int):
+        if not self.cfg.get("pbt_dir") or self._mean_reward is None:
             return
+        if iteration == 0 or iteration % self.cfg.get("pbt_interval", 50) != 0:
+            return
+        if self._pbt is None:
+            self._pbt = PopulationMember.from_cfg(self.cfg)
+        event = self._pbt.step(self, iteration, self._mean_reward)
+        if event is not None:
+            print(
+                f"[INFO] PBT: member {event['member']} copied member"
+                f" {event['donor']} at iteration {iteration}: {event['hyperparams']}"
+            )
+        if self.writer is not None:
+            self.writer.add_scalar("Pbt/exploits", self._pbt.exploits, iteration)
+            for name in self._pbt.hyperparams:
+                value = getattr(self.alg, name)
+                self.writer.add_scalar(f"Pbt/{name}", value, iteration)
+
+    def _log_profile(self, iteration: int):
+        interval = self.cfg.get("profile_interval", 0)
+        if self._profiler is None or (iteration + 1) % interval != 0:
+            return
+        summary = self._profiler.summary()
+        if self.writer is not None:
+            for key, stats in summary.items():
+                for stat in ("mean_us", "p99_us"):
+                    tag = f"Profile/{key}/{stat}"
+                    self.writer.add_scalar(tag, stats[stat], iteration)
+        if self.log_dir:
+            trace_path = os.path.join(self.log_dir, "profile_trace.json")
+            self._profiler.write_chrome_trace(trace_path)
 
-        video_folder = os.path.join(self.log_dir, "videos", "train")
-        if not os.path.isdir(video_folder):
+    def _stream_metrics(self, iteration: int):
+        metrics_file = self.cfg.get("metrics_file")
+        if not metrics_file:
             return
+        record = {"it": iteration, "time": time.time(), **self._checkpoint_stats()}
+        with open(metrics_file, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+    def learn(self, *args, **kwargs):
+        if self.cfg.get("profile_interval", 0) > 0 and self._profiler is None:
+            self._profiler = TermProfiler(self.env.unwrapped).install()
+        video_envs = self.cfg.get("video_envs", 0)
+        if video_envs > 0 and self._renderer is None and self.log_dir:
+            self._renderer = VideoRenderer(
+                self.env.unwrapped,
+                os.path.join(self.log_dir, "videos", "train"),
+                num_envs=video_envs,
+                interval=self.cfg.get("video_interval", 2000),
+                length=self.cfg.get("video_length", 200),
+                size=tuple(self.cfg.get("video_size", (320, 240))),
+                backend=self.cfg.get("video_backend", "egl"),
+            ).attach()
+        try:
+            return super().learn(*args, **kwargs)
+        except _StopTraining:
+            it = self.current_learning_iteration
+            print(f"[INFO] Stop requested at iteration {it}, saving and exiting.")
+            self.save(os.path.join(self.log_dir, f"model_{it}.pt"))
+        finally:
+            if self._checkpoint_writer is not None:
+                self._checkpoint_writer.close()
+                self._checkpoint_writer = None
+            if self._renderer is not None:
+                self._renderer.close()
+                self._renderer = None
+            if self._uploader is not None:
+                self._uploader.close()
+
+    def _video_uploader(self) -> VideoUploader | None:
+        if self._uploader is None:
+            if self.logger_type != "wandb" or not self.log_dir:
+                return None
+            video_folder = os.path.join(self.log_dir, "videos", "train")
+            if not os.path.isdir(video_folder):
+                return None
+            self._uploader = VideoUploader(video_folder, upload_fn=self.upload_fn)
+        return self._uploader
+
 
-        for video_name in os.listdir(video_folder):
-            if not video_name.endswith(".mp4"):
-                continue
-            full_path = os.path.join(video_folder, video_name)
-            if wandb.run is not None:
-                try:
-                    wandb.run.log({"video": wandb.Video(full_path)})
-                    print(f"[INFO] Logged video to wandb: {video_name}")
-                except Exception:
-                    pass
+class _StopTraining(Exception):
+    """Raised from ``log`` to leave the rsl_rl training loop early."""
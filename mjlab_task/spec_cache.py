@@ -0,0 +1,409 @@
+"""On-disk cache for the Booster T1 robot spec.
+
+Compiling ``t1.xml`` spends a large part of its time reading and decoding the
+~8 MB of STL meshes in ``assets/booster_t1/assets`` (de-duplicating the three
+vertices STL stores per triangle). The cache stores, per content hash of the
+XML, the meshes and the actuator config:
+
+  * ``<mesh>.msh``: de-duplicated vertices and faces in MuJoCo's binary format,
+  * ``robot.mjb``: the compiled actuator- and keyframe-free robot model,
+  * ``manifest.json``: key inputs and build timings.
+
+``load_robot_spec`` parses the (small) XML, strips the XML actuators and points
+the meshes at the cached ``.msh`` files, so no STL is decoded on a warm cache.
+Meshes stay file-backed, so MuJoCo's in-process asset cache keeps working for
+repeated compiles.
+
+``BoosterT1Cfg.fidelity`` picks the visual meshes: "full" (original STLs),
+"train" (vertex-clustered copies, see ``decimate_mesh``) or "headless" (no
+visual geoms). Collision geoms are primitives in every mode.
+
+Usage:
+    python -m mjlab_task.spec_cache warm --fidelity full train
+    python -m mjlab_task.spec_cache info
+    python -m mjlab_task.spec_cache clear
+    python -m mjlab_task.spec_cache bench --repeats 3
+
+Set ``BOOSTER_T1_SPEC_CACHE=0`` to bypass the cache and
+``BOOSTER_T1_CACHE_DIR`` to relocate it (default ``~/.cache/booster_t1``).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Literal
+
+import mujoco
+import numpy as np
+from mujoco import MjSpec
+
+ROBOT_XML = Path(__file__).parent.parent / "assets" / "booster_t1" / "t1.xml"
+MESH_DIR = ROBOT_XML.parent / "assets"
+
+Fidelity = Literal["full", "train", "headless"]
+FIDELITIES: tuple[Fidelity, ...] = ("full", "train", "headless")
+
+# Grid cell (m) used to cluster visual mesh vertices at "train" fidelity.
+VISUAL_CELL_SIZE = 0.006
+
+# Bump when the layout of a cache entry changes.
+_CACHE_VERSION = 2
+
+# In-process templates keyed by (extra, fidelity); callers get copies.
+_TEMPLATES: dict[tuple[str, Fidelity], MjSpec] = {}
+
+
+def cache_enabled() -> bool:
+    flag = os.environ.get("BOOSTER_T1_SPEC_CACHE", "1")
+    return flag.lower() not in ("0", "false", "no")
+
+
+def cache_root() -> Path:
+    xdg_cache = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    root = os.environ.get("BOOSTER_T1_CACHE_DIR", xdg_cache / "booster_t1")
+    return Path(root) / "spec"
+
+
+def spec_key(extra: str = "", fidelity: Fidelity = "full") -> str:
+    """Hash of the robot XML, every mesh file, ``extra`` (actuator config) and
+    the fidelity settings."""
+    digest = hashlib.sha256(f"v{_CACHE_VERSION}/{fidelity}".encode())
+    if fidelity == "train":
+        digest.update(str(VISUAL_CELL_SIZE).encode())
+    digest.update(ROBOT_XML.read_bytes())
+    for mesh_path in sorted(MESH_DIR.glob("*.stl")):
+        digest.update(mesh_path.name.encode())
+        digest.update(mesh_path.read_bytes())
+    digest.update(extra.encode())
+    return digest.hexdigest()[:16]
+
+
+def strip_actuators(spec: MjSpec) -> MjSpec:
+    """Remove XML actuators so mjlab can add its own without name clashes."""
+    for actuator in list(spec.actuators):
+        spec.delete(actuator)
+    return spec
+
+
+def strip_visuals(spec: MjSpec) -> MjSpec:
+    """Remove visual-only geoms (class "visual") and the meshes they used.
+
+    Every collision geom of the T1 is a primitive, so this leaves physics
+    untouched.
+    """
+    for geom in list(spec.geoms):
+        if geom.contype == 0 and geom.conaffinity == 0:
+            spec.delete(geom)
+    used = {geom.meshname for geom in spec.geoms}
+    for mesh in list(spec.meshes):
+        if _mesh_name(mesh) not in used:
+            spec.delete(mesh)
+    return spec
+
+
+def load_robot_spec_uncached(fidelity: Fidelity = "full") -> MjSpec:
+    """Parse ``t1.xml`` (meshes are read from disk at compile time).
+
+    "train" fidelity needs the decimated meshes and is built in memory here.
+    """
+    spec = strip_actuators(MjSpec.from_file(str(ROBOT_XML)))
+    if fidelity == "headless":
+        strip_visuals(spec)
+    elif fidelity == "train":
+        meshes = _asset_meshes(_compile_standalone(spec), VISUAL_CELL_SIZE)
+        for mesh in spec.meshes:
+            name = _mesh_name(mesh)
+            vert, face = meshes[name]
+            mesh.name = name
+            mesh.file = ""
+            mesh.uservert = vert.ravel()
+            mesh.userface = face.ravel()
+    return spec
+
+
+def _mesh_name(mesh) -> str:
+    return mesh.name or Path(mesh.file).stem
+
+
+def _compile_standalone(spec: MjSpec) -> mujoco.MjModel:
+    # The "home" keyframe carries ctrl for the stripped XML actuators.
+    spec = spec.copy()
+    for key in list(spec.keys):
+        spec.delete(key)
+    return spec.compile()
+
+
+def decimate_mesh(
+    vert: np.ndarray, face: np.ndarray, cell_size: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vertex-clustering decimation.
+
+    Vertices falling into the same ``cell_size`` grid cell are merged into
+    their mean; collapsed and duplicate triangles are dropped. Meshes that
+    would degenerate are returned unchanged.
+    """
+    cells = np.floor(vert / cell_size).astype(np.int64)
+    _, cluster, counts = np.unique(
+        cells, axis=0, return_inverse=True, return_counts=True
+    )
+    cluster = cluster.ravel()
+    merged = np.zeros((len(counts), 3))
+    np.add.at(merged, cluster, vert)
+    merged /= counts[:, None]
+
+    new_face = cluster[face]
+    a, b, c = new_face.T
+    new_face = new_face[(a != b) & (b != c) & (a != c)]
+    _, first = np.unique(np.sort(new_face, axis=1), axis=0, return_index=True)
+    new_face = new_face[np.sort(first)]
+    used, remap = np.unique(new_face, return_inverse=True)
+    if len(used) < 4 or len(new_face) < 4:
+        return vert, face
+    return merged[used], remap.reshape(-1, 3)
+
+
+def _asset_meshes(
+    model: mujoco.MjModel, cell_size: float | None = None
+) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Recover asset-frame vertices and faces of every compiled mesh.
+
+    The compiler centres and aligns each mesh (``mesh_pos`` / ``mesh_quat``);
+    undoing that transform gives vertices that recompile to the same model.
+    """
+    meshes = {}
+    rot = np.zeros(9)
+    for mesh_id in range(model.nmesh):
+        name = mujoco.mj_id2name(model, mujoco.mjtObj.mjOBJ_MESH, mesh_id)
+        vert_adr, vert_num = model.mesh_vertadr[mesh_id], model.mesh_vertnum[mesh_id]
+        face_adr, face_num = model.mesh_faceadr[mesh_id], model.mesh_facenum[mesh_id]
+        mujoco.mju_quat2Mat(rot, model.mesh_quat[mesh_id])
+        vert = model.mesh_vert[vert_adr : vert_adr + vert_num].astype(np.float64)
+        vert = vert @ rot.reshape(3, 3).T + model.mesh_pos[mesh_id]
+        face = model.mesh_face[face_adr : face_adr + face_num]
+        if cell_size is not None:
+            vert, face = decimate_mesh(vert, face, cell_size)
+        meshes[name] = (vert.astype(np.float32), face.astype(np.int32))
+    return meshes
+
+
+def _write_meshes(meshes: dict, directory: Path) -> None:
+    for name, (vert, face) in meshes.items():
+        # Header: nvertex, nnormal, ntexcoord, nface.
+        with open(directory / f"{name}.msh", "wb") as f:
+            np.array([len(vert), 0, 0, len(face)], dtype=np.int32).tofile(f)
+            vert.tofile(f)
+            face.tofile(f)
+
+
+def _use_cached_meshes(spec: MjSpec, entry: Path) -> MjSpec:
+    spec.meshdir = str(entry)
+    for mesh in spec.meshes:
+        name = _mesh_name(mesh)
+        mesh.name = name
+        mesh.file = f"{name}.msh"
+    return spec
+
+
+def _write_entry(entry: Path, fidelity: Fidelity) -> None:
+    start = time.perf_counter()
+    source = "headless" if fidelity == "headless" else "full"
+    spec = load_robot_spec_uncached(source)
+    model = _compile_standalone(spec)
+    build_s = time.perf_counter() - start
+
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=entry.parent, prefix=".tmp-"))
+    try:
+        cell_size = VISUAL_CELL_SIZE if fidelity == "train" else None
+        _write_meshes(_asset_meshes(model, cell_size), tmp)
+        if cell_size is not None:
+            model = _compile_standalone(_use_cached_meshes(spec, tmp))
+        mujoco.mj_saveModel(model, str(tmp / "robot.mjb"), None)
+        manifest = {
+            "version": _CACHE_VERSION,
+            "fidelity": fidelity,
+            "robot_xml": str(ROBOT_XML.resolve()),
+            "nmesh": model.nmesh,
+            "nmeshvert": model.nmeshvert,
+            "cold_build_s": build_s,
+            "created": time.time(),
+        }
+        (tmp / "manifest.json").write_text(json.dumps(manifest, indent=2))
+        # Atomic publish; a concurrent worker may have won the race.
+        os.replace(tmp, entry)
+    except OSError:
+        if not (entry / "manifest.json").exists():
+            raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def entry_path(extra: str = "", fidelity: Fidelity = "full") -> Path:
+    return cache_root() / spec_key(extra, fidelity)
+
+
+def warm(extra: str = "", fidelity: Fidelity = "full") -> Path:
+    """Build the cache entry for ``extra`` if missing and return its path."""
+    entry = entry_path(extra, fidelity)
+    if not (entry / "manifest.json").exists():
+        _write_entry(entry, fidelity)
+    return entry
+
+
+def load_robot_spec(extra: str = "", fidelity: Fidelity = "full") -> MjSpec:
+    """Return a fresh, actuator-free T1 spec, served from the cache if possible.
+
+    ``fidelity`` selects the visual meshes: "full" keeps the original STLs,
+    "train" uses decimated copies and "headless" drops visual geoms entirely.
+    """
+    if fidelity not in FIDELITIES:
+        raise ValueError(f"Unknown fidelity {fidelity!r}, expected {FIDELITIES}")
+    if fidelity == "headless" or not cache_enabled():
+        # Headless needs no mesh files, so hashing them would only cost time.
+        return load_robot_spec_uncached(fidelity)
+
+    template = _TEMPLATES.get((extra, fidelity))
+    if template is None:
+        spec = strip_actuators(MjSpec.from_file(str(ROBOT_XML)))
+        template = _use_cached_meshes(spec, warm(extra, fidelity))
+        _TEMPLATES[(extra, fidelity)] = template
+    return template.copy()
+
+
+def load_robot_model(
+    extra: str = "", fidelity: Fidelity = "full"
+) -> mujoco.MjModel:
+    """Return the cached compiled robot (no actuators, no keyframes)."""
+    entry = warm(extra, fidelity)
+    return mujoco.MjModel.from_binary_path(str(entry / "robot.mjb"))
+
+
+def clear() -> int:
+    """Delete every cache entry; returns the number of entries removed."""
+    root = cache_root()
+    if not root.exists():
+        return 0
+    entries = [p for p in root.iterdir() if p.is_dir()]
+    for entry in entries:
+        shutil.rmtree(entry, ignore_errors=True)
+    return len(entries)
+
+
+def _default_extra() -> str:
+    from mjlab_task.robot_cfg import BoosterT1Cfg
+
+    return BoosterT1Cfg().spec_cache_extra()
+
+
+def _time_build(mode: str, fidelity: Fidelity) -> dict[str, float]:
+    """Time one spec build + compile in this (fresh) process."""
+    extra = _default_extra()
+    start = time.perf_counter()
+    if mode == "cold":
+        spec = load_robot_spec_uncached(fidelity)
+    elif mode == "warm":
+        spec = load_robot_spec(extra, fidelity)
+    else:
+        load_robot_model(extra, fidelity)
+        return {"spec": 0.0, "compile": time.perf_counter() - start}
+    spec_s = time.perf_counter() - start
+    model = _compile_standalone(spec)
+    return {
+        "spec": spec_s,
+        "compile": time.perf_counter() - start - spec_s,
+        "nmeshvert": model.nmeshvert,
+        "nmeshface": model.nmeshface,
+    }
+
+
+def _bench(fidelities: list[Fidelity], repeats: int) -> None:
+    # MuJoCo caches decoded meshes per process, so every sample gets its own
+    # interpreter.
+    extra = _default_extra()
+    print(f"median of {repeats} fresh processes")
+    print(
+        f"  {'fidelity':<9} {'mode':<5} {'verts':>7} {'faces':>7}"
+        f" {'spec':>9} {'compile':>9} {'total':>9}"
+    )
+    for fidelity in fidelities:
+        warm(extra, fidelity)
+        for mode in ("cold", "warm", "mjb"):
+            samples = []
+            for _ in range(repeats):
+                cmd = [sys.executable, "-m", "mjlab_task.spec_cache", "_time"]
+                proc = subprocess.run(
+                    [*cmd, mode, f"--fidelity={fidelity}"],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+            spec_s = float(np.median([s["spec"] for s in samples]))
+            compile_s = float(np.median([s["compile"] for s in samples]))
+            total_s = float(np.median([s["spec"] + s["compile"] for s in samples]))
+            verts = samples[0].get("nmeshvert", "-")
+            faces = samples[0].get("nmeshface", "-")
+            print(
+                f"  {fidelity:<9} {mode:<5} {verts:>7} {faces:>7}"
+                f" {spec_s * 1e3:>7.1f}ms {compile_s * 1e3:>7.1f}ms"
+                f" {total_s * 1e3:>7.1f}ms"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Booster T1 robot spec cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm_cmd = sub.add_parser("warm", help="Build entries for the default config")
+    warm_cmd.add_argument(
+        "--fidelity", nargs="+", choices=FIDELITIES, default=list(FIDELITIES)
+    )
+    sub.add_parser("info", help="List cache entries")
+    sub.add_parser("clear", help="Delete all cache entries")
+    bench = sub.add_parser("bench", help="Time cold vs warm spec builds")
+    bench.add_argument(
+        "--fidelity", nargs="+", choices=FIDELITIES, default=list(FIDELITIES)
+    )
+    bench.add_argument("--repeats", type=int, default=3)
+    time_build = sub.add_parser("_time")
+    time_build.add_argument("mode", choices=("cold", "warm", "mjb"))
+    time_build.add_argument("--fidelity", choices=FIDELITIES, default="full")
+    args = parser.parse_args()
+
+    if args.command == "warm":
+        for fidelity in args.fidelity:
+            print(f"{fidelity:<9} {warm(_default_extra(), fidelity)}")
+    elif args.command == "info":
+        root = cache_root()
+        current = {spec_key(_default_extra(), f) for f in FIDELITIES}
+        # Leftover ``.tmp-*`` builds and stray files have no manifest.
+        entries = sorted(
+            entry
+            for entry in (root.iterdir() if root.exists() else ())
+            if (entry / "manifest.json").exists()
+        )
+        print(f"Cache root: {root} ({len(entries)} entries)")
+        for entry in entries:
+            marker = "*" if entry.name in current else " "
+            manifest = json.loads((entry / "manifest.json").read_text())
+            size = sum(p.stat().st_size for p in entry.iterdir()) / 2**20
+            print(
+                f" {marker} {entry.name}  {manifest.get('fidelity', 'full'):<9}"
+                f" {size:6.1f} MB"
+            )
+    elif args.command == "clear":
+        print(f"Removed {clear()} cache entries from {cache_root()}")
+    elif args.command == "bench":
+        _bench(args.fidelity, args.repeats)
+    elif args.command == "_time":
+        print(json.dumps(_time_build(args.mode, args.fidelity)))
+
+
+if __name__ == "__main__":
+    main()
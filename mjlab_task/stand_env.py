@@ -18,18 +18,19 @@ from mjlab.tasks.velocity.velocity_env_cfg import make_velocity_env_cfg
 from mjlab.utils.noise import UniformNoiseCfg as Unoise
 
 from . import stand_mdp
+from .curriculum import reward_weight_curriculum, termination_param_curriculum
+from .pose_bank import default_pose_bank
 from .robot_cfg import BoosterT1Cfg
 
 if TYPE_CHECKING:
     from mjlab.envs import ManagerBasedRlEnv
 
+    from .fused_rewards import FusedMode
+
 # ---------------------------------------------------------------------------
 # Helper reward / termination functions (kept inline, not in separate file)
 # ---------------------------------------------------------------------------
 
-_UP_VEC = torch.tensor([0.0, 0.0, -1.0])
-
-
 def _projected_gravity(env: "ManagerBasedRlEnv") -> torch.Tensor:
     asset: Entity = env.scene["robot"]
     return asset.data.projected_gravity_b
@@ -174,7 +175,7 @@ class T1StandCfgGen:
         self.cfg.actions["joint_pos"] = action
 
     # ---- events (reset) ----
-    def setup_events(self, play: bool = False):
+    def setup_events(self, play: bool = False, pose_bank: str | None = None):
         # Replace base-velocity events with fall-recovery style reset.
         # play mode: always start fallen (100 % fall rate) — easier to test recovery.
         fall_prob = 1.0 if play else 0.6
@@ -186,6 +187,8 @@ class T1StandCfgGen:
                     "fall_probability": fall_prob,
                     "fall_height": 0.8,
                     "velocity_range": 0.5,
+                    # Settled fallen states to reset into (see pose_bank.py)
+                    "pose_bank": pose_bank,
                     "asset_cfg": SceneEntityCfg("robot", joint_names=(".*",)),
                 },
             ),
@@ -311,19 +314,29 @@ class T1StandCfgGen:
         pass  # MetricsTermCfg not available; success tracked via rewards
 
     # ---- assemble ----
-    def generate(self, play: bool = False):
+    def generate(
+        self,
+        play: bool = False,
+        pose_bank: str | None = None,
+        fused_rewards: "FusedMode | None" = None,
+    ):
         """Generate the Booster T1 Stand environment configuration."""
         self.setup_scene()
         self.setup_viewer()
         self.setup_actions()
-        self.setup_events(play=play)
+        self.setup_events(play=play, pose_bank=pose_bank)
         self.setup_observations(play=play)
         self.setup_terminations()
         self.setup_rewards()
+        if fused_rewards is not None:
+            # fused_rewards imports this module for the inline reward terms.
+            from .fused_rewards import fuse_rewards
+
+            self.cfg.rewards = fuse_rewards(self.cfg.rewards, fused_rewards)
         self.setup_metrics()
         self.cfg.curriculum = {
             "action_rate_weight": CurriculumTermCfg(
-                func=stand_mdp.reward_curriculum,
+                func=reward_weight_curriculum,
                 params={
                     "reward_name": "action_rate_l2",
                     "stages": [
@@ -335,7 +348,7 @@ class T1StandCfgGen:
                 },
             ),
             "joint_vel_weight": CurriculumTermCfg(
-                func=stand_mdp.reward_curriculum,
+                func=reward_weight_curriculum,
                 params={
                     "reward_name": "joint_vel_l2",
                     "stages": [
@@ -347,7 +360,7 @@ class T1StandCfgGen:
                 },
             ),
             "energy_threshold": CurriculumTermCfg(
-                func=stand_mdp.termination_curriculum,
+                func=termination_param_curriculum,
                 params={
                     "termination_name": "energy",
                     "stages": [
@@ -365,9 +378,27 @@ class T1StandCfgGen:
             self.cfg.episode_length_s = 20.0
         else:
             self.cfg.episode_length_s = 6.0
+            # Decimated visual meshes are plenty for training videos
+            self.cfg.scene.entities["robot"].fidelity = "train"
         return self.cfg
 
 
-def stand_env_cfg(play: bool = False):
-    """Generate the Booster T1 Stand environment configuration."""
-    return T1StandCfgGen().generate(play=play)
+def stand_env_cfg(
+    play: bool = False,
+    pose_bank: str | None = None,
+    fused_rewards: "FusedMode | None" = None,
+):
+    """Generate the Booster T1 Stand environment configuration.
+
+    ``pose_bank`` and ``fused_rewards`` default to the ``BOOSTER_T1_POSE_BANK``
+    and ``BOOSTER_T1_FUSED_REWARDS`` environment variables.
+    """
+    from .fused_rewards import default_fused_rewards
+
+    if pose_bank is None:
+        pose_bank = default_pose_bank()
+    if fused_rewards is None:
+        fused_rewards = default_fused_rewards()
+    return T1StandCfgGen().generate(
+        play=play, pose_bank=pose_bank, fused_rewards=fused_rewards
+    )
@@ -6,39 +6,41 @@ from typing import TYPE_CHECKING
 import torch
 from mjlab.entity import Entity
 from mjlab.envs.mdp.actions import JointPositionAction, JointPositionActionCfg
+from mjlab.managers.event_manager import EventTermCfg
 from mjlab.managers.reward_manager import RewardTermCfg
 from mjlab.managers.scene_entity_config import SceneEntityCfg
 from mjlab.utils.lab_api.string import resolve_matching_names_values
 
+from .orientation import is_upright, upright_error
+from .pose_bank import load_pose_bank, sample_pose_bank
+
 if TYPE_CHECKING:
     from mjlab.envs import ManagerBasedRlEnv
 
 _DEFAULT_ASSET_CFG = SceneEntityCfg("robot")
-# Target gravity in body frame when upright (gravity points -z in world).
-_UP_VEC = torch.tensor([0.0, 0.0, -1.0])
 
 
 # ---------------------------------------------------------------------------
-# Helper: upright gate used by posture reward
+# SettleJointPositionAction — suppresses actions during early steps after fall
 # ---------------------------------------------------------------------------
 
-def _is_upright(
-    asset: Entity,
-    orientation_threshold: float,
-) -> torch.Tensor:
-    """Return bool tensor: 1 if robot's projected gravity matches upright within threshold."""
-    gravity = asset.data.projected_gravity_b
-    up = _UP_VEC.to(gravity.device)
-    error = torch.sum(torch.square(up - gravity), dim=-1)
-    return (error < orientation_threshold).float()
+def hold_default_pose(
+    settle_counter: torch.Tensor,
+    processed_actions: torch.Tensor,
+    offset: torch.Tensor,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """One settle substep: targets become ``offset`` while the counter is positive.
 
+    Branch-free (``torch.where`` / ``clamp_min``) so it never syncs with the host.
+    """
+    settling = (settle_counter > 0).unsqueeze(1)
+    processed_actions = torch.where(settling, offset, processed_actions)
+    return processed_actions, (settle_counter - 1).clamp_min(0)
 
-# ---------------------------------------------------------------------------
-# SettleJointPositionAction — suppresses actions during early steps after fall
-# ---------------------------------------------------------------------------
 
 class SettleJointPositionActionCfg(JointPositionActionCfg):
     settle_steps: int = 50  # controller timesteps to suppress (1s at 50Hz for T1)
+    compile: bool = False  # torch.compile the per-substep settle update
 
     def __post_init__(self):
         super().__post_init__()
@@ -50,7 +52,7 @@ class SettleJointPositionActionCfg(JointPositionActionCfg):
 class SettleJointPositionAction(JointPositionAction):
     """JointPositionAction that holds the default pose for settle_steps after a fallen reset.
 
-    The reset event stores fallen env ids on the env object; the action picks them up
+    The reset event marks fallen envs in ``_settle_mask``; the action picks them up
     during ``reset()``, which is called right after events in the env's ``_reset_idx``.
     """
 
@@ -58,28 +60,26 @@ class SettleJointPositionAction(JointPositionAction):
         super().__init__(cfg, env)
         self.settle_steps = cfg.settle_steps
         self._settle_counter = torch.zeros(env.num_envs, dtype=torch.int, device=env.device)
-        # Store reference for the reset event to write to
-        self._fallen_env_ids: torch.Tensor | None = None
+        # Written by the reset event: True where the env was reset fallen
+        self._settle_mask = torch.zeros(env.num_envs, dtype=torch.bool, device=env.device)
+        self._settle_fn = (
+            torch.compile(hold_default_pose, fullgraph=True, dynamic=False)
+            if cfg.compile
+            else hold_default_pose
+        )
 
-    def reset(self, env_ids: torch.Tensor | None = None) -> None:
-        # Pick up fallen env ids that reset_fallen_or_standing stored
-        if self._fallen_env_ids is not None and len(self._fallen_env_ids) > 0:
-            self._settle_counter[self._fallen_env_ids] = self.settle_steps
-        self._fallen_env_ids = None
+    def reset(self, env_ids: torch.Tensor | slice | None = None) -> None:
+        if env_ids is None:
+            env_ids = slice(None)
+        # Fallen envs start settling, standing ones drop any leftover count
+        settle = self._settle_mask[env_ids] * self.settle_steps
+        self._settle_counter[env_ids] = settle.to(self._settle_counter.dtype)
 
     def apply_actions(self) -> None:
-        # Handle settling: hold default pose for fallen envs
-        settling = self._settle_counter > 0
-        if settling.any():
-            settling_f = settling.float().unsqueeze(1)
-            self._processed_actions = (
-                self._processed_actions * (1.0 - settling_f)
-                + self._offset * settling_f
-            )
-        # Decrement counter
-        if settling.any():
-            self._settle_counter[settling] -= 1
-
+        # Hold default pose for settling envs and count down, without host syncs
+        self._processed_actions, self._settle_counter = self._settle_fn(
+            self._settle_counter, self._processed_actions, self._offset
+        )
         super().apply_actions()
 
 
@@ -87,94 +87,91 @@ class SettleJointPositionAction(JointPositionAction):
 # Reset event
 # ---------------------------------------------------------------------------
 
-def reset_fallen_or_standing(
-    env: "ManagerBasedRlEnv",
-    env_ids: torch.Tensor,
-    *,
-    fall_probability: float = 0.6,
-    fall_height: float = 0.8,
-    velocity_range: float = 0.5,
-    asset_cfg: SceneEntityCfg = _DEFAULT_ASSET_CFG,
-) -> None:
+class reset_fallen_or_standing:
     """Reset robot as either fallen or standing.
 
-    Fallen envs: dropped from fall_height with random orientation & random joints.
+    Fallen envs: dropped from fall_height with random orientation & random joints,
+    or, with a ``pose_bank`` (see ``mjlab_task.pose_bank``), placed directly in a
+    pre-simulated settled state.
     Standing envs: default pose lifted slightly (~2 cm).
 
-    The ``fallen_env_ids`` tensor is stored on the ``SettleJointPositionAction``
-    instance so the action can hold the default pose during settling.
+    Both cases are blended with ``torch.where`` and written with one call per
+    state kind into preallocated buffers, so a reset never syncs with the host.
+    Dropped envs are marked in the ``SettleJointPositionAction``'s ``_settle_mask``
+    so the action can hold the default pose during settling.
     """
-    asset: Entity = env.scene[asset_cfg.name]
-    device = env.device
-
-    n = len(env_ids)
-    is_fallen = torch.rand(n, device=device) < fall_probability
-    fallen_rel_ids = env_ids[is_fallen]
-    standing_rel_ids = env_ids[~is_fallen]
-
-    # ---- fallen ----
-    if fallen_rel_ids.numel() > 0:
-        fallen_env_ids = fallen_rel_ids.to(torch.int)
-        n_fallen = len(fallen_env_ids)
-
-        # Random quaternion orientation
-        quat = _random_unit_quat(n_fallen, device)
-
-        # Root position at fall height
-        origins = env.scene.env_origins[fallen_rel_ids]
-        root_pos = origins.clone()
-        root_pos[:, 2] += fall_height
-
-        # Random joint positions across full range
-        joint_limits = asset.data.joint_pos_limits[fallen_rel_ids]  # (n_fallen, n_joints, 2)
-        lo = joint_limits[:, :, 0]
-        hi = joint_limits[:, :, 1]
-        joint_pos = lo + (hi - lo) * torch.rand_like(lo)
-
-        # Zero velocities
-        vel = torch.zeros(n_fallen, asset.num_joints, device=device)
-
-        # Write root state
-        asset.write_root_link_pose_to_sim(
-            torch.cat([root_pos, quat], dim=-1), env_ids=fallen_env_ids
-        )
-        asset.write_root_link_velocity_to_sim(
-            torch.zeros(n_fallen, 6, device=device), env_ids=fallen_env_ids
-        )
-
-        # Write joint state
-        asset.write_joint_state_to_sim(
-            joint_pos, vel, env_ids=fallen_env_ids
-        )
 
-    # ---- standing ----
-    if standing_rel_ids.numel() > 0:
-        standing_env_ids = standing_rel_ids.to(torch.int)
+    def __init__(self, cfg: EventTermCfg, env: "ManagerBasedRlEnv"):
+        asset: Entity = env.scene[cfg.params.get("asset_cfg", _DEFAULT_ASSET_CFG).name]
+        self._root_pose = torch.zeros(env.num_envs, 7, device=env.device)
+        self._joint_pos = torch.zeros(env.num_envs, asset.num_joints, device=env.device)
+        self._root_vel = torch.zeros(env.num_envs, 6, device=env.device)
+        self._joint_vel = torch.zeros(env.num_envs, asset.num_joints, device=env.device)
+        pose_bank = cfg.params.get("pose_bank")
+        self._pose_bank = load_pose_bank(pose_bank, env.device) if pose_bank else None
 
-        # Default root state lifted 2 cm
-        default_root = asset.data.default_root_state[standing_rel_ids].clone()
-        origins = env.scene.env_origins[standing_rel_ids]
-        default_root[:, 0:3] += origins
-        default_root[:, 2] += 0.02  # 2 cm z bump
-
-        # Zero velocities
-        vel = torch.zeros(len(standing_env_ids), asset.num_joints, device=device)
-        default_jpos = asset.data.default_joint_pos[standing_rel_ids]
-
-        asset.write_root_link_pose_to_sim(
-            default_root[:, 0:7], env_ids=standing_env_ids
-        )
-        asset.write_root_link_velocity_to_sim(
-            torch.zeros(len(standing_env_ids), 6, device=device), env_ids=standing_env_ids
-        )
-        asset.write_joint_state_to_sim(
-            default_jpos[:, :asset.num_joints], vel, env_ids=standing_env_ids
-        )
-
-    # Signal fallen envs to the settle action
-    action = env.action_manager._terms.get("joint_pos")
-    if isinstance(action, SettleJointPositionAction):
-        action._fallen_env_ids = fallen_rel_ids.to(torch.int) if fallen_rel_ids.numel() > 0 else None
+    def __call__(
+        self,
+        env: "ManagerBasedRlEnv",
+        env_ids: torch.Tensor,
+        *,
+        fall_probability: float = 0.6,
+        fall_height: float = 0.8,
+        velocity_range: float = 0.5,
+        pose_bank: str | None = None,
+        asset_cfg: SceneEntityCfg = _DEFAULT_ASSET_CFG,
+    ) -> None:
+        del velocity_range  # dropped and standing envs start at rest
+        del pose_bank  # loaded in __init__
+        asset: Entity = env.scene[asset_cfg.name]
+        device = env.device
+        n = len(env_ids)
+        num_joints = asset.num_joints
+
+        is_fallen = torch.rand(n, device=device) < fall_probability
+        mask = is_fallen.unsqueeze(1)
+        origins = env.scene.env_origins[env_ids]
+
+        if self._pose_bank is not None:
+            # Fallen: a settled state from the bank, so there is nothing to settle
+            pose = sample_pose_bank(self._pose_bank, n, num_joints)
+            fallen_pos = pose["root_pose"][:, 0:3] + origins
+            fallen_quat = pose["root_pose"][:, 3:7]
+            fallen_joint_pos = pose["joint_pos"]
+            torch.mul(pose["root_vel"], mask, out=self._root_vel[:n])
+            torch.mul(pose["joint_vel"], mask, out=self._joint_vel[:n])
+            settle = torch.zeros_like(is_fallen)
+        else:
+            # Fallen: random orientation at fall height, random joints across full range
+            fallen_pos = origins.clone()
+            fallen_pos[:, 2] += fall_height
+            fallen_quat = _random_unit_quat(n, device)
+            joint_limits = asset.data.joint_pos_limits[env_ids]  # (n, n_joints, 2)
+            lo = joint_limits[:, :, 0]
+            hi = joint_limits[:, :, 1]
+            fallen_joint_pos = lo + (hi - lo) * torch.rand_like(lo)
+            settle = is_fallen
+
+        # Standing: default root state offset by the env origin, 2 cm z bump
+        default_root = asset.data.default_root_state[env_ids]
+        default_jpos = asset.data.default_joint_pos[env_ids, :num_joints]
+        standing_pos = default_root[:, 0:3] + origins
+        standing_pos[:, 2] += 0.02
+
+        root_pose = self._root_pose[:n]
+        torch.where(mask, fallen_pos, standing_pos, out=root_pose[:, 0:3])
+        torch.where(mask, fallen_quat, default_root[:, 3:7], out=root_pose[:, 3:7])
+        joint_pos = self._joint_pos[:n]
+        torch.where(mask, fallen_joint_pos, default_jpos, out=joint_pos)
+
+        asset.write_root_link_pose_to_sim(root_pose, env_ids=env_ids)
+        asset.write_root_link_velocity_to_sim(self._root_vel[:n], env_ids=env_ids)
+        asset.write_joint_state_to_sim(joint_pos, self._joint_vel[:n], env_ids=env_ids)
+
+        # Signal dropped envs to the settle action
+        action = env.action_manager._terms.get("joint_pos")
+        if isinstance(action, SettleJointPositionAction):
+            action._settle_mask[env_ids] = settle
 
 
 def _random_unit_quat(n: int, device: torch.device) -> torch.Tensor:
@@ -198,11 +195,7 @@ def orientation_reward(
     asset_cfg: SceneEntityCfg = _DEFAULT_ASSET_CFG,
 ) -> torch.Tensor:
     """Reward for upright orientation."""
-    asset: Entity = env.scene[asset_cfg.name]
-    gravity = asset.data.projected_gravity_b
-    up = _UP_VEC.to(gravity.device)
-    error = torch.sum(torch.square(up - gravity), dim=-1)
-    return torch.exp(-2.0 * error)
+    return torch.exp(-2.0 * upright_error(env, asset_cfg.name))
 
 
 class gated_posture_reward:
@@ -231,7 +224,7 @@ class gated_posture_reward:
     ) -> torch.Tensor:
         del std  # resolved in __init__
         asset: Entity = env.scene[asset_cfg.name]
-        gate = _is_upright(asset, orientation_threshold)
+        gate = is_upright(env, orientation_threshold, asset_cfg.name)
 
         current_pos = asset.data.joint_pos[:, asset_cfg.joint_ids]
         desired_pos = self.default_joint_pos[:, asset_cfg.joint_ids]
@@ -243,25 +236,33 @@ class gated_posture_reward:
 # Energy-based termination (from getup task)
 # ---------------------------------------------------------------------------
 
-def energy_termination(
+def mechanical_power(
     env: "ManagerBasedRlEnv",
-    threshold: float = float("inf"),
-    settle_steps: int = 0,
     asset_cfg: SceneEntityCfg = _DEFAULT_ASSET_CFG,
 ) -> torch.Tensor:
-    """Terminate when mechanical power exceeds threshold.
-
-    Power = sum(|actuator_force * joint_vel|). Skips the first settle_steps so
-    drop/settle dynamics don't trigger early termination.
-    """
+    """Mechanical power per env: sum(|actuator_force * joint_vel|)."""
     asset: Entity = env.scene[asset_cfg.name]
-    power = torch.sum(
+    return torch.sum(
         torch.abs(
             asset.data.actuator_force[:, asset_cfg.actuator_ids]
             * asset.data.joint_vel[:, asset_cfg.joint_ids]
         ),
         dim=-1,
     )
+
+
+def energy_termination(
+    env: "ManagerBasedRlEnv",
+    threshold: float | torch.Tensor = float("inf"),
+    settle_steps: int = 0,
+    asset_cfg: SceneEntityCfg = _DEFAULT_ASSET_CFG,
+) -> torch.Tensor:
+    """Terminate when mechanical power exceeds threshold.
+
+    Power = sum(|actuator_force * joint_vel|). Skips the first settle_steps so
+    drop/settle dynamics don't trigger early termination.
+    """
+    power = mechanical_power(env, asset_cfg)
     past_settle = env.episode_length_buf > settle_steps
     return past_settle & (power > threshold)
 
@@ -291,7 +292,7 @@ class stand_success:
         asset_cfg: SceneEntityCfg = _DEFAULT_ASSET_CFG,
     ) -> torch.Tensor:
         asset: Entity = env.scene[asset_cfg.name]
-        upright = _is_upright(asset, orientation_threshold)
+        upright = is_upright(env, orientation_threshold, asset_cfg.name)
         height = asset.data.body_link_pos_w[:, asset_cfg.body_ids, 2].squeeze(-1)
         height_ok = (desired_height - height) < height_tolerance
         standing = upright * height_ok
@@ -313,35 +314,3 @@ def self_collision_cost(
     collision_force_magnitude = contact_forces.abs().sum(dim=-1)
     # Penalise non-zero contact (avg across all slots if multi-slot)
     return -collision_force_magnitude.mean(dim=-1)
-
-
-def reward_curriculum(
-    env: "ManagerBasedRlEnv",
-    env_ids: torch.Tensor,
-    reward_name: str,
-    stages: list[dict],
-) -> torch.Tensor:
-    """Update a reward term's weight based on training step stages."""
-    del env_ids  # Unused.
-    reward_term_cfg = env.reward_manager.get_term_cfg(reward_name)
-    for stage in stages:
-        if env.common_step_counter > stage["step"]:
-            reward_term_cfg.weight = stage["weight"]
-    return torch.tensor([reward_term_cfg.weight])
-
-
-def termination_curriculum(
-    env: "ManagerBasedRlEnv",
-    env_ids: torch.Tensor,
-    termination_name: str,
-    stages: list[dict],
-) -> torch.Tensor:
-    """Update a termination term's params based on training step stages."""
-    del env_ids  # Unused.
-    termination_term_cfg = env.termination_manager.get_term_cfg(termination_name)
-    for stage in stages:
-        if env.common_step_counter > stage["step"]:
-            for key, value in stage["params"].items():
-                setattr(termination_term_cfg, key, value)
-    # Return dummy tensor for logging
-    return torch.tensor([0.0])
@@ -0,0 +1,432 @@
+"""Hyperparameter sweeps over the Booster T1 training configs.
+
+Each ``--param PATH VALUE [VALUE ...]`` names a field of mjlab's
+``TrainConfig`` below ``env.`` or ``agent.`` (e.g.
+``agent.algorithm.learning_rate``, ``agent.policy.actor_hidden_dims``,
+``env.scene.num_envs``, ``env.decimation``) and the values to try. Values are
+Python literals; a single ``uniform(lo, hi)``, ``loguniform(lo, hi)`` or
+``randint(lo, hi)`` value is a distribution for random search.
+
+``--search grid`` runs the cartesian product of all value lists and
+``--search random`` draws ``--trials`` configurations. Trials run on CPU in a
+pool of ``--workers`` spawned processes, each pinned to its own slice of the
+available cores; a worker launches trial after trial in-process, so only the
+first trial per worker pays the interpreter and import cost.
+
+Every trial streams its mean reward per iteration to ``metrics.jsonl`` (see
+``T1RunnerCfg.metrics_file``). With ``--early-stop`` the median stopping rule
+stops a trial (by creating its ``stop_file``) whose mean reward after
+``--grace-iterations`` falls below the median of the other trials at the same
+iteration. Results go to ``logs/sweeps/<name>/results.{csv,json}``:
+
+    python train.py sweep --task T1-Stand-v0 --workers 4 --max-iterations 300 \\
+        --param agent.algorithm.learning_rate 3e-4 1e-3 \\
+        --param env.scene.num_envs 512 1024 --early-stop
+"""
+
+import argparse
+import ast
+import csv
+import dataclasses
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+_DISTRIBUTION = re.compile(r"^(uniform|loguniform|randint)\((.+),(.+)\)$")
+
+
+# ---- search space ----
+@dataclasses.dataclass(frozen=True)
+class Distribution:
+    kind: str
+    low: float
+    high: float
+
+    def sample(self, rng: random.Random) -> float | int:
+        if self.kind == "randint":
+            return rng.randint(int(self.low), int(self.high))
+        if self.kind == "loguniform":
+            return math.exp(rng.uniform(math.log(self.low), math.log(self.high)))
+        return rng.uniform(self.low, self.high)
+
+
+def parse_values(raw: list[str]) -> list[Any] | Distribution:
+    """Turn ``--param`` values into a choice list or a distribution."""
+    if len(raw) == 1:
+        match = _DISTRIBUTION.match(raw[0].replace(" ", ""))
+        if match:
+            kind, low, high = match.groups()
+            return Distribution(kind, float(low), float(high))
+    values = []
+    for value in raw:
+        try:
+            values.append(ast.literal_eval(value))
+        except (ValueError, SyntaxError):
+            values.append(value)
+    return values
+
+
+def grid(space: dict[str, list[Any] | Distribution]) -> list[dict[str, Any]]:
+    for path, values in space.items():
+        if isinstance(values, Distribution):
+            raise ValueError(f"grid search needs explicit values for {path}")
+    names = list(space)
+    return [dict(zip(names, combo)) for combo in itertools.product(*space.values())]
+
+
+def random_search(
+    space: dict[str, list[Any] | Distribution], trials: int, seed: int
+) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            path: values.sample(rng)
+            if isinstance(values, Distribution)
+            else rng.choice(values)
+            for path, values in space.items()
+        }
+        for _ in range(trials)
+    ]
+
+
+def apply_overrides(cfg, params: dict[str, Any]) -> None:
+    """Set ``env.*`` / ``agent.*`` fields of a ``TrainConfig`` in place."""
+    for path, value in params.items():
+        parts = path.split(".")
+        if parts[0] not in ("env", "agent") or len(parts) < 2:
+            raise ValueError(f"sweep parameter must start with env. or agent.: {path}")
+        obj = cfg
+        for part in parts[:-1]:
+            obj = obj[part] if isinstance(obj, dict) else getattr(obj, part)
+        leaf = parts[-1]
+        if isinstance(obj, dict):
+            if leaf not in obj:
+                raise ValueError(f"unknown sweep parameter: {path}")
+            obj[leaf] = value
+            continue
+        if not hasattr(obj, leaf):
+            raise ValueError(f"unknown sweep parameter: {path}")
+        if isinstance(getattr(obj, leaf), tuple) and isinstance(value, list):
+            value = tuple(value)
+        setattr(obj, leaf, value)
+
+
+# ---- early stopping ----
+@dataclasses.dataclass
+class MedianStoppingRule:
+    """Stop a trial whose reward is below the median of its peers.
+
+    Compared at the trial's latest iteration, once it is past
+    ``grace_iterations`` and at least ``min_peers`` other trials reported a
+    reward for that iteration.
+    """
+
+    grace_iterations: int = 50
+    min_peers: int = 2
+
+    def should_stop(
+        self, curve: dict[int, float], peers: list[dict[int, float]]
+    ) -> bool:
+        if not curve:
+            return False
+        it = max(curve)
+        if it < self.grace_iterations:
+            return False
+        peer_rewards = [peer[it] for peer in peers if it in peer]
+        if len(peer_rewards) < self.min_peers:
+            return False
+        return curve[it] < statistics.median(peer_rewards)
+
+
+# ---- trials ----
+@dataclasses.dataclass
+class Trial:
+    index: int
+    name: str
+    params: dict[str, Any]
+    dir: Path
+    curve: dict[int, float] = dataclasses.field(default_factory=dict)
+    status: str = "pending"
+    wall_s: float | None = None
+    error: str | None = None
+    _offset: int = 0
+
+    @property
+    def metrics_file(self) -> Path:
+        return self.dir / "metrics.jsonl"
+
+    @property
+    def stop_file(self) -> Path:
+        return self.dir / "STOP"
+
+    def poll_metrics(self) -> None:
+        """Read the lines appended to ``metrics.jsonl`` since the last poll."""
+        try:
+            with open(self.metrics_file) as f:
+                f.seek(self._offset)
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            if not line.endswith("\n"):
+                break  # partially written, read again next time
+            self._offset += len(line)
+            record = json.loads(line)
+            if record["mean_reward"] is not None:
+                self.curve[record["it"]] = record["mean_reward"]
+
+    def summary(self) -> dict[str, Any]:
+        rewards = list(self.curve.values())
+        return {
+            "trial": self.name,
+            "status": self.status,
+            **self.params,
+            "iterations": max(self.curve) + 1 if self.curve else 0,
+            "final_reward": self.curve[max(self.curve)] if self.curve else None,
+            "best_reward": max(rewards, default=None),
+            "wall_s": self.wall_s,
+            "error": self.error,
+        }
+
+
+_worker_cpus: list[int] | None = None
+
+
+def _init_worker(slots) -> None:
+    """Pin this pool worker to one CPU slice and size torch's threads to it."""
+    global _worker_cpus
+    _worker_cpus = slots.get()
+    threads = str(len(_worker_cpus))
+    os.environ["OMP_NUM_THREADS"] = threads
+    os.environ["MKL_NUM_THREADS"] = threads
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, _worker_cpus)
+
+    import torch
+
+    torch.set_num_threads(len(_worker_cpus))
+
+
+def _run_trial(task_id: str, trial: Trial, agent_overrides: dict[str, Any]) -> float:
+    """Train one trial in this worker process; returns the wall time."""
+    import mjlab.tasks  # noqa: F401
+    from mjlab.scripts.train import TrainConfig, launch_training
+
+    import mjlab_task  # noqa: F401
+
+    trial.dir.mkdir(parents=True, exist_ok=True)
+    log = open(trial.dir / "train.log", "w")
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = os.dup(1), os.dup(2)
+    os.dup2(log.fileno(), 1)
+    os.dup2(log.fileno(), 2)
+    try:
+        print(f"[INFO] Trial {trial.name} on CPUs {_worker_cpus}: {trial.params}")
+        cfg = dataclasses.replace(TrainConfig.from_task(task_id), gpu_ids=None)
+        apply_overrides(cfg, {**agent_overrides, **trial.params})
+        cfg.agent.run_name = trial.name
+        cfg.agent.metrics_file = str(trial.metrics_file)
+        cfg.agent.stop_file = str(trial.stop_file)
+        start = time.perf_counter()
+        launch_training(task_id=task_id, args=cfg)
+        return time.perf_counter() - start
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_fds[0], 1)
+        os.dup2(saved_fds[1], 2)
+        log.close()
+
+
+def _cpu_slots(workers: int) -> list[list[int]]:
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    per_worker = max(1, len(cpus) // workers)
+    return [cpus[i * per_worker : (i + 1) * per_worker] or cpus for i in range(workers)]
+
+
+# ---- driver ----
+def run_sweep(
+    task_id: str,
+    trials: list[Trial],
+    agent_overrides: dict[str, Any],
+    workers: int,
+    stopping: MedianStoppingRule | None,
+    poll_interval_s: float = 2.0,
+) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    slots = ctx.Queue()
+    for cpus in _cpu_slots(workers):
+        slots.put(cpus)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(slots,),
+    ) as pool:
+        futures: dict[Future, Trial] = {
+            pool.submit(_run_trial, task_id, trial, agent_overrides): trial
+            for trial in trials
+        }
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, poll_interval_s, FIRST_COMPLETED)
+            for trial in trials:
+                trial.poll_metrics()
+                if trial.status == "pending" and trial.curve:
+                    trial.status = "running"
+            for future in done:
+                _finish(futures[future], future)
+            if stopping is None:
+                continue
+            for trial in trials:
+                if trial.status != "running":
+                    continue
+                peers = [t.curve for t in trials if t is not trial]
+                if stopping.should_stop(trial.curve, peers):
+                    trial.stop_file.touch()
+                    trial.status = "stopping"
+                    it = max(trial.curve)
+                    print(f"[INFO] Stopping {trial.name} at iteration {it}")
+
+
+def _finish(trial: Trial, future: Future) -> None:
+    trial.poll_metrics()
+    error = future.exception()
+    if error is not None:
+        trial.status = "failed"
+        trial.error = f"{type(error).__name__}: {error}"
+        print(f"[WARN] {trial.name} failed: {trial.error}")
+        return
+    trial.wall_s = future.result()
+    trial.status = "stopped" if trial.status == "stopping" else "completed"
+    best = max(trial.curve.values(), default=float("nan"))
+    print(f"[INFO] {trial.name} {trial.status} (best reward {best:.3f})")
+
+
+def write_results(sweep_dir: Path, trials: list[Trial]) -> list[dict[str, Any]]:
+    rows = sorted(
+        (trial.summary() for trial in trials),
+        key=lambda row: -math.inf if row["best_reward"] is None else row["best_reward"],
+        reverse=True,
+    )
+    with open(sweep_dir / "results.json", "w") as f:
+        json.dump(rows, f, indent=2)
+    fields = list(dict.fromkeys(key for row in rows for key in row))
+    with open(sweep_dir / "results.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows
+
+
+def print_results(rows: list[dict[str, Any]], param_names: list[str]) -> None:
+    columns = ["trial", "status", *param_names, "iterations", "best_reward", "wall_s"]
+    cells = [
+        [
+            f"{value:.4g}" if isinstance(value, float) else str(value)
+            for value in (row.get(column) for column in columns)
+        ]
+        for row in rows
+    ]
+    widths = [
+        max(len(column), *(len(row[i]) for row in cells))
+        for i, column in enumerate(columns)
+    ]
+    header = " ".join(column.ljust(width) for column, width in zip(columns, widths))
+    print(header)
+    print("-" * len(header))
+    for row in cells:
+        line = " ".join(cell.ljust(width) for cell, width in zip(row, widths))
+        print(line.rstrip())
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="train.py sweep", description="Hyperparameter sweep for Booster T1 tasks"
+    )
+    parser.add_argument("--task", type=str, default="T1-Stand-v0")
+    parser.add_argument(
+        "--param",
+        nargs="+",
+        action="append",
+        required=True,
+        metavar=("PATH", "VALUE"),
+        help="Config field and the values (or one distribution) to try",
+    )
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--trials", type=int, default=8, help="Random search only")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--max-iterations", type=int, default=None)
+    parser.add_argument("--logger", type=str, default="tensorboard")
+    parser.add_argument("--early-stop", action="store_true")
+    parser.add_argument("--grace-iterations", type=int, default=50)
+    parser.add_argument("--min-peers", type=int, default=2)
+    parser.add_argument("--name", type=str, default=None, help="Sweep directory name")
+    args = parser.parse_args(argv)
+
+    space = {}
+    for param in args.param:
+        if len(param) < 2:
+            parser.error(f"--param {param[0]} needs at least one value")
+        space[param[0]] = parse_values(param[1:])
+    if args.search == "grid":
+        configs = grid(space)
+    else:
+        configs = random_search(space, args.trials, args.seed)
+
+    agent_overrides: dict[str, Any] = {"agent.logger": args.logger}
+    if args.max_iterations is not None:
+        agent_overrides["agent.max_iterations"] = args.max_iterations
+
+    # Fail on unknown parameters before spawning any worker.
+    import mjlab.tasks  # noqa: F401
+    from mjlab.scripts.train import TrainConfig
+
+    import mjlab_task  # noqa: F401
+
+    apply_overrides(TrainConfig.from_task(args.task), {**agent_overrides, **configs[0]})
+
+    name = args.name or f"{args.task}_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}"
+    sweep_dir = Path("logs") / "sweeps" / name
+    sweep_dir.mkdir(parents=True, exist_ok=True)
+    with open(sweep_dir / "sweep.json", "w") as f:
+        json.dump(
+            {"task": args.task, "args": vars(args), "trials": configs}, f, indent=2
+        )
+    trials = [
+        Trial(i, f"{name}_t{i:03d}", params, sweep_dir / f"t{i:03d}")
+        for i, params in enumerate(configs)
+    ]
+    print(
+        f"[INFO] Sweep {name}: {len(trials)} trials on {args.workers} workers"
+        f" ({sweep_dir})"
+    )
+
+    stopping = None
+    if args.early_stop:
+        stopping = MedianStoppingRule(args.grace_iterations, args.min_peers)
+    run_sweep(args.task, trials, agent_overrides, args.workers, stopping)
+
+    rows = write_results(sweep_dir, trials)
+    print_results(rows, list(space))
+    print(f"Wrote {sweep_dir / 'results.csv'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""Training videos rendered off the training process.
+
+``VideoRenderer(env, video_dir).attach()`` wraps ``env.step`` (on that
+instance only, like ``RolloutRecorder``). Every ``interval`` steps it starts a
+clip of ``length`` steps, during which each step only copies the ``qpos`` of
+the selected envs (a few hundred bytes) into a free slot of a ring of clip
+buffers shared with a worker process through a memory-mapped file. A full
+slot is handed to the worker, which replays it kinematically offscreen
+(``MUJOCO_GL=egl`` or ``osmesa``), tiles the envs into one frame (each tile
+tracks that env's robot) and encodes ``rl-video-step-<step>.mp4`` into
+``video_dir`` -- the folder and names ``VideoUploader`` watches -- next to
+the clip's qpos (``rl-video-step-<step>.npy``, see ``train.py replay``). The
+worker gives its slot back when the clip is written.
+
+Training never waits on rendering: a clip that finds every slot busy is
+dropped (``clips_dropped``), and so is everything after a worker failure,
+which is reported once. The worker runs this file as a script, so it loads
+only MuJoCo, NumPy and imageio, never torch or the task package, and it runs
+at the lowest CPU priority, so on a machine without a spare core it only
+gets the cycles training leaves.
+
+``VideoOnPolicyRunner`` starts one when ``T1RunnerCfg.video_envs > 0``
+(``train.py --video``); ``metrics`` are logged under ``Render/``.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+_FILENAME = "rl-video-step-{step}.mp4"
+_CAMERA_KEYS = (
+    "track_body",
+    "distance",
+    "elevation",
+    "azimuth",
+    "shadows",
+    "reflections",
+)
+
+
+class VideoRenderer:
+    """Copies qpos snapshots into shared clip slots for a render worker."""
+
+    def __init__(
+        self,
+        env,
+        video_dir: str | Path,
+        num_envs: int = 4,
+        interval: int = 2000,
+        length: int = 200,
+        size: tuple[int, int] = (320, 240),
+        num_slots: int = 2,
+        backend: str = "egl",
+        niceness: int = 19,
+    ):
+        self._env = env
+        self.video_dir = Path(video_dir)
+        self.env_ids = list(range(min(num_envs, env.num_envs)))
+        self.interval = interval
+        self.length = length
+        self._original_step = None
+        self._step = 0
+        self._slot: int | None = None
+        self._fill = 0
+        self._clip_step = 0
+        self._free = list(range(num_slots))
+        self._lock = threading.Lock()
+        self._error: str | None = None
+        self._closing = False
+        self._counts = {"submitted": 0, "written": 0, "dropped": 0}
+        self._render_s: list[float] = []
+        self._copy_ns = 0
+        self._copies = 0
+
+        import mujoco
+
+        model = env.sim.mj_model
+        self._workdir = Path(tempfile.mkdtemp(prefix="t1-video-"))
+        mujoco.mj_saveModel(model, str(self._workdir / "model.mjb"), None)
+        shape = (num_slots, length, len(self.env_ids), model.nq)
+        self._ring = np.lib.format.open_memmap(
+            self._workdir / "ring.npy", mode="w+", dtype=np.float32, shape=shape
+        )
+        config = {
+            "model": str(self._workdir / "model.mjb"),
+            "ring": str(self._workdir / "ring.npy"),
+            "video_dir": str(self.video_dir),
+            "fps": 1.0 / env.step_dt,
+            "width": size[0],
+            "height": size[1],
+            **viewer_camera(model, env.cfg.viewer),
+            "niceness": niceness,
+        }
+        with open(self._workdir / "config.json", "w") as f:
+            json.dump(config, f)
+        self.video_dir.mkdir(parents=True, exist_ok=True)
+        self._worker = subprocess.Popen(
+            [sys.executable, __file__, str(self._workdir / "config.json")],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            env={**os.environ, "MUJOCO_GL": backend},
+        )
+        self._reader = threading.Thread(
+            target=self._read_replies, name="video-renderer", daemon=True
+        )
+        self._reader.start()
+
+    def attach(self) -> "VideoRenderer":
+        if self._original_step is not None:
+            return self
+        original = self._env.step
+        self._original_step = original
+
+        def step(action):
+            result = original(action)
+            self._after_step()
+            return result
+
+        self._env.step = step
+        return self
+
+    def close(self, timeout: float = 60.0) -> None:
+        """Detach, drop an unfinished clip and wait up to ``timeout`` s for the
+        submitted ones to be written; clips still rendering then are discarded."""
+        if self._original_step is not None:
+            self._env.step = self._original_step
+            self._original_step = None
+        self._closing = True
+        try:
+            self._worker.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._worker.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self._worker.kill()
+            self._worker.wait()
+        self._reader.join(timeout=1.0)
+        shutil.rmtree(self.video_dir / ".partial", ignore_errors=True)
+        del self._ring
+        for path in self._workdir.iterdir():
+            path.unlink()
+        self._workdir.rmdir()
+
+    def __enter__(self) -> "VideoRenderer":
+        return self.attach()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- capture (training thread) ----
+    def _after_step(self) -> None:
+        if self._slot is None and self._step % self.interval == 0:
+            self._start_clip()
+        self._step += 1
+        if self._slot is None:
+            return
+        start = time.perf_counter_ns()
+        qpos = self._env.sim.data.qpos[self.env_ids]
+        self._ring[self._slot, self._fill] = qpos.cpu().numpy()
+        self._copy_ns += time.perf_counter_ns() - start
+        self._copies += 1
+        self._fill += 1
+        if self._fill == self.length:
+            self._submit_clip()
+
+    def _start_clip(self) -> None:
+        with self._lock:
+            if self._error is not None or not self._free:
+                self._counts["dropped"] += 1
+                return
+            self._slot = self._free.pop()
+        self._fill = 0
+        self._clip_step = self._step
+
+    def _submit_clip(self) -> None:
+        request = {"slot": self._slot, "frames": self._fill, "step": self._clip_step}
+        self._slot = None
+        try:
+            self._worker.stdin.write(json.dumps(request) + "\n")
+            self._worker.stdin.flush()
+        except OSError:
+            self._fail("worker exited")
+            return
+        with self._lock:
+            self._counts["submitted"] += 1
+
+    # ---- worker replies (reader thread) ----
+    def _read_replies(self) -> None:
+        for line in self._worker.stdout:
+            reply = json.loads(line)
+            if "error" in reply:
+                self._fail(reply["error"])
+                continue
+            with self._lock:
+                self._free.append(reply["slot"])
+                self._counts["written"] += 1
+                self._render_s.append(reply["seconds"])
+        if self._worker.wait() != 0 and not self._closing:
+            self._fail(f"worker exited with code {self._worker.returncode}")
+
+    def _fail(self, message: str) -> None:
+        with self._lock:
+            if self._error is not None:
+                return
+            self._error = message
+        print(f"[WARN] Video rendering disabled: {message}")
+
+    def metrics(self) -> dict[str, float]:
+        """Clip counters, plus mean render time and per-step copy cost since the
+        previous call."""
+        with self._lock:
+            render_s, self._render_s = self._render_s, []
+            metrics = {f"clips_{name}": float(n) for name, n in self._counts.items()}
+        if render_s:
+            metrics["render_s"] = sum(render_s) / len(render_s)
+        if self._copies:
+            metrics["copy_us"] = self._copy_ns / self._copies / 1e3
+            self._copy_ns = self._copies = 0
+        return metrics
+
+
+def viewer_camera(model, viewer) -> dict:
+    """``TileRenderer`` camera settings of a task's ``ViewerConfig``: track
+    ``entity_name/body_name`` (or the entity's root body) of ``model``."""
+    import mujoco
+
+    prefix = f"{viewer.entity_name or 'robot'}/"
+    if viewer.body_name:
+        track_body = mujoco.mj_name2id(
+            model, mujoco.mjtObj.mjOBJ_BODY, prefix + viewer.body_name
+        )
+    else:
+        bodies = (model.body(body).name for body in range(model.nbody))
+        track_body = next(
+            body for body, name in enumerate(bodies) if name.startswith(prefix)
+        )
+    return {
+        "track_body": int(track_body),
+        "distance": float(viewer.distance),
+        "elevation": float(viewer.elevation),
+        "azimuth": float(viewer.azimuth),
+        "shadows": bool(viewer.enable_shadows),
+        "reflections": bool(viewer.enable_reflections),
+    }
+
+
+class TileRenderer:
+    """Offscreen frames of several envs' qpos, one ``width`` x ``height`` tile
+    per env (row-major in a near-square grid), each with a camera tracking
+    ``track_body``. Modifies ``model``'s lights and materials when
+    ``shadows`` / ``reflections`` are off."""
+
+    def __init__(
+        self,
+        model,
+        num_envs: int,
+        width: int,
+        height: int,
+        track_body: int,
+        distance: float,
+        elevation: float,
+        azimuth: float,
+        shadows: bool = True,
+        reflections: bool = True,
+    ):
+        import mujoco
+
+        model.vis.global_.offwidth = max(model.vis.global_.offwidth, width)
+        model.vis.global_.offheight = max(model.vis.global_.offheight, height)
+        if not shadows:
+            model.light_castshadow[:] = False
+        if not reflections:
+            model.mat_reflectance[:] = 0.0
+        self._model = model
+        self._renderer = mujoco.Renderer(model, height=height, width=width)
+        self._data = mujoco.MjData(model)
+        self._camera = mujoco.MjvCamera()
+        self._camera.type = mujoco.mjtCamera.mjCAMERA_TRACKING
+        self._camera.trackbodyid = track_body
+        self._camera.distance = distance
+        self._camera.elevation = elevation
+        self._camera.azimuth = azimuth
+        self.width, self.height = width, height
+        self.columns = int(np.ceil(np.sqrt(num_envs)))
+        rows = int(np.ceil(num_envs / self.columns))
+        self._frame = np.zeros((rows * height, self.columns * width, 3), np.uint8)
+
+    def render(self, qpos: np.ndarray) -> np.ndarray:
+        """Frame of ``(num_envs, nq)`` joint positions (reused between calls)."""
+        import mujoco
+
+        for index, env_qpos in enumerate(qpos):
+            self._data.qpos[:] = env_qpos
+            mujoco.mj_forward(self._model, self._data)
+            self._renderer.update_scene(self._data, camera=self._camera)
+            row, column = divmod(index, self.columns)
+            self._frame[
+                row * self.height : (row + 1) * self.height,
+                column * self.width : (column + 1) * self.width,
+            ] = self._renderer.render()
+        return self._frame
+
+    def close(self) -> None:
+        self._renderer.close()
+
+
+def _render_worker(config_path: str) -> None:
+    """Render clips named on stdin; one JSON reply per clip on stdout."""
+    import imageio.v2 as imageio
+    import mujoco
+
+    with open(config_path) as f:
+        config = json.load(f)
+    if hasattr(os, "nice"):
+        os.nice(config["niceness"])
+    if hasattr(os, "SCHED_IDLE"):
+        # Linux: only run when a core would otherwise idle (inherited by the
+        # GL and ffmpeg threads / processes started below).
+        os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0))
+    try:
+        model = mujoco.MjModel.from_binary_path(config["model"])
+        ring = np.load(config["ring"], mmap_mode="r")
+        tiles = TileRenderer(
+            model,
+            ring.shape[2],
+            config["width"],
+            config["height"],
+            **{key: config[key] for key in _CAMERA_KEYS},
+        )
+    except Exception as e:  # noqa: BLE001 -- reported to the training process
+        print(json.dumps({"error": f"{type(e).__name__}: {e}"}), flush=True)
+        return
+    video_dir = Path(config["video_dir"])
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        start = time.perf_counter()
+        path = video_dir / _FILENAME.format(step=request["step"])
+        # Encoded next to the final file, then renamed, so watchers of
+        # ``video_dir`` only ever see complete videos.
+        partial = video_dir / ".partial" / path.name
+        partial.parent.mkdir(exist_ok=True)
+        writer = imageio.get_writer(
+            partial, format="FFMPEG", fps=config["fps"], macro_block_size=1
+        )
+        clip = ring[request["slot"], : request["frames"]]
+        for qpos in clip:
+            writer.append_data(tiles.render(qpos))
+        writer.close()
+        # The clip's qpos, for ``train.py replay`` (``VideoUploader`` only
+        # looks at ``.mp4`` files).
+        np.save(path.with_suffix(".npy"), clip)
+        os.replace(partial, path)
+        reply = {
+            "slot": request["slot"],
+            "path": str(path),
+            "seconds": time.perf_counter() - start,
+        }
+        print(json.dumps(reply), flush=True)
+    tiles.close()
+
+
+if __name__ == "__main__":
+    _render_worker(sys.argv[1])
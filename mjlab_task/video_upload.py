@@ -0,0 +1,203 @@
+"""Background, deduplicated upload of training videos.
+
+``VideoUploader`` watches a video folder from a daemon thread and hands every
+new, complete ``.mp4`` to ``upload_fn`` on a second thread, so the training
+loop never waits on the network. A video counts as complete once its size and
+mtime are unchanged between two polls and it is at least ``min_age_s`` old
+(the recorder writes the file in place).
+
+Uploaded files are recorded in a JSON manifest next to the videos
+(``uploaded.json``, name -> size), written atomically after every upload, so a
+resumed run does not send them again. Files that fail ``max_retries`` times are
+recorded as failed and skipped from then on.
+
+``upload_fn`` is any ``Callable[[str], None]``; ``wandb_upload`` is the default
+used by ``VideoOnPolicyRunner``. Pass a fake to exercise the uploader offline.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from typing import Callable
+
+MANIFEST_NAME = "uploaded.json"
+
+
+def wandb_upload(path: str) -> None:
+    """Log ``path`` to the active wandb run as ``video``."""
+    import wandb
+
+    if wandb.run is None:
+        raise RuntimeError("no active wandb run")
+    wandb.run.log({"video": wandb.Video(path)})
+
+
+class VideoUploader:
+    """Uploads new videos from ``video_dir`` on background threads."""
+
+    def __init__(
+        self,
+        video_dir: str,
+        upload_fn: Callable[[str], None] = wandb_upload,
+        max_queue: int = 8,
+        poll_interval_s: float = 10.0,
+        min_age_s: float = 2.0,
+        max_retries: int = 3,
+    ):
+        self.video_dir = video_dir
+        self.manifest_path = os.path.join(video_dir, MANIFEST_NAME)
+        self._upload_fn = upload_fn
+        self._queue: queue.Queue[str] = queue.Queue(maxsize=max_queue)
+        self._poll_interval_s = poll_interval_s
+        self._min_age_s = min_age_s
+        self._max_retries = max_retries
+
+        self._lock = threading.Lock()
+        self._manifest = self._load_manifest()
+        self._seen: dict[str, tuple[int, float]] = {}  # name -> (size, mtime)
+        self._in_flight: set[str] = set()
+        self._attempts: dict[str, int] = {}
+        self._latencies: list[float] = []
+        self._uploaded = 0
+        self._failed = 0
+        self._deferred = 0
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._watcher = threading.Thread(
+            target=self._watch, name="video-watch", daemon=True
+        )
+        self._uploader = threading.Thread(
+            target=self._upload, name="video-upload", daemon=True
+        )
+        self._watcher.start()
+        self._uploader.start()
+
+    # ---- public ----
+    def poke(self) -> None:
+        """Scan for new videos now instead of at the next poll (non-blocking)."""
+        self._wake.set()
+
+    def metrics(self) -> dict[str, float]:
+        """Backlog and latency counters, suitable for ``add_scalar``."""
+        with self._lock:
+            latencies = self._latencies
+            self._latencies = []
+            return {
+                "backlog": float(len(self._in_flight)),
+                "uploaded": float(self._uploaded),
+                "failed": float(self._failed),
+                "deferred": float(self._deferred),
+                "upload_latency_s": (
+                    sum(latencies) / len(latencies) if latencies else 0.0
+                ),
+                "max_upload_latency_s": max(latencies, default=0.0),
+            }
+
+    def close(self, timeout: float = 60.0) -> None:
+        """Stop watching, queue every remaining video and wait up to ``timeout`` s
+        for the uploads to finish."""
+        self._stop.set()
+        self._wake.set()
+        self._watcher.join()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self._scan(final=True)
+            with self._lock:
+                if not self._in_flight:
+                    break
+            time.sleep(0.1)
+
+    # ---- manifest ----
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            manifest = {}
+        manifest.setdefault("uploaded", {})
+        manifest.setdefault("failed", {})
+        return manifest
+
+    def _write_manifest(self) -> None:
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    # ---- threads ----
+    def _watch(self) -> None:
+        while not self._stop.is_set():
+            self._scan()
+            self._wake.wait(self._poll_interval_s)
+            self._wake.clear()
+
+    def _scan(self, final: bool = False) -> None:
+        """Queue complete videos not uploaded, failed or in flight yet.
+
+        With ``final`` the stability check is skipped: the run is over, so
+        every video on disk is as complete as it will get.
+        """
+        try:
+            names = sorted(os.listdir(self.video_dir))
+        except FileNotFoundError:
+            return
+        now = time.time()
+        for name in names:
+            if not name.endswith(".mp4"):
+                continue
+            with self._lock:
+                if (
+                    name in self._manifest["uploaded"]
+                    or name in self._manifest["failed"]
+                    or name in self._in_flight
+                ):
+                    continue
+            try:
+                stat = os.stat(os.path.join(self.video_dir, name))
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_size, stat.st_mtime)
+            stable = self._seen.get(name) == signature
+            self._seen[name] = signature
+            old_enough = now - stat.st_mtime >= self._min_age_s
+            if not final and not (stable and old_enough and stat.st_size > 0):
+                continue
+            with self._lock:
+                self._in_flight.add(name)
+            try:
+                self._queue.put_nowait(name)
+            except queue.Full:
+                # Picked up again on a later poll once the uploader catches up.
+                with self._lock:
+                    self._in_flight.discard(name)
+                    self._deferred += 1
+
+    def _upload(self) -> None:
+        while True:
+            name = self._queue.get()
+            path = os.path.join(self.video_dir, name)
+            start = time.perf_counter()
+            try:
+                self._upload_fn(path)
+            except Exception as e:
+                attempts = self._attempts.get(name, 0) + 1
+                self._attempts[name] = attempts
+                print(f"[WARN] Video upload failed ({attempts}x): {name}: {e}")
+                with self._lock:
+                    if attempts >= self._max_retries:
+                        self._manifest["failed"][name] = str(e)
+                        self._failed += 1
+                        self._write_manifest()
+                    self._in_flight.discard(name)
+                continue
+            latency = time.perf_counter() - start
+            with self._lock:
+                self._manifest["uploaded"][name] = os.path.getsize(path)
+                self._write_manifest()
+                self._in_flight.discard(name)
+                self._latencies.append(latency)
+                self._uploaded += 1
+            print(f"[INFO] Uploaded video: {name} ({latency:.1f}s)")
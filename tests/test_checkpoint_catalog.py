@@ -0,0 +1,107 @@
+"""CheckpointCatalog lookups, including legacy and stale catalogs."""
+
+import json
+import os
+import time
+
+from mjlab_task.checkpoint_catalog import (
+    CATALOG_NAME,
+    CheckpointCatalog,
+    file_sha256,
+    find_checkpoint,
+)
+
+
+def write_checkpoint(experiment, run: str, iteration: int, age_s: float = 0.0):
+    path = experiment / run / f"model_{iteration}.pt"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(f"{run}/{iteration}".encode())
+    then = time.time() - age_s
+    os.utime(path, (then, then))
+    return path
+
+
+def test_record_tracks_latest_best_and_iteration(tmp_path):
+    catalog = CheckpointCatalog(tmp_path)
+    first = write_checkpoint(tmp_path, "run_a", 50)
+    catalog.record(first, mean_reward=3.0, mean_episode_length=100.0)
+    second = write_checkpoint(tmp_path, "run_a", 100)
+    catalog.record(second, mean_reward=1.0)
+    rerun = write_checkpoint(tmp_path, "run_b", 50)
+    catalog.record(rerun, mean_reward=2.0)
+
+    assert catalog.latest() == rerun
+    assert catalog.best() == first
+    assert catalog.at_iteration(50) == rerun
+    assert catalog.at_iteration(100) == second
+    assert catalog.at_iteration(150) is None
+    # Recording does not hash the file.
+    assert catalog.entries()["run_a/model_50.pt"]["sha256"] is None
+
+
+def test_remove_reindexes(tmp_path):
+    catalog = CheckpointCatalog(tmp_path)
+    low = write_checkpoint(tmp_path, "run", 1)
+    catalog.record(low, mean_reward=1.0)
+    high = write_checkpoint(tmp_path, "run", 2)
+    catalog.record(high, mean_reward=5.0)
+    catalog.remove(high)
+    assert catalog.best() == low
+    assert catalog.latest() == low
+    assert list(catalog.entries()) == ["run/model_1.pt"]
+
+
+def test_legacy_experiment_is_indexed_and_best_falls_back(tmp_path):
+    for iteration, age in ((0, 30), (50, 20), (100, 10)):
+        write_checkpoint(tmp_path, "old_run", iteration, age_s=age)
+    (tmp_path / "old_run" / "notes.pt").write_bytes(b"")
+
+    newest = tmp_path / "old_run" / "model_100.pt"
+    assert find_checkpoint(tmp_path, "best") == newest
+    assert find_checkpoint(tmp_path, "latest") == newest
+    assert find_checkpoint(tmp_path, iteration=50) == tmp_path / "old_run/model_50.pt"
+    entries = CheckpointCatalog(tmp_path).entries()
+    assert sorted(entries) == [f"old_run/model_{it}.pt" for it in (0, 100, 50)]
+    assert all(entry["mean_reward"] is None for entry in entries.values())
+    assert entries["old_run/model_0.pt"]["sha256"] == file_sha256(
+        tmp_path / "old_run/model_0.pt"
+    )
+
+
+def test_stale_catalog_is_reindexed(tmp_path):
+    catalog = CheckpointCatalog(tmp_path)
+    for iteration, reward in ((0, 1.0), (50, 3.0), (100, 2.0)):
+        path = write_checkpoint(tmp_path, "run", iteration, age_s=100 - iteration)
+        catalog.record(path, mean_reward=reward)
+    (tmp_path / "run" / "model_100.pt").unlink()
+    (tmp_path / "run" / "model_50.pt").unlink()
+
+    assert catalog.latest() is None
+    assert find_checkpoint(tmp_path, "latest") == tmp_path / "run/model_0.pt"
+    assert find_checkpoint(tmp_path, "best") == tmp_path / "run/model_0.pt"
+    assert find_checkpoint(tmp_path, iteration=50) is None
+    assert list(catalog.entries()) == ["run/model_0.pt"]
+    # The surviving entry keeps its reward and gets its hash filled in.
+    entry = catalog.entries()["run/model_0.pt"]
+    assert entry["mean_reward"] == 1.0
+    assert entry["sha256"] == file_sha256(tmp_path / "run/model_0.pt")
+
+
+def test_rebuild_replaces_rewritten_files(tmp_path):
+    catalog = CheckpointCatalog(tmp_path)
+    path = write_checkpoint(tmp_path, "run", 10, age_s=60)
+    catalog.record(path, mean_reward=4.0)
+    path.write_bytes(b"another run with the same name")
+
+    assert catalog.rebuild() == 1
+    entry = catalog.entries()["run/model_10.pt"]
+    assert entry["mean_reward"] is None
+    assert entry["sha256"] == file_sha256(path)
+
+
+def test_missing_experiment(tmp_path):
+    assert find_checkpoint(tmp_path / "nothing", "best") is None
+    assert not (tmp_path / "nothing").exists()
+    assert find_checkpoint(tmp_path, "latest") is None
+    with open(tmp_path / CATALOG_NAME) as f:
+        assert json.load(f)["checkpoints"] == {}
@@ -0,0 +1,74 @@
+"""CheckpointRetention and AsyncCheckpointWriter on CPU tensors."""
+
+import os
+
+import torch
+
+from mjlab_task.checkpoint_writer import AsyncCheckpointWriter, CheckpointRetention
+
+
+def touch(directory, iteration: int) -> str:
+    path = str(directory / f"model_{iteration}.pt")
+    with open(path, "wb") as f:
+        f.write(b"\0")
+    return path
+
+
+def on_disk(directory) -> list[str]:
+    return sorted(os.listdir(directory), key=lambda name: int(name[6:-3]))
+
+
+def test_retention_keeps_last_and_best(tmp_path):
+    removed = []
+    retention = CheckpointRetention(keep_last=2, on_removed=removed.append)
+    for iteration, score in ((1, 1.0), (2, 5.0), (3, 2.0), (4, 3.0)):
+        retention.record(touch(tmp_path, iteration), iteration, score)
+
+    assert on_disk(tmp_path) == ["model_2.pt", "model_3.pt", "model_4.pt"]
+    assert [os.path.basename(path) for path in removed] == ["model_1.pt"]
+
+
+def test_retention_without_best(tmp_path):
+    retention = CheckpointRetention(keep_last=1, keep_best=False)
+    for iteration, score in ((1, 9.0), (2, 1.0), (3, None)):
+        retention.record(touch(tmp_path, iteration), iteration, score)
+    assert on_disk(tmp_path) == ["model_3.pt"]
+
+
+def test_retention_keep_last_zero_keeps_all(tmp_path):
+    retention = CheckpointRetention()
+    for iteration in range(5):
+        retention.record(touch(tmp_path, iteration), iteration, float(iteration))
+    assert len(on_disk(tmp_path)) == 5
+
+
+def test_retention_rewritten_path_counts_once(tmp_path):
+    retention = CheckpointRetention(keep_last=2, keep_best=False)
+    for iteration in (1, 2, 2, 3):
+        retention.record(touch(tmp_path, iteration), iteration)
+    assert on_disk(tmp_path) == ["model_2.pt", "model_3.pt"]
+
+
+def test_async_writer_writes_snapshots_and_prunes(tmp_path):
+    written = []
+    writer = AsyncCheckpointWriter(
+        keep_last=1,
+        keep_best=False,
+        on_written=lambda path, iteration, info: written.append((iteration, info)),
+    )
+    weights = torch.zeros(4)
+    for iteration in range(3):
+        weights.fill_(iteration)
+        path = str(tmp_path / f"model_{iteration}.pt")
+        state = {"model_state_dict": {"w": weights}, "iter": iteration}
+        writer.submit(path, state, iteration, info={"it": iteration})
+        # The snapshot is taken at submit: later in-place updates do not leak.
+        weights.fill_(-1)
+    writer.close()
+
+    assert on_disk(tmp_path) == ["model_2.pt"]
+    saved = torch.load(tmp_path / "model_2.pt")
+    assert saved["iter"] == 2
+    assert torch.equal(saved["model_state_dict"]["w"], torch.full((4,), 2.0))
+    assert written == [(it, {"it": it}) for it in range(3)]
+    assert writer.metrics()["failures"] == 0.0
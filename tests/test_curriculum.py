@@ -0,0 +1,82 @@
+"""Schedule lookups and the curriculum terms built on them."""
+
+from types import SimpleNamespace
+
+import pytest
+import torch
+from mjlab.managers.curriculum_manager import CurriculumTermCfg
+
+from mjlab_task.curriculum import (
+    Schedule,
+    reward_weight_curriculum,
+    termination_param_curriculum,
+)
+
+
+def test_step_schedule():
+    schedule = Schedule([200, 100], [2.0, 1.0])
+    assert schedule.steps == [100, 200]
+    assert schedule(0, default=-1.0) == -1.0
+    # A stage applies once the counter has passed its step.
+    assert schedule(100, default=-1.0) == -1.0
+    assert schedule(101, default=-1.0) == 1.0
+    assert schedule(200, default=-1.0) == 1.0
+    assert schedule(201, default=-1.0) == 2.0
+    assert schedule(10**9, default=-1.0) == 2.0
+
+
+def test_interpolated_schedule():
+    schedule = Schedule([0, 100, 300], [0.0, 1.0, -1.0], interpolate=True)
+    assert schedule(0, default=5.0) == 5.0
+    assert schedule(50, default=5.0) == pytest.approx(0.5)
+    assert schedule(200, default=5.0) == pytest.approx(0.0)
+    assert schedule(250, default=5.0) == pytest.approx(-0.5)
+    assert schedule(1000, default=5.0) == -1.0
+
+
+def test_empty_schedule_keeps_default():
+    assert Schedule([], [])(123, default=0.25) == 0.25
+
+
+def fake_env(reward_cfg=None, termination_cfg=None):
+    return SimpleNamespace(
+        device="cpu",
+        common_step_counter=0,
+        reward_manager=SimpleNamespace(get_term_cfg=lambda name: reward_cfg),
+        termination_manager=SimpleNamespace(get_term_cfg=lambda name: termination_cfg),
+    )
+
+
+def test_reward_weight_curriculum():
+    term = SimpleNamespace(weight=-0.1)
+    env = fake_env(reward_cfg=term)
+    params = {"reward_name": "posture", "stages": [{"step": 10, "weight": 0.0}]}
+    curriculum = reward_weight_curriculum(CurriculumTermCfg(None, params), env)
+
+    assert curriculum(env, None, **params) == -0.1
+    env.common_step_counter = 11
+    assert curriculum(env, None, **params) == 0.0
+    assert term.weight == 0.0
+    assert isinstance(term.weight, float)
+
+
+def test_termination_param_curriculum_updates_tensors_in_place():
+    term = SimpleNamespace(params={"threshold": 1000.0, "settle_steps": 5})
+    env = fake_env(termination_cfg=term)
+    params = {
+        "termination_name": "energy",
+        "stages": [
+            {"step": 10, "params": {"threshold": 2000.0}},
+            {"step": 20, "params": {"threshold": 3000.0}},
+        ],
+        "interpolate": True,
+    }
+    curriculum = termination_param_curriculum(CurriculumTermCfg(None, params), env)
+    threshold = term.params["threshold"]
+    assert isinstance(threshold, torch.Tensor) and threshold.item() == 1000.0
+    assert term.params["settle_steps"] == 5
+
+    env.common_step_counter = 15
+    assert curriculum(env, None, **params) == pytest.approx(2500.0)
+    assert term.params["threshold"] is threshold
+    assert threshold.item() == pytest.approx(2500.0)
@@ -0,0 +1,72 @@
+"""Evaluation statistics and the per-env episode quotas."""
+
+import numpy as np
+import pytest
+import torch
+
+from mjlab_task.evaluate import distribution, run_episodes, wilson_interval
+
+
+def test_wilson_interval():
+    low, high = wilson_interval(50, 100)
+    assert low == pytest.approx(0.4038, abs=1e-4)
+    assert high == pytest.approx(0.5962, abs=1e-4)
+    assert wilson_interval(0, 0) == [0.0, 1.0]
+    low, high = wilson_interval(0, 20)
+    assert low == 0.0 and 0.0 < high < 0.2
+    low, high = wilson_interval(20, 20)
+    assert 0.8 < low < 1.0 and high == pytest.approx(1.0)
+    # Narrows with more episodes at the same rate.
+    assert np.diff(wilson_interval(900, 1000)) < np.diff(wilson_interval(9, 10))
+
+
+def test_distribution():
+    assert distribution(np.array([])) is None
+    summary = distribution(np.arange(101, dtype=float))
+    assert summary["count"] == 101
+    assert summary["mean"] == 50.0
+    assert summary["p5"] == 5.0 and summary["p95"] == 95.0
+    assert summary["max"] == 100.0
+
+
+class FakeEnv:
+    """Env ``i`` ends an episode every ``lengths[i]`` steps."""
+
+    device = "cpu"
+
+    def __init__(self, lengths):
+        self.lengths = torch.tensor(lengths)
+        self.num_envs = len(lengths)
+        self.t = 0
+
+    def reset(self, seed=None):
+        return {"policy": torch.zeros(self.num_envs, 1)}, {}
+
+    def step(self, actions):
+        self.t += 1
+        ended = self.t % self.lengths == 0
+        obs = {"policy": torch.zeros(self.num_envs, 1)}
+        return obs, None, ended, torch.zeros_like(ended), {}
+
+
+class FakeMetrics:
+    def __init__(self, env):
+        self.env = env
+
+    def pop(self, env_ids):
+        return {
+            "env": env_ids.numpy(),
+            "step": np.full(len(env_ids), self.env.t),
+        }
+
+
+def test_run_episodes_splits_quota_over_envs():
+    env = FakeEnv([1, 2, 3])
+    episodes, env_steps = run_episodes(
+        env, lambda obs: obs, 7, seed=0, metrics=FakeMetrics(env)
+    )
+    # Quotas 3/2/2: env 2 (3 steps per episode) needs 6 steps.
+    assert sorted(episodes["env"].tolist()) == [0, 0, 0, 1, 1, 2, 2]
+    assert env_steps == 6 * 3
+    # Extra episodes of the fast env are not counted.
+    assert episodes["step"][episodes["env"] == 0].tolist() == [1, 2, 3]
@@ -0,0 +1,113 @@
+"""PlaybackClock controls and qpos selection of train.py replay."""
+
+import json
+
+import numpy as np
+import pytest
+
+from mjlab_task.replay import PlaybackClock, load_qpos
+from mjlab_task.rollout_recorder import META_NAME, _ShardWriter
+
+
+def test_clock_advances_at_speed_and_wraps():
+    clock = PlaybackClock(num_frames=100, step_dt=0.02)
+    clock.advance(0.5)
+    assert clock.frame == 25
+    clock.scale_speed(2.0)
+    clock.advance(0.5)
+    assert clock.position == pytest.approx(75.0)
+    clock.advance(1.0)
+    assert clock.position == pytest.approx(75.0)  # 175 wrapped
+    clock.advance(0.3)
+    assert clock.position == pytest.approx(5.0)
+
+
+def test_clock_stops_on_last_frame_without_loop():
+    clock = PlaybackClock(num_frames=10, step_dt=0.1)
+    clock.loop = False
+    clock.advance(5.0)
+    assert clock.frame == 9
+    assert clock.status() == "frame 10/10  t=0.90s  1x"
+
+
+def test_clock_seek_step_and_pause():
+    clock = PlaybackClock(num_frames=50, step_dt=0.02, speed=0.5)
+    clock.seek(-3)
+    assert clock.position == 0.0
+    clock.seek(1000)
+    assert clock.frame == 49
+    clock.seek(10.7)
+    clock.seek_seconds(-0.1)
+    assert clock.position == pytest.approx(5.7)
+    clock.step(3)
+    assert clock.paused and clock.position == 8.0
+    clock.advance(1.0)
+    assert clock.position == 8.0
+    clock.toggle_pause()
+    clock.advance(0.04)
+    assert clock.position == pytest.approx(9.0)
+    assert clock.status() == "frame 10/50  t=0.18s  0.5x"
+
+
+def test_clock_speed_limits():
+    clock = PlaybackClock(num_frames=10, step_dt=0.02)
+    for _ in range(20):
+        clock.scale_speed(2.0)
+    assert clock.speed == 64.0
+    for _ in range(40):
+        clock.scale_speed(0.5)
+    assert clock.speed == 1 / 64
+
+
+def write_rollout(directory, qpos: np.ndarray, terminated: np.ndarray) -> None:
+    shard = _ShardWriter(directory / "shard_00000.t1r")
+    for start in range(0, len(qpos), 4):
+        chunk = {
+            "qpos": qpos[start : start + 4],
+            "terminated": terminated[start : start + 4],
+        }
+        shard.add_chunk(chunk, level=1)
+    shard.close()
+    meta = {
+        "num_envs": qpos.shape[1],
+        "env_ids": [10 + i for i in range(qpos.shape[1])],
+        "step_dt": 0.02,
+        "task": "T1-Stand-v0",
+        "fields": {"qpos": {}, "terminated": {}},
+        "shards": [{"file": shard.path.name, "steps": shard.steps}],
+        "steps": shard.steps,
+    }
+    (directory / META_NAME).write_text(json.dumps(meta))
+
+
+def test_load_qpos_from_rollout(tmp_path):
+    qpos = np.random.default_rng(0).normal(size=(10, 5, 3))
+    terminated = np.zeros((10, 5), dtype=bool)
+    terminated[7, 1] = terminated[2, 4] = True
+    write_rollout(tmp_path, qpos, terminated)
+
+    loaded, env_ids, meta = load_qpos(tmp_path, max_envs=3)
+    np.testing.assert_array_equal(loaded, qpos[:, :3])
+    assert env_ids == [10, 11, 12] and meta["task"] == "T1-Stand-v0"
+
+    loaded, env_ids, _ = load_qpos(tmp_path, failures=True)
+    np.testing.assert_array_equal(loaded, qpos[:, [1, 4]])
+    assert env_ids == [11, 14]
+
+    loaded, env_ids, _ = load_qpos(tmp_path, envs=[3, 0])
+    np.testing.assert_array_equal(loaded, qpos[:, [3, 0]])
+    assert env_ids == [13, 10]
+
+    write_rollout(tmp_path, qpos, np.zeros_like(terminated))
+    with pytest.raises(ValueError, match="No env terminated"):
+        load_qpos(tmp_path, failures=True)
+
+
+def test_load_qpos_from_npy(tmp_path):
+    qpos = np.arange(4 * 6 * 2, dtype=np.float64).reshape(4, 6, 2)
+    np.save(tmp_path / "clip.npy", qpos)
+    loaded, env_ids, meta = load_qpos(tmp_path / "clip.npy", max_envs=4)
+    np.testing.assert_array_equal(loaded, qpos[:, :4])
+    assert env_ids == [0, 1, 2, 3] and meta == {}
+    with pytest.raises(FileNotFoundError):
+        load_qpos(tmp_path)
@@ -0,0 +1,147 @@
+"""RolloutRecorder -> RolloutReader round trip on a small stand-in env."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import torch
+
+from mjlab_task.rollout_recorder import (
+    RolloutReader,
+    RolloutRecorder,
+    _shuffle,
+    _unshuffle,
+    shuffle_batches,
+)
+
+NUM_ENVS, NUM_JOINTS, NQ = 3, 2, 9
+
+
+class FakeTerminations:
+    active_terms = ["fell", "time_out"]
+    _term_names = active_terms
+
+    def __init__(self):
+        self.terms = torch.zeros(NUM_ENVS, 2, dtype=torch.bool)
+
+    @property
+    def terminated(self):
+        return self.terms[:, 0]
+
+    @property
+    def time_outs(self):
+        return self.terms[:, 1]
+
+    def get_term(self, name):
+        return self.terms[:, self.active_terms.index(name)]
+
+
+class FakeEnv:
+    """Just the attributes the recorder reads; every value encodes the step."""
+
+    num_envs = NUM_ENVS
+    device = "cpu"
+    step_dt = 0.02
+
+    def __init__(self):
+        self.t = 0
+        data = SimpleNamespace()
+        self.scene = {"robot": SimpleNamespace(joint_names=["a", "b"], data=data)}
+        self.observation_manager = SimpleNamespace(
+            active_terms={"policy": ["joint_pos"], "critic": ["joint_pos"]}
+        )
+        self.reward_manager = SimpleNamespace(_term_names=["alive", "posture"])
+        self.termination_manager = FakeTerminations()
+        self.sim = SimpleNamespace(data=SimpleNamespace())
+        self._update()
+
+    def value(self, *shape):
+        env = torch.arange(NUM_ENVS, dtype=torch.float32).reshape(-1, *[1] * len(shape))
+        return self.t + 0.1 * env + torch.zeros(NUM_ENVS, *shape)
+
+    def _update(self):
+        data = self.scene["robot"].data
+        data.root_link_pos_w = self.value(3)
+        data.root_link_quat_w = self.value(4)
+        data.root_link_lin_vel_w = self.value(3)
+        data.root_link_ang_vel_w = self.value(3)
+        data.joint_pos = self.value(NUM_JOINTS)
+        data.joint_vel = -self.value(NUM_JOINTS)
+        self.sim.data.qpos = self.value(NQ).double()
+        self.obs_buf = {"policy": self.value(5), "critic": self.value(7)}
+        self.episode_length_buf = torch.full((NUM_ENVS,), self.t % 4)
+        self.reward_buf = self.value()
+        self.reward_manager._step_reward = self.value(2)
+        self.termination_manager.terms[:] = False
+        self.termination_manager.terms[:, 0] = self.t % 4 == 3
+
+    def step(self, action):
+        self.t += 1
+        self._update()
+        return self.obs_buf
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64, np.int32, np.bool_])
+def test_shuffle_round_trip(dtype):
+    array = (np.arange(60).reshape(5, 4, 3) * 1.5).astype(dtype)
+    restored = _unshuffle(_shuffle(array), array.dtype).reshape(array.shape)
+    np.testing.assert_array_equal(restored, array)
+
+
+def test_recorder_reader_round_trip(tmp_path):
+    env = FakeEnv()
+    steps = 23
+    recorder = RolloutRecorder(
+        env,
+        tmp_path,
+        env_ids=[0, 2],
+        chunk_steps=4,
+        shard_steps=8,
+        max_pending_chunks=1,
+        metadata={"task": "fake"},
+    )
+    with recorder:
+        for t in range(steps):
+            env.step(torch.full((NUM_ENVS, NUM_JOINTS), float(t)))
+    assert env.step.__func__ is FakeEnv.step  # detached
+    # Only max_pending_chunks + 1 buffer sets for 6 chunks.
+    assert recorder._allocated == 2
+
+    reader = RolloutReader(tmp_path)
+    assert reader.steps == steps
+    assert len(reader) == steps * 2
+    assert reader.meta["task"] == "fake"
+    assert [entry["steps"] for entry in reader.meta["shards"]] == [8, 8, 7]
+    assert reader.meta["fields"]["qpos"] == {"dtype": "<f8", "shape": [2, NQ]}
+
+    chunks = list(reader.iter_chunks())
+    assert [len(chunk["action"]) for chunk in chunks] == [4, 4, 4, 4, 4, 3]
+    rows = {name: np.concatenate([c[name] for c in chunks]) for name in reader.fields}
+    t = np.arange(steps, dtype=np.float32)
+    # Observations and state are taken before the step they belong to.
+    np.testing.assert_allclose(rows["obs/policy"][:, 0, 0], t)
+    np.testing.assert_allclose(rows["obs/policy"][:, 1, 0], t + 0.2)
+    np.testing.assert_allclose(rows["joint_vel"][:, 1, 1], -(t + 0.2))
+    np.testing.assert_allclose(rows["qpos"][:, 0, -1], t)
+    np.testing.assert_array_equal(rows["action"][:, :, 0], np.stack([t, t], 1))
+    np.testing.assert_array_equal(rows["episode_step"][:, 0], np.arange(steps) % 4)
+    # Rewards and terminations are the outcome of the step.
+    np.testing.assert_allclose(rows["reward"][:, 0], t + 1)
+    np.testing.assert_array_equal(rows["terminated"][:, 0], (t + 1) % 4 == 3)
+    np.testing.assert_array_equal(
+        rows["termination_terms"][:, 0], np.stack([(t + 1) % 4 == 3, t < 0], -1)
+    )
+
+
+def test_shuffle_batches_keeps_every_row():
+    chunks = [
+        {"x": np.arange(i * 6, i * 6 + 6).reshape(3, 2), "y": np.ones((3, 2, 4))}
+        for i in range(5)
+    ]
+    batches = list(shuffle_batches(chunks, batch_size=4, buffer_chunks=2, seed=1))
+    rows = np.concatenate([batch["x"] for batch in batches])
+    assert sorted(rows.tolist()) == list(range(30))
+    assert rows.tolist() != list(range(30))
+    assert all(batch["y"].shape[1:] == (4,) for batch in batches)
+    ordered = list(shuffle_batches(chunks, batch_size=4, shuffle=False))
+    assert np.concatenate([b["x"] for b in ordered]).tolist() == list(range(30))
@@ -0,0 +1,104 @@
+"""Sweep search spaces, early stopping and metrics streaming."""
+
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from mjlab_task.sweep import (
+    Distribution,
+    MedianStoppingRule,
+    Trial,
+    apply_overrides,
+    grid,
+    parse_values,
+    random_search,
+)
+
+
+def test_median_stopping_rule():
+    rule = MedianStoppingRule(grace_iterations=10, min_peers=2)
+    peers = [{10: 1.0, 20: 4.0}, {10: 3.0, 20: 6.0}, {10: 5.0}]
+    assert not rule.should_stop({}, peers)
+    # Inside the grace period nothing is stopped.
+    assert not rule.should_stop({5: -100.0}, peers)
+    # Median of the peers at iteration 10 is 3.0.
+    assert rule.should_stop({0: 9.0, 10: 2.9}, peers)
+    assert not rule.should_stop({10: 3.0}, peers)
+    # Compared at the latest iteration, where only two peers reported.
+    assert rule.should_stop({10: 9.0, 20: 4.9}, peers)
+    assert not rule.should_stop({20: 5.0}, peers)
+
+
+def test_median_stopping_rule_needs_min_peers():
+    rule = MedianStoppingRule(grace_iterations=0, min_peers=3)
+    peers = [{10: 1.0}, {10: 2.0}, {20: 3.0}]
+    assert not rule.should_stop({10: -1.0}, peers)
+    peers.append({10: 0.0})
+    assert rule.should_stop({10: -1.0}, peers)
+
+
+def test_parse_values():
+    assert parse_values(["3e-4", "1e-3"]) == [3e-4, 1e-3]
+    assert parse_values(["[256, 128]", "elu"]) == [[256, 128], "elu"]
+    assert parse_values(["loguniform(1e-4, 1e-2)"]) == Distribution(
+        "loguniform", 1e-4, 1e-2
+    )
+
+
+def test_grid_and_random_search():
+    space = {"agent.a": [1, 2], "agent.b": ["x", "y", "z"]}
+    assert len(grid(space)) == 6
+    assert grid(space)[0] == {"agent.a": 1, "agent.b": "x"}
+    with pytest.raises(ValueError):
+        grid({"agent.a": Distribution("uniform", 0.0, 1.0)})
+
+    space = {"agent.lr": Distribution("loguniform", 1e-4, 1e-2), "agent.a": [1, 2]}
+    trials = random_search(space, 20, seed=0)
+    assert trials == random_search(space, 20, seed=0)
+    assert all(1e-4 <= trial["agent.lr"] <= 1e-2 for trial in trials)
+    assert {trial["agent.a"] for trial in trials} == {1, 2}
+    draws = [Distribution("randint", 1, 3).sample(random.Random(i)) for i in range(50)]
+    assert set(draws) == {1, 2, 3}
+
+
+def test_apply_overrides():
+    cfg = SimpleNamespace(
+        env=SimpleNamespace(scene=SimpleNamespace(num_envs=64)),
+        agent=SimpleNamespace(
+            algorithm=SimpleNamespace(learning_rate=1e-3),
+            policy=SimpleNamespace(actor_hidden_dims=(256, 128)),
+            extra={"gamma": 0.99},
+        ),
+    )
+    apply_overrides(
+        cfg,
+        {
+            "env.scene.num_envs": 512,
+            "agent.policy.actor_hidden_dims": [64, 64],
+            "agent.extra.gamma": 0.95,
+        },
+    )
+    assert cfg.env.scene.num_envs == 512
+    assert cfg.agent.policy.actor_hidden_dims == (64, 64)
+    assert cfg.agent.extra == {"gamma": 0.95}
+    for path in ("seed", "agent.algorithm.nope", "agent.extra.nope"):
+        with pytest.raises(ValueError):
+            apply_overrides(cfg, {path: 1})
+
+
+def test_trial_polls_complete_metric_lines(tmp_path):
+    trial = Trial(0, "trial_0", {}, tmp_path)
+    trial.poll_metrics()
+    assert trial.curve == {}
+    with open(trial.metrics_file, "w") as f:
+        f.write(json.dumps({"it": 0, "mean_reward": None}) + "\n")
+        f.write(json.dumps({"it": 1, "mean_reward": 0.5}) + "\n")
+        f.write('{"it": 2, "mean_')
+    trial.poll_metrics()
+    assert trial.curve == {1: 0.5}
+    with open(trial.metrics_file, "a") as f:
+        f.write('reward": 0.75}\n')
+    trial.poll_metrics()
+    assert trial.curve == {1: 0.5, 2: 0.75}
@@ -0,0 +1,145 @@
+"""VideoUploader against a local fake of the wandb upload."""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from mjlab_task.video_upload import MANIFEST_NAME, VideoUploader
+
+POLL_S = 0.05
+
+
+class FakeUpload:
+    """Records ``(name, size, time)`` per call; optionally fails or blocks."""
+
+    def __init__(self, fail: bool = False, gate: threading.Event | None = None):
+        self.calls: list[tuple[str, int, float]] = []
+        self.fail = fail
+        self.gate = gate
+        self._lock = threading.Lock()
+
+    def __call__(self, path: str) -> None:
+        if self.gate is not None:
+            self.gate.wait()
+        with self._lock:
+            call = (os.path.basename(path), os.path.getsize(path), time.time())
+            self.calls.append(call)
+        if self.fail:
+            raise RuntimeError("network down")
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return [name for name, _, _ in self.calls]
+
+
+def write_video(directory, name: str, size: int = 16, age_s: float = 0.0) -> str:
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    if age_s:
+        then = time.time() - age_s
+        os.utime(path, (then, then))
+    return path
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("timed out")
+        time.sleep(0.01)
+
+
+def test_uploads_only_complete_videos_once(tmp_path):
+    upload = FakeUpload()
+    uploader = VideoUploader(
+        str(tmp_path), upload, poll_interval_s=POLL_S, min_age_s=0.5
+    )
+    write_video(tmp_path, "old.mp4", age_s=10.0)
+    write_video(tmp_path, "notes.txt", age_s=10.0)
+    young = write_video(tmp_path, "young.mp4")
+    growing = write_video(tmp_path, "growing.mp4", size=0)
+    for _ in range(20):
+        with open(growing, "ab") as f:
+            f.write(b"\0" * 8)
+        time.sleep(POLL_S)
+        assert "growing.mp4" not in upload.names()
+    last_write = os.path.getmtime(growing)
+
+    wait_for(lambda: len(upload.names()) == 3)
+    time.sleep(10 * POLL_S)
+    uploader.close()
+
+    assert sorted(upload.names()) == ["growing.mp4", "old.mp4", "young.mp4"]
+    calls = {name: (size, when) for name, size, when in upload.calls}
+    assert calls["young.mp4"][1] - os.path.getmtime(young) >= 0.5
+    assert calls["growing.mp4"][0] == 160
+    assert calls["growing.mp4"][1] - last_write >= 0.5
+    with open(tmp_path / MANIFEST_NAME) as f:
+        manifest = json.load(f)
+    assert set(manifest["uploaded"]) == {"old.mp4", "young.mp4", "growing.mp4"}
+    assert uploader.metrics()["uploaded"] == 3.0
+
+
+def test_manifest_prevents_reupload(tmp_path):
+    write_video(tmp_path, "a.mp4", age_s=10.0)
+    first = FakeUpload()
+    uploader = VideoUploader(str(tmp_path), first, poll_interval_s=POLL_S, min_age_s=0)
+    wait_for(lambda: first.names() == ["a.mp4"])
+    uploader.close()
+
+    second = FakeUpload()
+    uploader = VideoUploader(str(tmp_path), second, poll_interval_s=POLL_S, min_age_s=0)
+    time.sleep(10 * POLL_S)
+    uploader.close()
+    assert second.names() == []
+
+
+def test_marks_failed_after_max_retries(tmp_path):
+    write_video(tmp_path, "bad.mp4", age_s=10.0)
+    upload = FakeUpload(fail=True)
+    uploader = VideoUploader(
+        str(tmp_path), upload, poll_interval_s=POLL_S, min_age_s=0, max_retries=3
+    )
+    wait_for(lambda: uploader.metrics()["failed"] == 1.0)
+    time.sleep(10 * POLL_S)
+    uploader.close()
+
+    assert upload.names() == ["bad.mp4"] * 3
+    with open(tmp_path / MANIFEST_NAME) as f:
+        manifest = json.load(f)
+    assert "bad.mp4" in manifest["failed"]
+    assert manifest["uploaded"] == {}
+
+
+def test_full_queue_defers_and_uploads_later(tmp_path):
+    gate = threading.Event()
+    upload = FakeUpload(gate=gate)
+    for index in range(3):
+        write_video(tmp_path, f"{index}.mp4", age_s=10.0)
+    uploader = VideoUploader(
+        str(tmp_path), upload, max_queue=1, poll_interval_s=POLL_S, min_age_s=0
+    )
+    wait_for(lambda: uploader.metrics()["deferred"] >= 1.0)
+    assert upload.names() == []
+    gate.set()
+
+    wait_for(lambda: len(upload.names()) == 3)
+    uploader.close()
+    assert sorted(upload.names()) == ["0.mp4", "1.mp4", "2.mp4"]
+
+
+def test_close_drains_remaining_videos(tmp_path):
+    upload = FakeUpload()
+    # Neither a poll nor the age check would pick these up before close().
+    uploader = VideoUploader(str(tmp_path), upload, poll_interval_s=60, min_age_s=60)
+    for index in range(3):
+        write_video(tmp_path, f"{index}.mp4")
+    assert upload.names() == []
+
+    uploader.close(timeout=5.0)
+    assert sorted(upload.names()) == ["0.mp4", "1.mp4", "2.mp4"]
+    assert uploader.metrics()["backlog"] == 0.0
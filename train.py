@@ -1,41 +1,118 @@
 import argparse
+import importlib
 import subprocess
 import sys
+import time
 from pathlib import Path
 
+_T_START = time.perf_counter()
+
+# train.py <name> ... runs the module's main() with the remaining arguments.
+SUBCOMMANDS = {
+    "sweep": "mjlab_task.sweep",
+    "pbt": "mjlab_task.pbt",
+    "bench": "mjlab_task.bench",
+    "export": "mjlab_task.export",
+    "serve": "mjlab_task.policy_server",
+    "quantize": "mjlab_task.quantize",
+    "record": "mjlab_task.rollout_recorder",
+    "replay": "mjlab_task.replay",
+    "eval": "mjlab_task.evaluate",
+}
+
+
+def find_checkpoint(
+    task_name: str, select: str = "latest", iteration: int | None = None
+) -> str | None:
+    """Look up a checkpoint of the task's experiment in its checkpoint catalog.
+
+    ``select`` is ``"latest"`` or ``"best"`` (highest mean reward); a given
+    ``iteration`` takes precedence. Experiments trained before the catalog
+    existed are indexed from disk on first use.
+    """
+    import mjlab_task  # noqa: F401  (registers the tasks)
+    from mjlab.tasks.registry import load_rl_cfg
+
+    from mjlab_task.checkpoint_catalog import find_checkpoint as find
+
+    experiment_name = load_rl_cfg(task_name).experiment_name
+    checkpoint = find(Path("logs") / "rsl_rl" / experiment_name, select, iteration)
+    return None if checkpoint is None else str(checkpoint)
+
+
+def launch_in_process(command: str, task_name: str, mjlab_args: list[str]) -> None:
+    """Run mjlab's ``train`` / ``play`` entry point in this interpreter.
+
+    ``mjlab_args`` are parsed by the same tyro config as the ``uv run`` scripts,
+    so every ``--env.*`` / ``--agent.*`` override is honoured (or rejected).
+    """
+    import dataclasses
+
+    import torch
+    import tyro
+
+    import mjlab
+    import mjlab.tasks  # noqa: F401
+    import mjlab_task  # noqa: F401  (registers the tasks when not installed)
+
+    prog = f"{sys.argv[0]} --task {task_name}"
+    if command == "train":
+        from mjlab.scripts.train import TrainConfig, launch_training
+
+        cfg = tyro.cli(
+            TrainConfig,
+            args=mjlab_args,
+            default=TrainConfig.from_task(task_name),
+            prog=prog,
+            config=mjlab.TYRO_FLAGS,
+        )
+        if not torch.cuda.is_available():
+            # mjlab's default gpu_ids=[0] fails on CPU-only machines.
+            cfg = dataclasses.replace(cfg, gpu_ids=None)
+        _report_startup()
+        launch_training(task_id=task_name, args=cfg)
+    else:
+        from mjlab.scripts.play import PlayConfig, run_play
+
+        cfg = tyro.cli(
+            PlayConfig,
+            args=mjlab_args,
+            default=PlayConfig(),
+            prog=prog,
+            config=mjlab.TYRO_FLAGS,
+        )
+        _report_startup()
+        run_play(task_name, cfg)
 
-def get_latest_checkpoint(experiment_name: str) -> str | None:
-    """Find the latest checkpoint file for the given experiment."""
-    log_dir = Path("logs") / "rsl_rl" / experiment_name
-    if not log_dir.exists():
-        return None
-
-    # Get all timestamped directories
-    runs = sorted([d for d in log_dir.iterdir() if d.is_dir()], reverse=True)
-    if not runs:
-        return None
-
-    # Check the latest run directory
-    latest_run = runs[0]
 
-    # Find all model_*.pt files and get the one with highest iteration
-    checkpoints = list(latest_run.glob("model_*.pt"))
-    if not checkpoints:
-        return None
+def launch_uv(command: str, task_name: str, mjlab_args: list[str]) -> None:
+    """Run mjlab's ``train`` / ``play`` script through ``uv run``."""
+    cmd = ["uv", "run", command, task_name, *mjlab_args]
+    try:
+        subprocess.run(cmd, check=True)
+    except FileNotFoundError:
+        print("Error: 'uv' command not found. Please install uv and run 'uv sync'.")
+        print(
+            "Alternatively, ensure 'train' and 'play' scripts from mjlab are in your PATH."
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"Command failed with exit code {e.returncode}")
 
-    # Sort by the number in model_<number>.pt
-    def get_iteration(p: Path):
-        try:
-            return int(p.stem.split("_")[1])
-        except (IndexError, ValueError):
-            return -1
 
-    latest_checkpoint = sorted(checkpoints, key=get_iteration, reverse=True)[0]
-    return str(latest_checkpoint)
+def _report_startup() -> None:
+    print(f"[INFO] Launcher startup: {time.perf_counter() - _T_START:.2f}s")
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Train Booster T1 using mjlab")
+    if len(sys.argv) > 1 and sys.argv[1] in SUBCOMMANDS:
+        module = importlib.import_module(SUBCOMMANDS[sys.argv[1]])
+        module.main(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(
+        description="Train Booster T1 using mjlab",
+        epilog=f"Subcommands: train.py {{{','.join(SUBCOMMANDS)}}} --help",
+    )
     parser.add_argument("--test", action="store_true", help="Play trained policy")
     parser.add_argument(
         "--checkpoint",
@@ -43,6 +120,19 @@ def main():
         default=None,
         help="Path to a specific checkpoint file",
     )
+    parser.add_argument(
+        "--checkpoint-select",
+        choices=["latest", "best"],
+        default="latest",
+        help="Checkpoint to play when --checkpoint is not given: the most recent "
+        "one or the one with the highest mean reward, across all runs",
+    )
+    parser.add_argument(
+        "--checkpoint-iteration",
+        type=int,
+        default=None,
+        help="Play the checkpoint saved at this iteration (most recent run)",
+    )
     parser.add_argument(
         "--task", type=str, default="T1-Reach-v0", help="Task ID to train or play"
     )
@@ -55,61 +145,60 @@ def main():
     parser.add_argument(
         "--video",
         action="store_true",
-        help="Run training with video recording enabled (ignored in play mode)",
+        help="Record training videos of the first --video-envs envs, rendered "
+        "offscreen by a worker process (ignored in play mode)",
+    )
+    parser.add_argument(
+        "--video-envs", type=int, default=4, help="Envs tiled into each video"
+    )
+    parser.add_argument(
+        "--video-sync",
+        action="store_true",
+        help="Use mjlab's video recorder instead, which renders in the training loop",
+    )
+    parser.add_argument(
+        "--launcher",
+        choices=["inprocess", "uv"],
+        default="inprocess",
+        help="Run mjlab's train/play in this process, or through 'uv run'",
     )
     args, unknown = parser.parse_known_args()
 
     task_name = args.task
-    experiment_name = task_name.replace("-v0", "")
 
     if args.test:
         checkpoint = args.checkpoint
         if not checkpoint:
-            checkpoint = get_latest_checkpoint(experiment_name)
+            checkpoint = find_checkpoint(
+                task_name, args.checkpoint_select, args.checkpoint_iteration
+            )
             if checkpoint:
-                print(f"Automatically selected latest checkpoint: {checkpoint}")
+                print(f"Automatically selected checkpoint: {checkpoint}")
             else:
                 print(
-                    f"Error: No checkpoints found for experiment '{experiment_name}' in logs/rsl_rl/"
+                    f"Error: No matching checkpoint for task '{task_name}' in logs/rsl_rl/"
                 )
                 sys.exit(1)
 
         print(f"Playing task {task_name} using checkpoint {checkpoint}...")
-        cmd = [
-            "uv",
-            "run",
-            "play",
-            task_name,
-            "--checkpoint-file",
-            checkpoint,
-            "--viewer=native",
-        ]
+        command = "play"
+        mjlab_args = ["--checkpoint-file", checkpoint, "--viewer=native"]
     else:
         print(f"Training task {task_name}...")
-        # Assuming 'train' script is available in the environment via mjlab
-        cmd = [
-            "uv",
-            "run",
-            "train",
-            task_name,
-            f"--env.scene.num-envs={args.num_envs}",
-        ]
-        if args.video:
-            cmd.append("--video=True")
-
-    # Pass unknown args to mjlab if needed, but for now kept simple
-    if unknown:
-        print(f"Warning: Ignoring unknown arguments: {unknown}")
-
-    try:
-        subprocess.run(cmd, check=True)
-    except FileNotFoundError:
-        print("Error: 'uv' command not found. Please install uv and run 'uv sync'.")
-        print(
-            "Alternatively, ensure 'train' and 'play' scripts from mjlab are in your PATH."
-        )
-    except subprocess.CalledProcessError as e:
-        print(f"Command failed with exit code {e.returncode}")
+        command = "train"
+        mjlab_args = [f"--env.scene.num-envs={args.num_envs}"]
+        if args.video_sync:
+            mjlab_args.append("--video=True")
+        elif args.video:
+            mjlab_args.append(f"--agent.video-envs={args.video_envs}")
+
+    # Remaining arguments (e.g. --agent.max-iterations=100) go to mjlab.
+    mjlab_args.extend(unknown)
+
+    if args.launcher == "uv":
+        launch_uv(command, task_name, mjlab_args)
+    else:
+        launch_in_process(command, task_name, mjlab_args)
 
 
 if __name__ == "__main__":